@@ -1,7 +1,12 @@
 from fastapi import Security, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import hashlib
+import hmac
 import json
 import os
+import threading
+import time
+from typing import Dict, Optional
 
 security = HTTPBearer()
 
@@ -9,24 +14,96 @@ security = HTTPBearer()
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 USERS_FILE = os.path.join(BASE_DIR, "data", "users.json")
 
+# How often (seconds) the users file is stat'ed for changes
+AUTH_RELOAD_INTERVAL_SEC = float(os.getenv("AUTH_RELOAD_INTERVAL_SEC", "2.0"))
+
 def load_users():
     if not os.path.exists(USERS_FILE):
         return {}
     with open(USERS_FILE, "r") as f:
         return json.load(f)
 
+def _token_key(token: str) -> bytes:
+    # Index by digest so the dict lookup never branches on the raw token
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+class UserStore:
+    """
+    In-memory token -> user index over users.json.
+    The file is parsed once and re-read only when its mtime changes; the mtime
+    itself is checked at most every AUTH_RELOAD_INTERVAL_SEC.
+    """
+
+    def __init__(self, path: str = USERS_FILE, reload_interval: float = AUTH_RELOAD_INTERVAL_SEC):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.lookups = 0
+        self.failures = 0
+        self.reloads = 0
+        self._index: Dict[bytes, tuple] = {}
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def _mtime_now(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.reload_interval
+            mtime = self._mtime_now()
+            if mtime == self._mtime and self.reloads:
+                return
+            try:
+                with open(self.path, "r") as f:
+                    users = json.load(f)
+            except FileNotFoundError:
+                users = {}
+            except Exception as e:
+                # Keep serving the last good index if the file is mid-write
+                print(f"Auth: could not reload {self.path}: {e}")
+                return
+            self._index = {_token_key(token): (user_id, token) for user_id, token in users.items()}
+            self._mtime = mtime
+            self.reloads += 1
+
+    def lookup(self, token: str) -> Optional[str]:
+        """Return the user ID owning token, or None."""
+        self._maybe_reload()
+        self.lookups += 1
+        entry = self._index.get(_token_key(token))
+        if entry is not None and hmac.compare_digest(entry[1].encode("utf-8"), token.encode("utf-8")):
+            return entry[0]
+        self.failures += 1
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "users": len(self._index),
+            "lookups": self.lookups,
+            "failures": self.failures,
+            "reloads": self.reloads,
+        }
+
+user_store = UserStore()
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)):
     token = credentials.credentials
-    users = load_users()
-    
-    # Simple reverse lookup: Token -> UserID
-    # In a real DB we'd verify the token associated with the user.
-    # Here, keys are UserIDs, values are tokens.
-    
-    for user_id, valid_token in users.items():
-        if token == valid_token:
-            return user_id
-            
+
+    # Reverse lookup: Token -> UserID.
+    # Keys in users.json are UserIDs, values are tokens.
+    user_id = user_store.lookup(token)
+    if user_id is not None:
+        return user_id
+
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid authentication credentials",
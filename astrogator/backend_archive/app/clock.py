@@ -0,0 +1,181 @@
+import bisect
+import contextvars
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+import numpy as np
+import spiceypy
+
+from .metrics import instrument_spice
+
+# SPICE calls are counted per function (see metrics.py)
+spice = instrument_spice(spiceypy)
+
+# Sim time runs this many times faster than wall-clock time
+SIM_TIME_WARP = float(os.getenv("SIM_TIME_WARP", "1.0"))
+# Optional fixed start epoch (UTC string); defaults to the current wall-clock time
+SIM_EPOCH = os.getenv("SIM_EPOCH")
+
+# J2000 epoch as a UTC calendar label (ET - UTC offsets are handled by the table)
+_J2000_UTC = datetime(2000, 1, 1, 12, 0, 0)
+
+class LeapSecondTable:
+    """
+    ET <-> UTC conversion from the loaded leapseconds kernel (DELTET/* pool
+    variables), reproducing SPICE deltet without a SPICE call per conversion.
+    """
+
+    def __init__(self):
+        self.delta_t_a = spice.gdpool("DELTET/DELTA_T_A", 0, 1)[0]
+        self.k = spice.gdpool("DELTET/K", 0, 1)[0]
+        self.eb = spice.gdpool("DELTET/EB", 0, 1)[0]
+        self.m0, self.m1 = spice.gdpool("DELTET/M", 0, 2)
+        # Pairs of (DELTA_AT, UTC seconds past J2000 at which it takes effect)
+        delta_at = np.asarray(spice.gdpool("DELTET/DELTA_AT", 0, 400)).reshape(-1, 2)
+        self.dat = delta_at[:, 0].tolist()
+        self.dat_epochs = delta_at[:, 1].tolist()
+
+    def delta_et_utc(self, et: float) -> float:
+        """ET - UTC (seconds) at the given ET (matches spice.deltet to ~1e-7 s)."""
+        m = self.m0 + self.m1 * et
+        periodic = self.k * math.sin(m + self.eb * math.sin(m))
+        # Leap-second lookup is keyed by UTC, so refine the guess once
+        utc = et - self.delta_t_a - self.dat[-1]
+        for _ in range(2):
+            i = max(0, bisect.bisect_right(self.dat_epochs, utc) - 1)
+            utc = et - self.delta_t_a - self.dat[i] - periodic
+        return et - utc
+
+    def et_to_utc(self, et: float) -> str:
+        """Same output as engine.et_to_utc: 'YYYY-MM-DD HR:MN:SC.###', rounded to the millisecond."""
+        utc_sec = et - self.delta_et_utc(et)
+        stamp = _J2000_UTC + timedelta(milliseconds=round(utc_sec * 1000.0))
+        return (f"{stamp.year:04d}-{stamp.month:02d}-{stamp.day:02d} "
+                f"{stamp.hour:02d}:{stamp.minute:02d}:{stamp.second:02d}.{stamp.microsecond // 1000:03d}")
+
+_leap_seconds: Optional[LeapSecondTable] = None
+
+def get_leap_seconds() -> LeapSecondTable:
+    """Leap-second table, read from the kernel pool on first use (kernels must be loaded)."""
+    global _leap_seconds
+    if _leap_seconds is None:
+        _leap_seconds = LeapSecondTable()
+    return _leap_seconds
+
+# ET snapshot shared by everything running inside one request/tick
+_snapshot_et: contextvars.ContextVar = contextvars.ContextVar("snapshot_et", default=None)
+
+class SimClock:
+    """
+    Simulation clock anchored on one (monotonic wall clock, ET) pair. The
+    current ET is plain float arithmetic from the anchor; ET has no leap
+    seconds, so nothing else is needed. Supports pausing, time warp and a
+    fixed epoch.
+    """
+
+    def __init__(self, epoch_et: Optional[float] = None, warp: float = SIM_TIME_WARP, paused: bool = False):
+        self._lock = threading.RLock()
+        self._anchor_mono: Optional[float] = None
+        self._anchor_et: Optional[float] = epoch_et
+        self.warp = warp
+        self.paused = paused
+        if epoch_et is not None:
+            self._anchor_mono = time.monotonic()
+        # Called with the clock after every pause/resume/warp/epoch change (the sim journals them)
+        self.on_change: Optional[Callable[["SimClock"], None]] = None
+
+    @classmethod
+    def fixed(cls, et: float) -> "SimClock":
+        """A paused clock frozen at et (tests)."""
+        return cls(epoch_et=et, paused=True)
+
+    def _ensure_anchor(self):
+        # Anchor lazily: the wall-clock -> ET conversion needs the LSK loaded
+        if self._anchor_mono is None:
+            with self._lock:
+                if self._anchor_mono is None:
+                    if self._anchor_et is None:
+                        if SIM_EPOCH:
+                            self._anchor_et = spice.str2et(SIM_EPOCH)
+                        else:
+                            now = datetime.now(timezone.utc)
+                            self._anchor_et = spice.str2et(now.strftime("%Y-%m-%dT%H:%M:%S.%f"))
+                    self._anchor_mono = time.monotonic()
+
+    def _live_et(self) -> float:
+        self._ensure_anchor()
+        if self.paused:
+            return self._anchor_et
+        return self._anchor_et + (time.monotonic() - self._anchor_mono) * self.warp
+
+    def now(self) -> float:
+        """Current sim ET; inside snapshot() every call returns the same value."""
+        et = _snapshot_et.get()
+        if et is not None:
+            return et
+        return self._live_et()
+
+    def _reanchor(self, et: float):
+        self._anchor_et = et
+        self._anchor_mono = time.monotonic()
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self)
+
+    def pause(self):
+        with self._lock:
+            if self.paused:
+                return
+            self._reanchor(self._live_et())
+            self.paused = True
+        self._changed()
+
+    def resume(self):
+        with self._lock:
+            if not self.paused:
+                return
+            self._ensure_anchor()
+            self._reanchor(self._anchor_et)
+            self.paused = False
+        self._changed()
+
+    def set_warp(self, warp: float):
+        """Change the time warp factor without a jump in sim time."""
+        with self._lock:
+            self._reanchor(self._live_et())
+            self.warp = warp
+        self._changed()
+
+    def set_epoch(self, et: float):
+        with self._lock:
+            self._reanchor(et)
+        self._changed()
+
+    def state(self) -> dict:
+        """Live ET, paused flag and warp factor (journal records, snapshots)."""
+        with self._lock:
+            return {"et": self._live_et(), "paused": self.paused, "warp": self.warp}
+
+    def restore(self, et: float, paused: bool, warp: float):
+        """Set the whole clock state at once, without notifying on_change."""
+        with self._lock:
+            self._reanchor(et)
+            self.paused = paused
+            self.warp = warp
+
+    @contextmanager
+    def snapshot(self):
+        """Freeze now() for the duration of the block (one request or one telemetry tick)."""
+        token = _snapshot_et.set(self._live_et())
+        try:
+            yield _snapshot_et.get()
+        finally:
+            _snapshot_et.reset(token)
+
+sim_clock = SimClock()
@@ -0,0 +1,289 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+import spiceypy
+from typing import Dict, List, Optional, Sequence, Tuple
+from .metrics import instrument_spice
+
+# SPICE calls are counted per function (see metrics.py)
+spice = instrument_spice(spiceypy)
+
+# Coverage manifests are cached here, keyed by the checksum of the SPK files
+COVERAGE_CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   "kernels", "spk_coverage.json")
+# Manifests kept in the cache file (e.g. full de440 and a subset)
+COVERAGE_CACHE_ENTRIES = 4
+COVERAGE_CACHE_VERSION = 1
+
+# Packed SPK segment descriptor: ND=2 doubles + NI=6 integers -> 5 doubles
+SPK_DESCR_SIZE = 5
+SSB_ID = 0
+
+class CoverageError(ValueError):
+    """A body the loaded kernels do not cover (at all, or at the requested epoch)."""
+
+def read_segments(handle):
+    """[(descriptor, ident, target, center, start_et, stop_et)] for every segment of an open SPK."""
+    segments = []
+    spice.dafbfs(handle)
+    found = spice.daffna()
+    while found:
+        descr = spice.dafgs(SPK_DESCR_SIZE)
+        ident = spice.dafgn()
+        dc, ic = spice.dafus(descr, 2, 6)
+        segments.append((descr, ident, ic[0], ic[1], dc[0], dc[1]))
+        found = spice.daffna()
+    return segments
+
+def file_checksum(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def merge_intervals(intervals: np.ndarray) -> np.ndarray:
+    """Union of (n, 2) [start, stop] intervals, sorted and non-overlapping."""
+    intervals = np.asarray(intervals, dtype=np.float64).reshape(-1, 2)
+    if len(intervals) == 0:
+        return intervals
+    intervals = intervals[np.argsort(intervals[:, 0], kind="stable")]
+    merged = [intervals[0].tolist()]
+    for start, stop in intervals[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], stop)
+        else:
+            merged.append([start, stop])
+    return np.array(merged)
+
+def intersect_intervals(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersection of two merged interval lists."""
+    out = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start, stop = max(a[i, 0], b[j, 0]), min(a[i, 1], b[j, 1])
+        if start <= stop:
+            out.append([start, stop])
+        if a[i, 1] < b[j, 1]:
+            i += 1
+        else:
+            j += 1
+    return np.array(out, dtype=np.float64).reshape(-1, 2)
+
+def candidate_ids(body_id: int) -> List[int]:
+    """
+    NAIF IDs that can stand in for a body, best first: the body itself, then
+    for a planet (e.g. MARS, 499) its system barycenter (4). DE440 only
+    carries barycenters for Mars and the outer planets.
+    """
+    candidates = [body_id]
+    if 199 <= body_id <= 999 and body_id % 100 == 99:
+        candidates.append(body_id // 100)
+    return candidates
+
+class CoverageManifest:
+    """
+    What the loaded SPK files can answer: for every NAIF ID, the ET intervals
+    over which its state relative to the solar system barycenter is
+    available (its own segments intersected with those of every center it is
+    chained through, e.g. 399 -> 3 -> 0). Body names resolve to the best
+    covered ID before anything is asked of SPICE.
+    """
+
+    def __init__(self, coverage: Dict[int, np.ndarray], centers: Dict[int, List[int]], checksum: str = ""):
+        self.coverage = coverage
+        self.centers = centers
+        self.checksum = checksum
+        self._candidates: Dict[str, List[int]] = {}
+
+    @classmethod
+    def build(cls, spk_paths: Sequence[str], checksum: str = "") -> "CoverageManifest":
+        """Enumerate bodies (spkobj) and their coverage (spkcov) across the SPK files."""
+        own: Dict[int, np.ndarray] = {}
+        centers: Dict[int, set] = {}
+        for path in spk_paths:
+            for body_id in spice.spkobj(path):
+                cover = spice.spkcov(path, int(body_id))
+                intervals = [spice.wnfetd(cover, i) for i in range(spice.wncard(cover))]
+                own[int(body_id)] = merge_intervals(np.concatenate(
+                    (own.get(int(body_id), np.empty((0, 2))), np.array(intervals).reshape(-1, 2))))
+            handle = spice.dafopr(path)
+            try:
+                for _, _, target, center, _, _ in read_segments(handle):
+                    centers.setdefault(int(target), set()).add(int(center))
+            finally:
+                spice.dafcls(handle)
+
+        coverage: Dict[int, np.ndarray] = {}
+
+        def chained(body_id: int, visiting: frozenset) -> np.ndarray:
+            if body_id == SSB_ID:
+                return np.array([[-np.inf, np.inf]])
+            if body_id in coverage:
+                return coverage[body_id]
+            if body_id not in own or body_id in visiting:
+                return np.empty((0, 2))
+            # Union over the centers the body's segments are given against
+            reachable = [intersect_intervals(own[body_id], chained(c, visiting | {body_id}))
+                         for c in sorted(centers.get(body_id, ()))]
+            coverage[body_id] = merge_intervals(np.concatenate(reachable) if reachable else np.empty((0, 2)))
+            return coverage[body_id]
+
+        for body_id in own:
+            chained(body_id, frozenset())
+        return cls(coverage, {k: sorted(v) for k, v in centers.items()}, checksum)
+
+    def to_dict(self) -> dict:
+        return {
+            "checksum": self.checksum,
+            "bodies": {str(k): {"centers": self.centers.get(k, []), "intervals": v.tolist()}
+                       for k, v in self.coverage.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CoverageManifest":
+        coverage = {int(k): np.array(v["intervals"], dtype=np.float64).reshape(-1, 2) for k, v in data["bodies"].items()}
+        centers = {int(k): v["centers"] for k, v in data["bodies"].items()}
+        return cls(coverage, centers, data.get("checksum", ""))
+
+    def bodies(self) -> List[int]:
+        return sorted(self.coverage)
+
+    def covers(self, body_id: int, ets) -> np.ndarray:
+        """Boolean mask: which epochs body_id (chained to the SSB) is covered at."""
+        ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+        intervals = self.coverage.get(body_id)
+        if intervals is None or len(intervals) == 0:
+            return np.zeros(len(ets), dtype=bool)
+        # Index of the last interval starting at or before each epoch
+        i = np.searchsorted(intervals[:, 0], ets, side="right") - 1
+        return (i >= 0) & (ets <= intervals[np.maximum(i, 0), 1])
+
+    def interval(self, body_id: int, et: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        """Coverage interval of body_id containing et (the longest one if et is None)."""
+        intervals = self.coverage.get(body_id)
+        if intervals is None or len(intervals) == 0:
+            return None
+        if et is None:
+            start, stop = intervals[np.argmax(intervals[:, 1] - intervals[:, 0])]
+            return float(start), float(stop)
+        i = int(np.searchsorted(intervals[:, 0], et, side="right")) - 1
+        if i < 0 or et > intervals[i, 1]:
+            return None
+        return float(intervals[i, 0]), float(intervals[i, 1])
+
+    def candidates(self, name: str) -> List[int]:
+        """Covered NAIF IDs that can answer for a body name (or numeric ID string), best first."""
+        key = str(name).strip().upper()
+        if key not in self._candidates:
+            try:
+                body_id = int(spice.bods2c(key))
+            except Exception:
+                raise CoverageError(f"Unknown body '{name}'")
+            self._candidates[key] = [c for c in candidate_ids(body_id) if c in self.coverage or c == SSB_ID]
+        return self._candidates[key]
+
+    def resolve(self, name: str, et: Optional[float] = None) -> Tuple[int, Tuple[float, float]]:
+        """
+        Best covered NAIF ID for a body and the ET interval it is good for.
+        With an epoch, only IDs covered at that epoch qualify. Raises
+        CoverageError if there are none.
+        """
+        for body_id in self.candidates(name):
+            if body_id == SSB_ID:
+                return body_id, (-np.inf, np.inf)
+            interval = self.interval(body_id, et)
+            if interval is not None:
+                return body_id, interval
+        if et is None:
+            raise CoverageError(f"No loaded kernel covers '{name}'")
+        raise CoverageError(f"No loaded kernel covers '{name}' at ET {et:.3f}")
+
+    def resolve_many(self, name: str, ets) -> Tuple[int, np.ndarray]:
+        """
+        Batch resolve: the candidate ID covering the most epochs (the best one
+        on a tie) and the mask of epochs it covers. Raises CoverageError if
+        no epoch is covered.
+        """
+        best_id, best_mask = None, None
+        for body_id in self.candidates(name):
+            mask = self.covers(body_id, ets) if body_id != SSB_ID else np.ones(len(np.atleast_1d(ets)), dtype=bool)
+            if best_mask is None or mask.sum() > best_mask.sum():
+                best_id, best_mask = body_id, mask
+            if mask.all():
+                break
+        if best_mask is None or not best_mask.any():
+            raise CoverageError(f"No loaded kernel covers '{name}' at the requested epochs")
+        return best_id, best_mask
+
+    def body_ids(self, names: Sequence[str]) -> Dict[str, int]:
+        """name -> best covered NAIF ID, skipping bodies that are not covered."""
+        ids = {}
+        for name in names:
+            try:
+                ids[name] = self.resolve(name)[0]
+            except CoverageError:
+                pass
+        return ids
+
+_cache_lock = threading.Lock()
+
+def _kernel_checksums(spk_paths: Sequence[str], known: Dict[str, dict]) -> List[str]:
+    """sha256 per SPK file; files whose size and mtime are unchanged reuse the recorded checksum."""
+    checksums = []
+    for path in spk_paths:
+        st = os.stat(path)
+        entry = known.get(os.path.abspath(path))
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            checksums.append(entry["sha256"])
+        else:
+            checksums.append(file_checksum(path))
+    return checksums
+
+def load_coverage(spk_paths: Sequence[str], cache_file: str = COVERAGE_CACHE_FILE) -> CoverageManifest:
+    """
+    Coverage manifest for the SPK files: read from the cache file when one
+    was built for the same kernel checksum, otherwise built and cached.
+    """
+    with _cache_lock:
+        cache = {}
+        try:
+            with open(cache_file, "r") as f:
+                cache = json.load(f)
+            if cache.get("version") != COVERAGE_CACHE_VERSION:
+                cache = {}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not read {cache_file}: {e}")
+        files = cache.get("files", {})
+        manifests = cache.get("manifests", {})
+
+        checksums = _kernel_checksums(spk_paths, files)
+        key = hashlib.sha256("\n".join(checksums).encode("ascii")).hexdigest()
+        if key in manifests:
+            return CoverageManifest.from_dict(manifests[key])
+
+        manifest = CoverageManifest.build(spk_paths, key)
+        for path, checksum in zip(spk_paths, checksums):
+            st = os.stat(path)
+            files[os.path.abspath(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": checksum}
+        manifests.pop(key, None)
+        manifests[key] = manifest.to_dict()
+        # Oldest first (insertion order), so drop from the front
+        while len(manifests) > COVERAGE_CACHE_ENTRIES:
+            manifests.pop(next(iter(manifests)))
+
+        # Written under a temporary name: worker processes read it concurrently
+        tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"version": COVERAGE_CACHE_VERSION, "files": files, "manifests": manifests}, f)
+            os.replace(tmp_path, cache_file)
+        except Exception as e:
+            print(f"Warning: Could not write {cache_file}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return manifest
@@ -0,0 +1,118 @@
+import json
+import struct
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+# Packed-array response, chosen by the client with
+#   Accept: application/x-astrogator-arrays[; dtype=float32]
+#
+#   b"AGA1"                      magic
+#   uint32 (little-endian)       header length H
+#   H bytes                      UTF-8 JSON header, space-padded so the data starts 8-byte aligned
+#   data                         raw little-endian buffers, each at an 8-byte aligned offset
+#
+# header = {"meta": {...}, "arrays": [{"name", "dtype", "shape", "offset", "nbytes"}]}
+# with offsets relative to the start of the data, so a browser can wrap each
+# buffer in a Float32Array/Float64Array without copying.
+BINARY_MEDIA_TYPE = "application/x-astrogator-arrays"
+BINARY_MAGIC = b"AGA1"
+BINARY_ALIGN = 8
+BINARY_DTYPES = {"float64": "<f8", "float32": "<f4"}
+
+def _default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON that serializes NumPy arrays and scalars directly."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode("utf-8")
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """JSON response bypassing FastAPI's per-element jsonable_encoder."""
+    return Response(dumps(content), status_code=status_code, media_type="application/json", headers=headers)
+
+def _pad(size: int) -> int:
+    return -size % BINARY_ALIGN
+
+def pack_arrays(arrays: Mapping[str, np.ndarray], meta: Optional[dict] = None, dtype: str = "<f8") -> bytes:
+    """Pack float arrays (converted to dtype) behind a JSON header. The buffers are never split into Python floats."""
+    entries, buffers, offset = [], [], 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array, dtype=dtype)
+        entries.append({"name": name, "dtype": array.dtype.str, "shape": list(array.shape),
+                        "offset": offset, "nbytes": array.nbytes})
+        buffers.append(array)
+        buffers.append(b"\0" * _pad(array.nbytes))
+        offset += array.nbytes + _pad(array.nbytes)
+
+    header = dumps({"meta": meta or {}, "arrays": entries})
+    header += b" " * _pad(len(BINARY_MAGIC) + 4 + len(header))
+    return b"".join([BINARY_MAGIC, struct.pack("<I", len(header)), header, *buffers])
+
+def unpack_arrays(body: bytes) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """Inverse of pack_arrays: (meta, name -> array), the arrays viewing body without a copy."""
+    if body[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise ValueError("Not a packed-array payload")
+    start = len(BINARY_MAGIC) + 4
+    (header_len,) = struct.unpack_from("<I", body, len(BINARY_MAGIC))
+    header = json.loads(body[start:start + header_len])
+    data = start + header_len
+    arrays = {}
+    for entry in header["arrays"]:
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        arrays[entry["name"]] = np.frombuffer(body, dtype=entry["dtype"], count=count,
+                                              offset=data + entry["offset"]).reshape(entry["shape"])
+    return header["meta"], arrays
+
+def _media_ranges(accept: str):
+    """(media type, params, q) for each range of an Accept header."""
+    for part in accept.split(","):
+        media, *raw_params = [p.strip() for p in part.split(";")]
+        params = {}
+        for param in raw_params:
+            key, _, value = param.partition("=")
+            params[key.strip().lower()] = value.strip().strip('"')
+        try:
+            q = float(params.pop("q", "1"))
+        except ValueError:
+            q = 0.0
+        yield media.lower(), params, q
+
+def binary_dtype(request: Request) -> Optional[str]:
+    """
+    Packed-array dtype if the client prefers BINARY_MEDIA_TYPE over JSON in
+    its Accept header (float64 unless it asks for dtype=float32), else None.
+    """
+    binary, binary_q, json_q = None, 0.0, 0.0
+    for media, params, q in _media_ranges(request.headers.get("accept", "")):
+        if media == BINARY_MEDIA_TYPE and q > binary_q:
+            dtype = BINARY_DTYPES.get(params.get("dtype", "float64"))
+            if dtype is not None:
+                binary, binary_q = dtype, q
+        elif media in ("application/json", "application/*", "*/*"):
+            json_q = max(json_q, q)
+    return binary if binary is not None and binary_q >= json_q else None
+
+def array_response(request: Request, arrays: Mapping[str, np.ndarray], meta: dict, content: Any) -> Response:
+    """
+    Content-negotiated response: the packed arrays if the client asked for
+    them, otherwise content (which may hold the same arrays) as JSON.
+    """
+    headers = {"Vary": "Accept"}
+    dtype = binary_dtype(request)
+    if dtype is not None:
+        return Response(pack_arrays(arrays, meta, dtype), media_type=BINARY_MEDIA_TYPE, headers=headers)
+    return json_response(content, headers=headers)
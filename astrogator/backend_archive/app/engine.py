@@ -1,24 +1,180 @@
-import spiceypy as spice
+import spiceypy
 import os
 import numpy as np
+import threading
+from collections import OrderedDict
 from typing import Tuple, List, Dict, Union
 
+from .clock import get_leap_seconds, sim_clock
+from .coverage import CoverageError, CoverageManifest, load_coverage
+from .ephemeris import CLIGHT, ChebyshevEphemeris, stellar_aberration
+from .metrics import instrument_spice
+
+try:
+    # Cython-accelerated, vectorized SPICE wrappers (spiceypy >= 7)
+    from spiceypy import cyice
+except ImportError:
+    cyice = None
+
+# SPICE calls are counted per function (see metrics.py)
+spice = instrument_spice(spiceypy)
+cyice = instrument_spice(cyice)
+
 # Kernel paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 KERNELS_DIR = os.path.join(BASE_DIR, "kernels")
 
-def load_kernels():
-    """Load all SPICE kernels from the kernels directory."""
+# Precomputed Chebyshev ephemeris (see tools/build_ephemeris.py)
+EPHEM_FILE = os.path.join(KERNELS_DIR, "ephemeris_cheb.npz")
+# Width of the in-process ephemeris window, centered on the sim epoch (days)
+EPHEM_WINDOW_DAYS = float(os.getenv("EPHEM_WINDOW_DAYS", "1500"))
+
+_ephemeris = None
+# Bodies and time spans the loaded SPK files cover (see coverage.py)
+_coverage = None
+# Planetary SPK chosen by load_kernels
+_spk_path = None
+
+# Epoch-bucketed state cache. Requests inside the same ET bucket share one
+# evaluation, made at the start of the bucket.
+STATE_CACHE_QUANTUM_SEC = float(os.getenv("STATE_CACHE_QUANTUM_SEC", "1.0"))
+STATE_CACHE_SIZE = int(os.getenv("STATE_CACHE_SIZE", "4096"))
+# Orbit paths barely change from one minute to the next
+ORBIT_CACHE_QUANTUM_SEC = float(os.getenv("ORBIT_CACHE_QUANTUM_SEC", "3600"))
+ORBIT_CACHE_SIZE = int(os.getenv("ORBIT_CACHE_SIZE", "64"))
+
+class EpochCache:
+    """Bounded LRU cache keyed by (target, observer, frame, aberration, quantized ET)."""
+
+    def __init__(self, maxsize: int, quantum: float):
+        self.maxsize = maxsize
+        self.quantum = quantum
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def quantize(self, et: float) -> float:
+        """Start of the ET bucket containing et (et itself if quantization is off)."""
+        if self.quantum <= 0:
+            return float(et)
+        return float(np.floor(et / self.quantum) * self.quantum)
+
+    def get(self, target: str, observer: str, frame: str, abcorr: str, et: float, compute):
+        """
+        Return the cached value for this key, or call compute(bucket_et) and store it.
+        Values are shared between callers and must not be mutated.
+        """
+        bucket_et = self.quantize(et)
+        key = (target.upper(), observer.upper(), frame, abcorr, bucket_et)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute(bucket_et)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "quantum_sec": self.quantum,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+state_cache = EpochCache(STATE_CACHE_SIZE, STATE_CACHE_QUANTUM_SEC)
+orbit_cache = EpochCache(ORBIT_CACHE_SIZE, ORBIT_CACHE_QUANTUM_SEC)
+
+def get_cache_stats() -> Dict[str, Dict[str, float]]:
+    return {"states": state_cache.stats(), "orbits": orbit_cache.stats()}
+
+def clear_caches():
+    """Drop all cached states, e.g. after (re)loading kernels or the ephemeris."""
+    state_cache.clear()
+    orbit_cache.clear()
+
+LSK_FILE = "naif0012.tls"
+SPK_FILE = "de440.bsp"
+PCK_FILE = "pck00010.tpc"
+# Time-windowed subset of de440 written by tools/subset_spk.py; loaded instead
+# of the full file when present (relative to KERNELS_DIR, or an absolute path)
+SPK_SUBSET_FILE = os.getenv("SPK_SUBSET_FILE", "de440_subset.bsp")
+
+def spk_path() -> str:
+    """The planetary SPK: the one load_kernels chose, else the subset if it exists, else the full de440."""
+    if _spk_path is not None:
+        return _spk_path
+    subset = os.path.join(KERNELS_DIR, SPK_SUBSET_FILE)
+    if SPK_SUBSET_FILE and os.path.exists(subset):
+        return subset
+    return os.path.join(KERNELS_DIR, SPK_FILE)
+
+def select_spk(et: float) -> Tuple[str, Union[CoverageManifest, None]]:
+    """
+    (path, coverage manifest or None) of the planetary SPK to load for a sim
+    starting at et: the subset only if it covers every ephemeris body at et.
+    Falls back to the full de440, or raises if that is missing too.
+    """
+    full = os.path.join(KERNELS_DIR, SPK_FILE)
+    subset = os.path.join(KERNELS_DIR, SPK_SUBSET_FILE)
+    if not (SPK_SUBSET_FILE and os.path.exists(subset)):
+        return full, None
+    manifest = load_coverage([subset])
+    missing = []
+    for name in list(EPHEM_BODIES) + ["SUN"]:
+        try:
+            manifest.resolve(name, et)
+        except CoverageError:
+            missing.append(name)
+    if not missing:
+        return subset, manifest
+
+    problem = (f"{os.path.basename(subset)} does not cover {', '.join(missing)} at the sim epoch "
+               f"{spice.et2utc(et, 'ISOC', 0)}")
+    if os.path.exists(full):
+        print(f"Warning: {problem}; loading {SPK_FILE} instead")
+        return full, None
+    raise RuntimeError(f"{problem} and {full} does not exist. Rebuild the subset around the epoch "
+                       f"(tools/subset_spk.py --center <epoch>) or run fetch_kernels.py.")
+
+def load_kernels(with_ephemeris: bool = True):
+    """Load all SPICE kernels from the kernels directory and their coverage manifest."""
+    global _coverage, _spk_path
+    lsk = os.path.join(KERNELS_DIR, LSK_FILE)
+    manifest = None
+    if os.path.exists(lsk):
+        # Leapseconds first: choosing the SPK needs the sim epoch as ET
+        spice.furnsh(lsk)
+        _spk_path, manifest = select_spk(now_et())
     # List of kernels to load
     kernels = [
-        "naif0012.tls",  # Leapseconds
-        "de440.bsp",     # Planetary Ephemeris
-        "pck00010.tpc",  # Planetary Constants
+        lsk,                                    # Leapseconds
+        spk_path(),                             # Planetary Ephemeris
+        os.path.join(KERNELS_DIR, PCK_FILE),    # Planetary Constants
     ]
     
     loaded_count = 0
-    for kernel in kernels:
-        path = os.path.join(KERNELS_DIR, kernel)
+    for path in kernels:
+        kernel = os.path.basename(path)
         if os.path.exists(path):
             try:
                 spice.furnsh(path)
@@ -29,6 +185,58 @@ def load_kernels():
             print(f"Kernel not found: {path} (Run fetch_kernels.py first)")
             
     # print(f"Loaded {loaded_count}/{len(kernels)} SPICE kernels.")
+    if manifest is not None:
+        _coverage = manifest
+    elif os.path.exists(spk_path()):
+        try:
+            _coverage = load_coverage([spk_path()])
+        except Exception as e:
+            print(f"Coverage manifest failed, resolving bodies by name only: {e}")
+            _coverage = None
+
+    if with_ephemeris:
+        init_ephemeris()
+
+def init_ephemeris(center_et: float = None):
+    """
+    Set up the in-process Chebyshev ephemeris around center_et (default: now).
+    Uses the precomputed table file if it covers the epoch, otherwise fits one from SPICE.
+    """
+    global _ephemeris
+    clear_caches()
+    try:
+        if center_et is None:
+            center_et = now_et()
+
+        if os.path.exists(EPHEM_FILE):
+            eph = ChebyshevEphemeris.load(EPHEM_FILE)
+            start_et, end_et = eph.window()
+            if start_et <= center_et <= end_et:
+                _ephemeris = eph
+                return
+
+        _ephemeris = ChebyshevEphemeris.build(EPHEM_BODIES, center_et, EPHEM_WINDOW_DAYS, body_ids(EPHEM_BODIES))
+    except Exception as e:
+        print(f"Ephemeris init failed, using SPICE only: {e}")
+        _ephemeris = None
+
+def get_ephemeris() -> ChebyshevEphemeris:
+    return _ephemeris
+
+def get_coverage() -> CoverageManifest:
+    return _coverage
+
+# Constant rotation J2000 -> ECLIPJ2000 (both inertial)
+_ECLIP_ROT = None
+
+def _rotate_states(states: np.ndarray, frame: str) -> np.ndarray:
+    """Rotate (N,6) J2000 states into an inertial output frame."""
+    global _ECLIP_ROT
+    if frame == "J2000":
+        return states
+    if _ECLIP_ROT is None:
+        _ECLIP_ROT = np.array(spice.pxform("J2000", "ECLIPJ2000", 0.0))
+    return np.hstack((states[:, :3] @ _ECLIP_ROT.T, states[:, 3:6] @ _ECLIP_ROT.T))
 
 def utc_to_et(utc_str: str) -> float:
     """Convert UTC string to Ephemeris Time (seconds past J2000)."""
@@ -37,25 +245,73 @@ def utc_to_et(utc_str: str) -> float:
     except Exception as e:
         raise ValueError(f"Invalid UTC string '{utc_str}': {e}")
 
+def now_et() -> float:
+    """Current sim time as ET (see clock.SimClock)."""
+    return sim_clock.now()
+
 def et_to_utc(et: float, format_str: str = "C") -> str:
     """Convert ET to UTC string."""
-    return spice.timout(et, "YYYY-MM-DD HR:MN:SC.### ::RND")
+    try:
+        # Leap-second table lookup; same output as timout below without a SPICE call
+        return get_leap_seconds().et_to_utc(et)
+    except Exception:
+        return spice.timout(et, "YYYY-MM-DD HR:MN:SC.### ::RND")
+
+def resolve_body_id(target: str, et: float = None) -> int:
+    """
+    NAIF ID to ask SPICE for: the best ID the loaded kernels cover (at et, if
+    given), e.g. MARS -> 4 (MARS BARYCENTER) with de440. Raises CoverageError
+    if nothing covers the body.
+    """
+    if _coverage is not None:
+        return _coverage.resolve(target, et)[0]
+    return spice.bods2c(target)
+
+def body_ids(names) -> Dict[str, int]:
+    """name -> resolved NAIF ID for the names the kernels cover."""
+    if _coverage is not None:
+        return _coverage.body_ids(names)
+    ids = {}
+    for name in names:
+        try:
+            ids[name] = spice.bods2c(name)
+        except Exception:
+            pass
+    return ids
 
 def get_body_state(target: str, observer: str, et: float, frame: str = "J2000") -> np.ndarray:
     """Get state vector (position [km], velocity [km/s]) of target relative to observer."""
+    state = state_cache.get(target, observer, frame, "NONE", et,
+                            lambda bucket_et: _compute_body_state(target, observer, bucket_et, frame))
+    return state.copy()
+
+def _compute_body_state(target: str, observer: str, et: float, frame: str) -> np.ndarray:
+    if _ephemeris is not None and frame in ("J2000", "ECLIPJ2000"):
+        if _ephemeris.covers(target, observer, et)[0]:
+            return _rotate_states(_ephemeris.get_states(target, observer, et), frame)[0]
     try:
-        # Using NONE for geometric state (truth)
-        state, _ = spice.spkezr(target, et, frame, "NONE", observer)
+        # Out-of-coverage requests stop here, before SPICE
+        target_id = resolve_body_id(target, et)
+        observer_id = resolve_body_id(observer, et)
+        # Geometric state (truth), same as spkezr with NONE
+        state, _ = spice.spkgeo(target_id, et, frame, observer_id)
         return np.array(state)
+    except CoverageError as e:
+        print(f"State not available: {e}")
     except Exception as e:
         print(f"SPICE Error getting state: {e}")
-        return np.zeros(6)
+    return np.zeros(6)
 
 def frame_transform(state: np.ndarray, from_frame: str, to_frame: str, et: float) -> np.ndarray:
     """Transform a 6D state vector between frames."""
     mat = spice.sxform(from_frame, to_frame, et)
     return np.dot(mat, state)
 
+def frame_transform_many(states: np.ndarray, from_frame: str, to_frame: str, et: float) -> np.ndarray:
+    """Transform an (N,6) array of states sharing one epoch: a single sxform for all rows."""
+    mat = np.array(spice.sxform(from_frame, to_frame, et))
+    return states @ mat.T
+
 def vector_to_radec(position: np.ndarray) -> Tuple[float, float, float]:
     """
     Convert J2000 position vector to Right Ascension and Declination.
@@ -65,50 +321,100 @@ def vector_to_radec(position: np.ndarray) -> Tuple[float, float, float]:
     r, ra_rad, dec_rad = spice.recrad(position)
     return r, np.degrees(ra_rad), np.degrees(dec_rad)
 
-def get_apparent_target_radec(target: str, observer_pos_j2k: np.ndarray, et: float) -> Tuple[float, float, float]:
+def vectors_to_radec(positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Get apparent RA/DEC of a target body as seen from an observer at a given J2000 position.
+    Vectorized vector_to_radec for an (N,3) array of J2000 vectors.
+    Returns (range, ra, dec) arrays in (km, degrees, degrees), ra in [0, 360).
     """
-    # 1. Get Target Position relative to Solar System Barycenter (SSB)
-    # 2. Observer Position is relative to Sun? Or SSB? 
-    # Let's assume observer_pos_j2k is relative to SUN for now if our Sim works that way,
-    # or relative to SSB. Standard SPICE usage usually references SSB (0).
-    
-    # Let's handle observer_pos as relative to SUN (body 10).
-    # Target state relative to SUN.
-    # Map common names to Barycenter IDs if implied by de440 coverage issues
-    # Mars(499) -> 4, Jupiter(599) -> 5, etc.
-    # We can trust that spice.spkezr handles string->id conversion, but if 'MARS' maps to 499 
-    # and 499 is missing, we must manually map 'MARS' -> '4' or 'MARS BARYCENTER'.
-    
-    # NAIF ID mapping for DE440 fallback
-    FALLBACK_MAP = {
-        "MARS": "4",
-        "JUPITER": "5",
-        "SATURN": "6",
-        "URANUS": "7",
-        "NEPTUNE": "8",
-        "PLUTO": "9"
-    }
-
-    target_lookup = FALLBACK_MAP.get(target.upper(), target)
+    positions = np.atleast_2d(positions)
+    r = np.linalg.norm(positions, axis=1)
+    ra = np.degrees(np.arctan2(positions[:, 1], positions[:, 0])) % 360.0
+    dec = np.degrees(np.arcsin(np.divide(positions[:, 2], r, out=np.zeros_like(r), where=r > 0)))
+    return r, ra, dec
 
-    try:
-        # Using NONE for geometric state (truth)
-        # Use target_lookup instead of target
-        target_state_wrt_sun, _ = spice.spkezr(target_lookup, et, "J2000", "LT+S", "SUN")
-        target_pos_wrt_sun = np.array(target_state_wrt_sun[:3])
-        
-        # Vector from Observer to Target = Target_wrt_Sun - Observer_wrt_Sun
-        # (Assuming observer_pos_j2k is defined relative to Sun)
-        obs_to_target = target_pos_wrt_sun - observer_pos_j2k
-        
-        return vector_to_radec(obs_to_target)
-    except Exception as e:
-        return vector_to_radec(obs_to_target)
-    except Exception as e:
-        print(f"Error getting apparent RA/DEC for {target} (using {target_lookup}): {e}")
-        return 0, 0, 0
+# Light-time fixed point: each iteration shrinks the error by ~v/c (~1e-4),
+# so the planets converge in two or three
+LIGHT_TIME_ITERATIONS = 5
+LIGHT_TIME_TOL_SEC = 1.0e-6
+
+def _ssb_states_many(targets: List[str], ets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Geometric J2000 states (N,6) relative to the SSB of targets[i] at ets[i],
+    plus a mask of the rows that could be evaluated. Rows inside the
+    ephemeris window go through one batched Chebyshev evaluation, the rest
+    through SPICE (out-of-coverage rows are skipped, not asked).
+    """
+    ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+    states = np.zeros((len(targets), 6))
+    valid = np.zeros(len(targets), dtype=bool)
+    on_table = np.zeros(len(targets), dtype=bool)
+    if _ephemeris is not None:
+        on_table = np.array([bool(_ephemeris.covers(t, "SSB", et)[0]) for t, et in zip(targets, ets)], dtype=bool)
+        if on_table.any():
+            rows = np.flatnonzero(on_table)
+            states[rows] = _ephemeris.get_ssb_states_many([targets[i] for i in rows], ets[rows])
+            valid[rows] = True
+
+    for i in np.flatnonzero(~on_table):
+        try:
+            states[i] = spice.spkgeo(resolve_body_id(targets[i], ets[i]), ets[i], "J2000", 0)[0]
+            valid[i] = True
+        except CoverageError as e:
+            print(f"State not available: {e}")
+        except Exception as e:
+            print(f"SPICE Error getting state: {e}")
+    return states, valid
+
+def get_apparent_targets_radec(targets: List[str], observer_state_j2k: np.ndarray, et: float,
+                               aberration: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Apparent RA/DEC of several bodies from one observer, given its J2000 state
+    relative to the SUN (position, or position and velocity).
+    Light time is iterated to convergence from the observer's own position,
+    for all targets at once (like SPICE "CN"); stellar aberration uses the
+    observer's barycentric velocity (like "+S") unless aberration is False.
+    Returns (range, ra, dec) arrays aligned with targets; bodies that fail to
+    evaluate come back as zeros.
+    """
+    n = len(targets)
+    zeros = (np.zeros(n), np.zeros(n), np.zeros(n))
+    observer = np.zeros(6)
+    observer_state_j2k = np.asarray(observer_state_j2k, dtype=np.float64).ravel()[:6]
+    observer[:len(observer_state_j2k)] = observer_state_j2k
+
+    sun, sun_ok = _ssb_states_many(["SUN"], np.array([et]))
+    if not sun_ok[0]:
+        return zeros
+    observer = observer + sun[0]
+
+    # Newtonian light time, fixed-point iteration: lt = |r_target(et - lt) - r_observer(et)| / c
+    states, valid = _ssb_states_many(targets, np.full(n, et))
+    lt = np.linalg.norm(states[:, :3] - observer[:3], axis=1) / CLIGHT
+    for _ in range(LIGHT_TIME_ITERATIONS):
+        states, ok = _ssb_states_many(targets, et - lt)
+        valid &= ok
+        new_lt = np.linalg.norm(states[:, :3] - observer[:3], axis=1) / CLIGHT
+        converged = np.max(np.abs(new_lt - lt)[valid], initial=0.0) <= LIGHT_TIME_TOL_SEC
+        lt = new_lt
+        if converged:
+            break
+
+    pos = states[:, :3] - observer[:3]
+    if aberration:
+        pos = stellar_aberration(pos, np.broadcast_to(observer[3:6], pos.shape))
+
+    r, ra, dec = vectors_to_radec(pos)
+    r[~valid] = ra[~valid] = dec[~valid] = 0.0
+    return r, ra, dec
+
+def get_apparent_target_radec(target: str, observer_state_j2k: np.ndarray, et: float,
+                              aberration: bool = True) -> Tuple[float, float, float]:
+    """
+    Get apparent RA/DEC of a target body as seen from an observer at a given
+    J2000 state relative to the SUN (see get_apparent_targets_radec).
+    """
+    r, ra, dec = get_apparent_targets_radec([target], observer_state_j2k, et, aberration)
+    return float(r[0]), float(ra[0]), float(dec[0])
 
 # Orbital Periods in days (Approx)
 ORBITAL_PERIODS = {
@@ -120,60 +426,92 @@ ORBITAL_PERIODS = {
     "SATURN": 10747.0
 }
 
-def get_body_position(target: str, et: float) -> List[float]:
-    """Get [x,y,z] position of target relative to SUN in J2000 frame (km)."""
-    # Define fallback map inside or access from scope if available.
-    # Duplicating here or moving it to module level is better.
-    # Moving FALLBACK_MAP to module level is cleaner but triggers larger diff.
-    # Let's just define it here for minimal disruption or use the one if I move it.
-    
-    # Let's check `get_apparent_target_radec`'s map. It's inside that function.
-    # I'll define a module-level constant for it to avoid duplication.
-    
-    FALLBACK_MAP = {
-        "MARS": "4",
-        "JUPITER": "5",
-        "SATURN": "6",
-        "URANUS": "7",
-        "NEPTUNE": "8",
-        "PLUTO": "9"
-    }
-    
-    target_lookup = FALLBACK_MAP.get(target.upper(), target)
+# Bodies in the in-process ephemeris: the orrery planets plus the Moon (n-body perturber)
+EPHEM_BODIES = dict(ORBITAL_PERIODS, MOON=27.32)
+
+def get_body_states(target: str, ets: np.ndarray, frame: str = "J2000", observer: str = "SUN") -> np.ndarray:
+    """
+    Batch geometric states of target relative to observer.
+    Returns an (N,6) array [x, y, z, vx, vy, vz] (km, km/s), one row per ET.
+    """
+    ets = np.ascontiguousarray(np.atleast_1d(ets), dtype=np.float64)
+
+    if _ephemeris is not None and frame in ("J2000", "ECLIPJ2000"):
+        in_window = _ephemeris.covers(target, observer, ets)
+        if in_window.any():
+            states = np.empty((len(ets), 6))
+            states[in_window] = _rotate_states(_ephemeris.get_states(target, observer, ets[in_window]), frame)
+            if not in_window.all():
+                states[~in_window] = _spice_body_states(target, ets[~in_window], frame, observer)
+            return states
 
+    return _spice_body_states(target, ets, frame, observer)
+
+def _spice_body_states(target: str, ets: np.ndarray, frame: str, observer: str) -> np.ndarray:
+    """SPICE path for get_body_states."""
+    ets = np.ascontiguousarray(ets, dtype=np.float64)
+    states = np.zeros((len(ets), 6))
     try:
-        # 4 = Mars, 5 = Jupiter etc.
-        # Fallback map if needed, identical to get_apparent_target_radec logic
-        # But commonly SPICE handles strings if kernels are loaded.
-        # User requested Ecliptic Plane (Reference X-axis = Vernal Equinox). "ECLIPJ2000" is exactly that.
-        state, _ = spice.spkezr(target_lookup, et, "ECLIPJ2000", "NONE", "SUN")
-        return list(state[:3])
+        # Resolve names once for the whole batch instead of once per epoch;
+        # epochs outside kernel coverage are left as zeros without asking SPICE
+        if _coverage is not None:
+            target_id, target_ok = _coverage.resolve_many(target, ets)
+            observer_id, observer_ok = _coverage.resolve_many(observer, ets)
+            covered = target_ok & observer_ok
+        else:
+            target_id, observer_id = spice.bods2c(target), spice.bods2c(observer)
+            covered = np.ones(len(ets), dtype=bool)
     except Exception as e:
-        print(f"SPICE Error pos {target} (using {target_lookup}): {e}")
-        return [0.0, 0.0, 0.0]
+        print(f"SPICE Error resolving {target}/{observer}: {e}")
+        return states
+    if not covered.any():
+        print(f"States not available: no common kernel coverage for {target}/{observer}")
+        return states
 
-def get_orbit_path(target: str, center_et: float, num_points: int = 180) -> List[List[float]]:
+    ets = ets if covered.all() else np.ascontiguousarray(ets[covered])
+    try:
+        if cyice is not None:
+            batch, _ = cyice.spkgeo_v(target_id, ets, frame, observer_id)
+        else:
+            batch = [spice.spkgeo(target_id, et, frame, observer_id)[0] for et in ets]
+        states[covered] = np.asarray(batch, dtype=np.float64).reshape(len(ets), 6)
+    except Exception as e:
+        print(f"SPICE Error batch states {target}: {e}")
+    return states
+
+def get_body_positions(target: str, ets: np.ndarray, frame: str = "ECLIPJ2000") -> np.ndarray:
+    """Batch [x,y,z] positions of target relative to SUN (km). Returns an (N,3) array."""
+    return get_body_states(target, ets, frame, "SUN")[:, :3]
+
+def get_body_position(target: str, et: float) -> np.ndarray:
+    """Get [x,y,z] position of target relative to SUN in the ECLIPJ2000 frame (km)."""
+    # User requested Ecliptic Plane (Reference X-axis = Vernal Equinox). "ECLIPJ2000" is exactly that.
+    return get_body_state(target, "SUN", et, "ECLIPJ2000")[:3]
+
+def get_orbit_path_array(target: str, center_et: float, num_points: int = 180) -> np.ndarray:
     """
-    Generate a list of 3D points representing the orbit of the target body.
-    Samples one full orbital period centered around center_et.
+    (num_points + 1, 3) points along the orbit of the target body, sampling
+    one full orbital period starting at center_et. The array is shared with
+    the cache: don't modify it.
     """
+    return orbit_cache.get(target, "SUN", "ECLIPJ2000", f"PATH/{num_points}", center_et,
+                           lambda bucket_et: _compute_orbit_path(target, bucket_et, num_points))
+
+def get_orbit_path(target: str, center_et: float, num_points: int = 180) -> List[List[float]]:
+    """Orbit path of the target body as a list of [x,y,z] points."""
+    return get_orbit_path_array(target, center_et, num_points).tolist()
+
+def _compute_orbit_path(target: str, center_et: float, num_points: int) -> np.ndarray:
     period_days = ORBITAL_PERIODS.get(target.upper(), 365.0)
     period_sec = period_days * 24 * 3600
-    
-    # Start half a period ago to ensure we cover the loop? 
-    # Actually, usually just start at current time and go forward one period 
-    # to draw the "future" orbit, or center it.
-    # Let's start at current time minus nearly a full period to show the "track" 
-    # but for a closed loop it doesn't matter where we start.
-    
-    start_et = center_et
-    points = []
-    
+
+    # For a closed loop it doesn't matter where we start, so go forward
+    # one period from the current time. +1 point to close the loop.
     step = period_sec / num_points
-    
-    for i in range(num_points + 1): # +1 to close the loop effectively
-        t = start_et + (i * step)
-        pos = get_body_position(target, t)
-        points.append(pos)
-        
-    return points
+    ets = center_et + step * np.arange(num_points + 1)
+
+    return get_body_positions(target, ets)
+
+def get_orbit_paths(targets: List[str], center_et: float, num_points: int = 180) -> Dict[str, np.ndarray]:
+    """Orbit path arrays for several bodies, keyed by body name."""
+    return {target: get_orbit_path_array(target, center_et, num_points) for target in targets}
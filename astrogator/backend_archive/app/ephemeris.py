@@ -0,0 +1,226 @@
+import numpy as np
+import spiceypy
+from typing import Dict, List, Optional, Tuple
+from .metrics import instrument_spice
+
+try:
+    # Cython-accelerated, vectorized SPICE wrappers (spiceypy >= 7)
+    from spiceypy import cyice
+except ImportError:
+    cyice = None
+
+# SPICE calls are counted per function (see metrics.py)
+spice = instrument_spice(spiceypy)
+cyice = instrument_spice(cyice)
+
+# Speed of light (km/s), same value SPICE uses for light-time corrections
+CLIGHT = 299792.458
+
+# Polynomial degree and nodes per segment for the fit
+CHEB_DEGREE = 12
+CHEB_NODES = 16
+
+# Maximum position error (km) accepted when validating a fit against SPICE.
+# Bodies that exceed it are dropped from the table and keep going through SPICE.
+EPHEM_TOLERANCE_KM = 1.0e-3
+
+# Longest segment for any body (days). The Sun and Earth wobble around the
+# SSB on much shorter timescales than their own orbital period.
+MAX_SEGMENT_DAYS = 8.0
+
+class ChebyshevTable:
+    """Piecewise Chebyshev fit of one body's J2000 position relative to the SSB."""
+
+    def __init__(self, name: str, start_et: float, seg_len: float, coefs: np.ndarray):
+        self.name = name
+        self.start_et = start_et
+        self.seg_len = seg_len
+        # coefs: (n_segments, CHEB_DEGREE + 1, 3)
+        self.coefs = coefs
+        self.end_et = start_et + seg_len * len(coefs)
+        self.max_error_km = 0.0
+        # Derivative series, already scaled to km/s
+        self.dcoefs = np.polynomial.chebyshev.chebder(coefs, axis=1) * (2.0 / seg_len)
+        self._k = np.arange(coefs.shape[1])
+
+    def evaluate(self, ets: np.ndarray) -> np.ndarray:
+        """States (N,6) at an array of ETs. ETs must be inside the table window."""
+        ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+        u = (ets - self.start_et) / self.seg_len
+        idx = np.minimum(np.maximum(u.astype(np.int64), 0), len(self.coefs) - 1)
+        x = 2.0 * (u - idx) - 1.0
+
+        # T_k(x) = cos(k theta), x = cos(theta): the whole batch in a handful of array ops
+        theta = np.arccos(np.minimum(np.maximum(x, -1.0), 1.0))
+        T = np.cos(theta[:, None] * self._k)
+
+        states = np.empty((len(ets), 6))
+        states[:, :3] = np.einsum("nk,nkj->nj", T, self.coefs[idx])
+        states[:, 3:] = np.einsum("nk,nkj->nj", T[:, :-1], self.dcoefs[idx])
+        return states
+
+def _chebyshev_nodes() -> Tuple[np.ndarray, np.ndarray]:
+    """Fit nodes on [-1, 1] and the least-squares projection onto T_0..T_deg."""
+    k = np.arange(CHEB_NODES)
+    nodes = np.cos(np.pi * (k + 0.5) / CHEB_NODES)
+    vander = np.polynomial.chebyshev.chebvander(nodes, CHEB_DEGREE)
+    return nodes, np.linalg.pinv(vander)
+
+def _spice_states(body_id: int, ets: np.ndarray) -> np.ndarray:
+    """Geometric J2000 states of body_id relative to the SSB, straight from SPICE."""
+    ets = np.ascontiguousarray(ets, dtype=np.float64)
+    if cyice is not None:
+        states, _ = cyice.spkgeo_v(body_id, ets, "J2000", 0)
+        return np.asarray(states, dtype=np.float64).reshape(len(ets), 6)
+    return np.array([spice.spkgeo(body_id, et, "J2000", 0)[0] for et in ets]).reshape(len(ets), 6)
+
+def fit_body(name: str, body_id: int, start_et: float, end_et: float, seg_len: float) -> ChebyshevTable:
+    """Fit a Chebyshev table for one body over [start_et, end_et] and validate it against SPICE."""
+    n_seg = max(1, int(np.ceil((end_et - start_et) / seg_len)))
+    nodes, proj = _chebyshev_nodes()
+
+    seg_starts = start_et + seg_len * np.arange(n_seg)
+    sample_ets = (seg_starts[:, None] + (nodes[None, :] + 1.0) * 0.5 * seg_len).ravel()
+    samples = _spice_states(body_id, sample_ets)[:, :3].reshape(n_seg, CHEB_NODES, 3)
+
+    coefs = np.einsum("kn,snj->skj", proj, samples)
+    table = ChebyshevTable(name, start_et, seg_len, coefs)
+
+    # Validate off-node: a quarter of the way into every segment and at the boundaries
+    check_ets = np.concatenate((seg_starts + 0.25 * seg_len, seg_starts + 0.75 * seg_len, [start_et, table.end_et]))
+    check_ets = check_ets[check_ets <= end_et]
+    err = np.linalg.norm(table.evaluate(check_ets)[:, :3] - _spice_states(body_id, check_ets)[:, :3], axis=1)
+    table.max_error_km = float(err.max())
+    return table
+
+class ChebyshevEphemeris:
+    """In-process ephemeris: a set of Chebyshev tables sharing one time window."""
+
+    def __init__(self, tables: Dict[str, ChebyshevTable]):
+        self.tables = tables
+
+    @classmethod
+    def build(cls, bodies: Dict[str, float], center_et: float, window_days: float,
+              body_ids: Optional[Dict[str, int]] = None) -> "ChebyshevEphemeris":
+        """
+        Fit tables for `bodies` (name -> orbital period in days) plus the SUN
+        over center_et +/- window_days / 2. body_ids maps names to the NAIF ID
+        to fit (e.g. MARS -> 4 where only the barycenter is covered).
+        """
+        body_ids = body_ids or {}
+        half = window_days * 86400.0 / 2.0
+        start_et, end_et = center_et - half, center_et + half
+
+        periods = {"SUN": 4331.0}
+        periods.update(bodies)
+
+        tables = {}
+        for name, period_days in periods.items():
+            seg_days = min(period_days / 64.0, MAX_SEGMENT_DAYS)
+            try:
+                body_id = body_ids[name] if name in body_ids else spice.bods2c(name)
+                table = fit_body(name, body_id, start_et, end_et, seg_days * 86400.0)
+            except Exception as e:
+                print(f"Ephemeris fit failed for {name}: {e}")
+                continue
+            if table.max_error_km > EPHEM_TOLERANCE_KM:
+                print(f"Ephemeris fit for {name} off by {table.max_error_km:.3e} km, using SPICE instead")
+                continue
+            tables[name] = table
+        return cls(tables)
+
+    def save(self, path: str):
+        arrays = {}
+        for name, t in self.tables.items():
+            arrays[f"{name}/coefs"] = t.coefs
+            arrays[f"{name}/meta"] = np.array([t.start_et, t.seg_len, t.max_error_km])
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ChebyshevEphemeris":
+        tables = {}
+        with np.load(path) as data:
+            names = sorted({key.split("/")[0] for key in data.files})
+            for name in names:
+                start_et, seg_len, max_err = data[f"{name}/meta"]
+                table = ChebyshevTable(name, float(start_et), float(seg_len), data[f"{name}/coefs"])
+                table.max_error_km = float(max_err)
+                tables[name] = table
+        return cls(tables)
+
+    def bodies(self) -> List[str]:
+        return list(self.tables)
+
+    def window(self) -> Tuple[float, float]:
+        """Common (start_et, end_et) covered by every table."""
+        if not self.tables:
+            return 0.0, -1.0
+        return max(t.start_et for t in self.tables.values()), min(t.end_et for t in self.tables.values())
+
+    def covers(self, target: str, observer: str, ets: np.ndarray) -> np.ndarray:
+        """Boolean mask of the ETs that can be answered from the tables for this target/observer pair."""
+        ets = np.atleast_1d(ets)
+        for name in (target.upper(), observer.upper()):
+            if name not in self.tables and name not in ("SSB", "SOLAR SYSTEM BARYCENTER", "0"):
+                return np.zeros(len(ets), dtype=bool)
+        start_et, end_et = self.window()
+        return (ets >= start_et) & (ets <= end_et)
+
+    def _ssb_states(self, name: str, ets: np.ndarray) -> np.ndarray:
+        name = name.upper()
+        if name in ("SSB", "SOLAR SYSTEM BARYCENTER", "0"):
+            return np.zeros((len(ets), 6))
+        return self.tables[name].evaluate(ets)
+
+    def get_states(self, target: str, observer: str, ets: np.ndarray) -> np.ndarray:
+        """Geometric J2000 states (N,6) of target relative to observer."""
+        ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+        return self._ssb_states(target, ets) - self._ssb_states(observer, ets)
+
+    def get_ssb_states_many(self, names: List[str], ets: np.ndarray) -> np.ndarray:
+        """
+        Geometric J2000 states (N,6) relative to the SSB of names[i] at ets[i]:
+        several bodies, each at its own epoch, in one Chebyshev evaluation.
+        Every name must be covered at its epoch.
+        """
+        ets = np.atleast_1d(np.asarray(ets, dtype=np.float64))
+        n = len(ets)
+        ssb = np.array([name.upper() in ("SSB", "SOLAR SYSTEM BARYCENTER", "0") for name in names], dtype=bool)
+        tables = [None if ssb[i] else self.tables[names[i].upper()] for i in range(n)]
+        # Tables loaded from an older file may use another degree: zero-pad to the largest
+        k = max([t.coefs.shape[1] for t in tables if t is not None], default=1)
+        coefs = np.zeros((n, k, 3))
+        dcoefs = np.zeros((n, k - 1, 3))
+        x = np.zeros(n)
+        for i, table in enumerate(tables):
+            if table is None:
+                continue
+            u = (ets[i] - table.start_et) / table.seg_len
+            idx = min(max(int(u), 0), len(table.coefs) - 1)
+            x[i] = 2.0 * (u - idx) - 1.0
+            coefs[i, :table.coefs.shape[1]] = table.coefs[idx]
+            dcoefs[i, :table.dcoefs.shape[1]] = table.dcoefs[idx]
+
+        T = np.cos(np.arccos(np.clip(x, -1.0, 1.0))[:, None] * np.arange(k))
+        states = np.empty((n, 6))
+        states[:, :3] = np.einsum("nk,nkj->nj", T, coefs)
+        states[:, 3:] = np.einsum("nk,nkj->nj", T[:, :-1], dcoefs)
+        return states
+
+def stellar_aberration(pos: np.ndarray, vobs: np.ndarray) -> np.ndarray:
+    """
+    Vectorized equivalent of SPICE stelab: rotate each position toward the
+    observer's velocity by the first-order aberration angle.
+    """
+    r = np.linalg.norm(pos, axis=1, keepdims=True)
+    u = pos / np.where(r == 0.0, 1.0, r)
+    h = np.cross(u, vobs / CLIGHT)
+    sinphi = np.linalg.norm(h, axis=1, keepdims=True)
+    phi = np.arcsin(np.clip(sinphi, 0.0, 1.0))
+
+    # Rodrigues rotation of pos about h by phi
+    axis = h / np.where(sinphi == 0.0, 1.0, sinphi)
+    cos_p, sin_p = np.cos(phi), np.sin(phi)
+    return (pos * cos_p
+            + np.cross(axis, pos) * sin_p
+            + axis * np.sum(axis * pos, axis=1, keepdims=True) * (1.0 - cos_p))
@@ -0,0 +1,154 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+# Limits of one forecast request
+FORECAST_MAX_SPAN_DAYS = float(os.getenv("FORECAST_MAX_SPAN_DAYS", "365"))
+FORECAST_MAX_SAMPLES = int(os.getenv("FORECAST_MAX_SAMPLES", "5000"))
+FORECAST_MIN_STEP_SEC = 60.0
+# (ship, step) trajectories kept
+FORECAST_CACHE_SIZE = int(os.getenv("FORECAST_CACHE_SIZE", "256"))
+# A trajectory is extended this fraction beyond the requested horizon, so
+# the same request a little later is still served from the cache
+FORECAST_EXTEND_FRACTION = 0.25
+
+# sample(state, et, ets) -> (len(ets), 6) J2000 states at ets > et
+Sampler = Callable[[np.ndarray, float, np.ndarray], np.ndarray]
+
+class Trajectory:
+    """
+    One ship's future sampled on the grid anchor_et + k * step (J2000),
+    starting from its state at anchor_et. Grows at the end as requests reach
+    further ahead and drops samples the sim clock has passed.
+    """
+
+    def __init__(self, step: float, anchor_et: float, anchor_state: np.ndarray, generation: int = 0):
+        self.step = step
+        # The ship's invalidation count when the trajectory was started
+        self.generation = generation
+        self.anchor_et = anchor_et
+        # Grid index of the first stored sample
+        self.first_k = 0
+        self.ets = np.array([anchor_et])
+        self.states = np.array(anchor_state, dtype=np.float64).reshape(1, 6)
+
+    @property
+    def last_k(self) -> int:
+        return self.first_k + len(self.ets) - 1
+
+    def extend(self, end_k: int, sample: Sampler):
+        ks = np.arange(self.last_k + 1, end_k + 1)
+        ets = self.anchor_et + ks * self.step
+        new = sample(self.states[-1], float(self.ets[-1]), ets)
+        self.ets = np.concatenate((self.ets, ets))
+        self.states = np.concatenate((self.states, new))
+
+    def trim(self, start_k: int):
+        drop = min(start_k - self.first_k, len(self.ets) - 1)
+        if drop > 0:
+            self.ets = self.ets[drop:].copy()
+            self.states = self.states[drop:].copy()
+            self.first_k += drop
+
+class ForecastCache:
+    """
+    Per-ship forecast trajectories, keyed by (sc_id, step). A repeated
+    request is two array slices; as time advances the trajectory is only
+    extended by the newly needed samples. Entries are dropped when the
+    ship's state or burn plan changes (invalidate).
+
+    get() may run off the event loop: the caller reads the ship's state,
+    burn plan and generation() together and passes them in, and a request
+    planned before the latest invalidate is answered without touching the
+    cache. Sampling holds only its (sc_id, step) entry's lock, so requests
+    for other ships or steps are not held up behind an integration.
+    """
+
+    def __init__(self, maxsize: int = FORECAST_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple[str, float], Trajectory]" = OrderedDict()
+        # sc_id -> number of invalidations
+        self._generations: Dict[str, int] = {}
+        # (sc_id, step) -> lock held while that trajectory is sampled
+        self._key_locks: Dict[Tuple[str, float], threading.Lock] = {}
+        # Guards the dicts and counters; never held while sampling
+        self._lock = threading.Lock()
+
+    def generation(self, sc_id: str) -> int:
+        return self._generations.get(sc_id, 0)
+
+    def get(self, sc_id: str, state: np.ndarray, et: float, start_et: float, span: float,
+            step: float, sample: Sampler, generation: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (ets, J2000 states) on the step grid within [start_et, start_et + span].
+        state/et is the ship's current state, used only to start a new
+        trajectory; generation is generation(sc_id) when state was read
+        (default: now). The arrays are views of the cache: do not modify them.
+        """
+        key = (sc_id, float(step))
+        with self._lock:
+            current = self.generation(sc_id)
+            stale = generation is not None and generation != current
+            if stale:
+                self.misses += 1
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        if stale:
+            # The ship changed after this request read its state: don't cache
+            return self._window(Trajectory(step, et, state, generation), start_et, span, sample)
+
+        with key_lock:
+            with self._lock:
+                traj = self._entries.get(key)
+                if traj is not None and start_et < traj.ets[0]:
+                    # The sim clock moved back past the stored samples: start over
+                    del self._entries[key]
+                    self.invalidations += 1
+                    traj = None
+                if traj is None:
+                    traj = self._entries[key] = Trajectory(step, et, state, current)
+                    self.misses += 1
+                    while len(self._entries) > self.maxsize:
+                        evicted, _ = self._entries.popitem(last=False)
+                        self._key_locks.pop(evicted, None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+            return self._window(traj, start_et, span, sample)
+
+    def _window(self, traj: Trajectory, start_et: float, span: float, sample: Sampler) -> Tuple[np.ndarray, np.ndarray]:
+        step = traj.step
+        # Never before the first stored sample (a new trajectory anchored a hair after start_et)
+        start_k = max(int(np.ceil((start_et - traj.anchor_et) / step)), traj.first_k)
+        end_k = int(np.floor((start_et + span - traj.anchor_et) / step))
+        if end_k > traj.last_k:
+            ahead = int(np.ceil(span * FORECAST_EXTEND_FRACTION / step))
+            traj.extend(end_k + ahead, sample)
+            with self._lock:
+                self.extensions += 1
+        traj.trim(start_k)
+        i, j = start_k - traj.first_k, end_k - traj.first_k + 1
+        return traj.ets[i:j], traj.states[i:j]
+
+    def invalidate(self, sc_id: str):
+        with self._lock:
+            self._generations[sc_id] = self.generation(sc_id) + 1
+            for key in [key for key in self._entries if key[0] == sc_id]:
+                del self._entries[key]
+                self._key_locks.pop(key, None)
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "extensions": self.extensions,
+            "invalidations": self.invalidations,
+        }
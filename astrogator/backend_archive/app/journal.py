@@ -0,0 +1,196 @@
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .encoding import dumps, pack_arrays, unpack_arrays
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+logger = logging.getLogger(__name__)
+
+# Persist the server's fleet across restarts (journal + snapshots); opt-in
+SIM_PERSIST = os.getenv("SIM_PERSIST", "0") == "1"
+# Under data/, which deployments already mount as a volume
+SIM_STATE_DIR = os.getenv("SIM_STATE_DIR", os.path.join(BASE_DIR, "data", "sim_state"))
+# A snapshot is taken after this many records, or on the first record this
+# long after the previous snapshot: the journal tail a restart replays stays short
+SNAPSHOT_EVERY_RECORDS = int(os.getenv("SNAPSHOT_EVERY_RECORDS", "500"))
+SNAPSHOT_INTERVAL_SEC = float(os.getenv("SNAPSHOT_INTERVAL_SEC", "300"))
+# Older snapshots are deleted (the journal itself is never truncated)
+SNAPSHOTS_KEPT = 2
+# fsync every record, so a burn acknowledged to a student survives a power
+# loss (without it a record survives a process crash, not an OS crash)
+JOURNAL_FSYNC = os.getenv("JOURNAL_FSYNC", "0") == "1"
+
+_FILE_RE = re.compile(r"^(journal|snapshot)-(\d+)\.(jsonl|bin)$")
+
+Snapshot = Tuple[dict, Dict[str, np.ndarray]]
+
+class Journal:
+    """
+    Durable sim state under state_dir:
+
+      journal-<first seq>.jsonl   append-only records, one JSON object per line
+                                  ({"seq", "time", "kind", ...}); a new segment
+                                  starts after every snapshot and at every start
+      snapshot-<seq>.bin          fleet arrays as of record seq, in the packed-array
+                                  layout of encoding.py
+
+    A restore reads the latest snapshot and replays only the segments
+    written after it, so restart time depends on the snapshot cadence, not
+    on how long the class has been running.
+    """
+
+    def __init__(self, state_dir: str = SIM_STATE_DIR, fsync: bool = JOURNAL_FSYNC,
+                 every_records: int = SNAPSHOT_EVERY_RECORDS, interval_sec: float = SNAPSHOT_INTERVAL_SEC):
+        self.state_dir = state_dir
+        self.fsync = fsync
+        self.every_records = every_records
+        self.interval_sec = interval_sec
+        os.makedirs(state_dir, exist_ok=True)
+        # Sequence number of the last record written (or restored)
+        self.seq = 0
+        self.snapshot_seq = 0
+        self.records = 0
+        self.snapshots = 0
+        self.replayed = 0
+        self.restore_ms = 0.0
+        self.snapshot_ms = 0.0
+        self._file = None
+        self._last_snapshot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _files(self, kind: str) -> List[Tuple[int, str]]:
+        """(seq, path) of every journal segment or snapshot, oldest first."""
+        found = []
+        for name in os.listdir(self.state_dir):
+            match = _FILE_RE.match(name)
+            if match and match.group(1) == kind:
+                found.append((int(match.group(2)), os.path.join(self.state_dir, name)))
+        return sorted(found)
+
+    def _load_snapshot(self) -> Optional[Snapshot]:
+        for seq, path in reversed(self._files("snapshot")):
+            try:
+                with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as body:
+                    meta, views = unpack_arrays(body)
+                    arrays = {name: view.copy() for name, view in views.items()}
+                    # The mapping can only close once no array views it
+                    del views
+                return meta, arrays
+            except Exception as e:
+                logger.warning("Journal: skipping unreadable snapshot %s: %s", path, e)
+        return None
+
+    def _read_tail(self, after_seq: int) -> List[dict]:
+        """Records with seq > after_seq, from the segments that can hold them."""
+        segments = self._files("journal")
+        records = []
+        for i, (first_seq, path) in enumerate(segments):
+            next_first = segments[i + 1][0] if i + 1 < len(segments) else None
+            if next_first is not None and next_first - 1 <= after_seq:
+                continue
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash mid-append
+                        logger.warning("Journal: skipping damaged record in %s", path)
+                        continue
+                    if record["seq"] > after_seq:
+                        records.append(record)
+        return records
+
+    def restore(self) -> Tuple[Optional[Snapshot], List[dict]]:
+        """Latest snapshot (or None) and the records written after it, in order."""
+        start = time.perf_counter()
+        with self._lock:
+            snapshot = self._load_snapshot()
+            self.snapshot_seq = snapshot[0]["seq"] if snapshot is not None else 0
+            records = self._read_tail(self.snapshot_seq)
+            self.seq = records[-1]["seq"] if records else self.snapshot_seq
+            self.replayed = len(records)
+        self.restore_ms = (time.perf_counter() - start) * 1000.0
+        return snapshot, records
+
+    def _open_segment(self):
+        path = os.path.join(self.state_dir, f"journal-{self.seq + 1:012d}.jsonl")
+        self._file = open(path, "ab")
+        # Never append onto a partial line left by a crash
+        if self._file.tell() > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write(b"\n")
+
+    def append(self, kind: str, **fields) -> dict:
+        """Write one record (durably, with JOURNAL_FSYNC) and return it."""
+        with self._lock:
+            if self._file is None:
+                self._open_segment()
+            record = {"seq": self.seq + 1, "time": time.time(), "kind": kind, **fields}
+            self._file.write(dumps(record) + b"\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.seq += 1
+            self.records += 1
+            return record
+
+    def snapshot_due(self) -> bool:
+        pending = self.seq - self.snapshot_seq
+        return pending >= self.every_records or (
+            pending > 0 and time.monotonic() - self._last_snapshot >= self.interval_sec)
+
+    def write_snapshot(self, arrays: Dict[str, np.ndarray], meta: dict):
+        """Snapshot the arrays as of the last record and start a new journal segment."""
+        start = time.perf_counter()
+        with self._lock:
+            seq = self.seq
+            path = os.path.join(self.state_dir, f"snapshot-{seq:012d}.bin")
+            tmp_path = f"{path}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(pack_arrays(arrays, dict(meta, seq=seq, time=time.time())))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.error("Journal: could not write %s: %s", path, e)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.snapshot_seq = seq
+            self.snapshots += 1
+            self._last_snapshot = time.monotonic()
+            for _, old in self._files("snapshot")[:-SNAPSHOTS_KEPT]:
+                os.remove(old)
+        self.snapshot_ms = (time.perf_counter() - start) * 1000.0
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "seq": self.seq,
+            "snapshot_seq": self.snapshot_seq,
+            "records": self.records,
+            "snapshots": self.snapshots,
+            "replayed": self.replayed,
+            "restore_ms": self.restore_ms,
+            "snapshot_ms": self.snapshot_ms,
+        }
@@ -0,0 +1,156 @@
+import numpy as np
+from typing import Tuple
+
+# Newton iteration limits for the universal anomaly
+KEPLER_MAX_ITER = 100
+KEPLER_TOL = 1e-10
+
+def stumpff(z: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Stumpff functions C(z), S(z), vectorized, with series near z = 0."""
+    C = np.empty_like(z)
+    S = np.empty_like(z)
+
+    pos = z > 1e-6
+    neg = z < -1e-6
+    small = ~(pos | neg)
+
+    sz = np.sqrt(z[pos])
+    C[pos] = (1.0 - np.cos(sz)) / z[pos]
+    S[pos] = (sz - np.sin(sz)) / sz**3
+
+    sz = np.sqrt(-z[neg])
+    C[neg] = (np.cosh(sz) - 1.0) / -z[neg]
+    S[neg] = (np.sinh(sz) - sz) / sz**3
+
+    zs = z[small]
+    C[small] = 0.5 - zs / 24.0 + zs**2 / 720.0
+    S[small] = 1.0 / 6.0 - zs / 120.0 + zs**2 / 5040.0
+    return C, S
+
+def propagate_kepler(states: np.ndarray, dt: np.ndarray, mu: float) -> np.ndarray:
+    """
+    Two-body propagation of an (N,6) array of states [km, km/s] by dt seconds
+    (scalar or (N,)) using universal variables. All ships are solved together:
+    Newton iterations run on the whole batch and a convergence mask freezes the
+    rows that are done.
+    """
+    states = np.atleast_2d(np.asarray(states, dtype=np.float64))
+    n = len(states)
+    dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), (n,)).copy()
+    if n == 0:
+        return states.copy()
+
+    r0v = states[:, :3]
+    v0v = states[:, 3:6]
+    r0 = np.linalg.norm(r0v, axis=1)
+    v0 = np.linalg.norm(v0v, axis=1)
+    vr0 = np.sum(r0v * v0v, axis=1) / r0
+    alpha = 2.0 / r0 - v0**2 / mu  # 1/a; > 0 elliptic
+    sqrt_mu = np.sqrt(mu)
+
+    # Elliptic orbits: drop whole revolutions so chi stays small
+    ell = alpha > 1e-12
+    period = np.full(n, np.inf)
+    period[ell] = 2.0 * np.pi / np.sqrt(mu * alpha[ell]**3)
+    dt[ell] = np.fmod(dt[ell], period[ell])
+
+    k1 = r0 * vr0 / sqrt_mu
+    k2 = 1.0 - alpha * r0
+
+    def kepler_f(x, idx):
+        """Universal Kepler equation F(chi) and dF/dchi for rows idx."""
+        z = alpha[idx] * x**2
+        # cosh/sinh overflow far beyond a hyperbolic root: F is then inf or nan
+        with np.errstate(over="ignore", invalid="ignore"):
+            C, S = stumpff(z)
+            F = k1[idx] * x**2 * C + k2[idx] * x**3 * S + r0[idx] * x - sqrt_mu * dt[idx]
+            dF = k1[idx] * x * (1.0 - z * S) + k2[idx] * x**2 * C + r0[idx]
+        return F, dF
+
+    # Initial guess: Chobotov for elliptic orbits, the log form (Vallado) for
+    # hyperbolic ones, whose root grows only like log(dt)
+    chi = np.where(ell, sqrt_mu * alpha * dt, sqrt_mu * dt / r0)
+    hyp = np.flatnonzero(alpha < -1e-12)
+    if len(hyp):
+        a = 1.0 / alpha[hyp]
+        sign = np.sign(dt[hyp])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            arg = (-2.0 * mu * alpha[hyp] * dt[hyp]
+                   / (r0[hyp] * vr0[hyp] + sign * np.sqrt(-mu * a) * (1.0 - r0[hyp] * alpha[hyp])))
+            guess = sign * np.sqrt(-a) * np.log(arg)
+        usable = np.isfinite(guess) & (guess * sign > 0)
+        chi[hyp[usable]] = guess[usable]
+
+    # F(chi) is monotonic (dF/dchi = r > 0), so keep a bracket and bisect whenever
+    # Newton would leave it. After the fmod above an elliptic root lies within
+    # one revolution of the universal anomaly: |chi| < 2 pi sqrt(a).
+    lo = np.full(n, -np.inf)
+    hi = np.full(n, np.inf)
+    lo[ell] = -2.0 * np.pi / np.sqrt(alpha[ell])
+    hi[ell] = 2.0 * np.pi / np.sqrt(alpha[ell])
+
+    # Hyperbolic/parabolic: F(0) = -sqrt(mu) dt, so the root is on the side
+    # of dt. Double a trial point from the guess until F changes sign (or
+    # overflows, which only happens past the root).
+    sign = np.sign(dt)
+    lo[~ell & (sign > 0)] = 0.0
+    hi[~ell & (sign < 0)] = 0.0
+    chi[sign == 0] = 0.0
+    open_rows = np.flatnonzero(~ell & (sign != 0))
+    b = np.abs(chi[open_rows])
+    b = np.where(b > 0, b, sqrt_mu * np.abs(dt[open_rows]) / r0[open_rows])
+    for _ in range(KEPLER_MAX_ITER):
+        if len(open_rows) == 0:
+            break
+        s = sign[open_rows]
+        x = s * b
+        F, _ = kepler_f(x, open_rows)
+        past = ~np.isfinite(F) | (s * F > 0)
+        hi[open_rows] = np.where(past & (s > 0), x, hi[open_rows])
+        lo[open_rows] = np.where(past & (s < 0), x, lo[open_rows])
+        lo[open_rows] = np.where(~past & (s > 0), x, lo[open_rows])
+        hi[open_rows] = np.where(~past & (s < 0), x, hi[open_rows])
+        open_rows, b = open_rows[~past], 2.0 * b[~past]
+    if len(open_rows):
+        raise ValueError(f"Kepler propagation: could not bracket {len(open_rows)} hyperbolic solutions")
+    outside = ~((chi > lo) & (chi < hi))
+    chi[outside] = 0.5 * (lo[outside] + hi[outside])
+
+    active = sign != 0
+    for _ in range(KEPLER_MAX_ITER):
+        idx = np.flatnonzero(active)
+        x = chi[idx]
+        F, dF = kepler_f(x, idx)
+
+        # Non-finite F lies past the root on the side of x
+        bad = ~np.isfinite(F)
+        lo[idx] = np.where((F < 0.0) | (bad & (x < 0.0)), x, lo[idx])
+        hi[idx] = np.where((F > 0.0) | (bad & (x > 0.0)), x, hi[idx])
+        with np.errstate(invalid="ignore"):
+            new_x = x - F / dF
+        outside = ~((new_x > lo[idx]) & (new_x < hi[idx]))
+        bracketed = np.isfinite(lo[idx]) & np.isfinite(hi[idx])
+        new_x = np.where(outside & bracketed, 0.5 * (lo[idx] + hi[idx]), new_x)
+
+        chi[idx] = new_x
+        done = (np.abs(new_x - x) <= KEPLER_TOL * np.maximum(1.0, np.abs(x))) | (F == 0.0)
+        active[idx[done]] = False
+        if not active.any():
+            break
+
+    z = alpha * chi**2
+    C, S = stumpff(z)
+    f = 1.0 - chi**2 / r0 * C
+    g = dt - chi**3 / sqrt_mu * S
+    r_vec = f[:, None] * r0v + g[:, None] * v0v
+    r = np.linalg.norm(r_vec, axis=1)
+    fdot = sqrt_mu / (r * r0) * (alpha * chi**3 * S - chi)
+    gdot = 1.0 - chi**2 / r * C
+    v_vec = fdot[:, None] * r0v + gdot[:, None] * v0v
+
+    out = np.hstack((r_vec, v_vec))
+    # Never hand a NaN to the fleet arrays (or the journal)
+    bad = ~np.isfinite(out).all(axis=1)
+    if bad.any():
+        raise ValueError(f"Kepler propagation produced non-finite states for {int(bad.sum())} of {n} rows")
+    return out
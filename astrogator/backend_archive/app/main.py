@@ -1,24 +1,49 @@
-from fastapi import FastAPI, HTTPException, Body, Depends
+from fastapi import FastAPI, HTTPException, Body, Depends, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, Response
+import asyncio
+import logging
 import numpy as np
-import json
 import os
+import threading
+import time
 from contextlib import asynccontextmanager
+from spiceypy.utils.exceptions import SpiceyError
 
 from .engine import (
-    load_kernels, utc_to_et, et_to_utc, get_apparent_target_radec, vector_to_radec,
-    get_body_position, get_orbit_path, frame_transform
+    load_kernels, utc_to_et, et_to_utc, get_apparent_targets_radec, vectors_to_radec,
+    get_body_position, get_cache_stats, frame_transform_many
 )
-from .sim import get_sim, Spacecraft
-from .models import StateVector, Vector3, BurnCommand, StarData
-from .auth import get_current_user
+from .sim import get_sim, shutdown_sim, Spacecraft
+from .models import StateVector, Vector3, BurnCommand, StarData, StarIdRequest, StarIdBatchRequest
+from .auth import get_current_user, user_store
+from .stream import TelemetryHub
+from .clock import sim_clock
+from .workers import spice_pool
+from .stars import get_star_catalog, radec_to_unit_vectors, star_field_cache
+from .payload import StaticPayload
+from .encoding import array_response
+from .forecast import FORECAST_MAX_SPAN_DAYS, FORECAST_MAX_SAMPLES, FORECAST_MIN_STEP_SEC
+from .starid import get_star_identifier, STARID_TOLERANCE_ARCSEC
+from .metrics import metrics, http_request_duration, http_requests, monitor_event_loop, stats_samples
+from .profiler import PROFILING_ENABLED, PROFILE_HEADER, SamplingProfiler, profile_store
+
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Load SPICE kernels on startup
     load_kernels()
+    # Restore (or create) the fleet before the first request
+    get_sim()
+    spice_pool.start()
+    lag_monitor = asyncio.create_task(monitor_event_loop())
     yield
     # Clean up if needed
+    lag_monitor.cancel()
+    await telemetry_hub.stop()
+    spice_pool.shutdown()
+    shutdown_sim()
 
 app = FastAPI(title="Astrogator API", version="0.2.5", lifespan=lifespan)
 
@@ -35,6 +60,43 @@ prod_origin = os.getenv("ALLOWED_ORIGIN")
 if prod_origin:
     origins.append(prod_origin)
 
+@app.middleware("http")
+async def et_snapshot(request: Request, call_next):
+    """Every handler in one request sees the same sim ET."""
+    with sim_clock.snapshot():
+        return await call_next(request)
+
+def _is_admin_request(request: Request) -> bool:
+    """Whether the request carries the admin's bearer token (checked before routing)."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and user_store.lookup(token.strip()) == "admin"
+
+@app.middleware("http")
+async def instrument(request: Request, call_next):
+    """Latency per route; with PROFILING_ENABLED, sample admin requests that send an X-Profile header."""
+    profiler = None
+    # Profiling costs the whole loop a sampling thread: not something any student may switch on
+    if PROFILING_ENABLED and request.headers.get(PROFILE_HEADER) and _is_admin_request(request):
+        profiler = SamplingProfiler(threading.get_ident())
+        profiler.start()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        # Route template, not the raw path, so sc_ids don't explode the label set
+        route = getattr(request.scope.get("route"), "path", "<unmatched>")
+        http_request_duration.observe(elapsed, request.method, route)
+        http_requests.inc(request.method, route, str(status))
+        if profiler is not None:
+            profiler.stop()
+            profile_id = profile_store.add(request.method, request.url.path, profiler)
+    if profiler is not None:
+        response.headers["X-Profile-Id"] = profile_id
+    return response
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -43,27 +105,88 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load Stars
-STARS_FILE = os.path.join(os.path.dirname(__file__), "data", "stars.json")
-try:
-    with open(STARS_FILE, "r") as f:
-        STARS_DB = json.load(f)
-except Exception as e:
-    print(f"Warning: Could not load stars.json: {e}")
-    STARS_DB = []
+# Load Stars (memory-mapped, indexed by unit vector for field-of-view queries)
+star_catalog = get_star_catalog()
+# The full catalog never changes: serialize and compress it once
+stars_payload = StaticPayload(star_catalog.to_json())
 
 @app.get("/")
 async def root():
     return {"message": "Astrogator GNC Online"}
 
 @app.get("/api/nav/stars")
-async def get_stars():
-    """Return the static star catalog."""
-    return STARS_DB
+async def get_stars(request: Request):
+    """Return the static star catalog (precompressed, ETag-validated)."""
+    return stars_payload.response(request)
 
-@app.get("/api/nav/orrery/live")
-async def get_orrery_live():
-    """Return current positions of solar system bodies."""
+@app.get("/api/nav/stars/fov")
+async def get_stars_fov(
+    radius: float = Query(..., gt=0, le=180, description="FOV radius (deg)"),
+    ra: float = Query(None, description="Boresight RA (deg)"),
+    dec: float = Query(None, ge=-90, le=90, description="Boresight Dec (deg)"),
+    x: float = None, y: float = None, z: float = None,
+    mag_limit: float = Query(None, description="Faintest magnitude returned"),
+    limit: int = Query(None, gt=0, description="Max stars, brightest first"),
+):
+    """Stars inside a circular field of view around a boresight (RA/Dec or J2000 vector)."""
+    if x is not None and y is not None and z is not None:
+        boresight = np.array([x, y, z])
+        if not np.any(boresight):
+            raise HTTPException(status_code=400, detail="Boresight vector must be non-zero")
+    elif ra is not None and dec is not None:
+        boresight = radec_to_unit_vectors(ra, dec)
+    else:
+        raise HTTPException(status_code=400, detail="Give a boresight as ra/dec or x/y/z")
+    return star_catalog.query(boresight, radius, mag_limit, limit)
+
+ORRERY_BODIES = ["MERCURY", "VENUS", "EARTH", "MARS", "JUPITER", "SATURN"]
+NAV_BODIES = ["SUN", "EARTH", "MARS", "JUPITER", "VENUS", "MERCURY", "SATURN"]
+
+@app.get("/api/nav/stars/apparent/{sc_id}")
+async def get_apparent_stars(sc_id: str, user_id: str = Depends(get_current_user)):
+    """
+    Star field as seen from the spacecraft: catalog positions corrected for
+    proper motion, parallax and the ship's aberration ("corrections" lists
+    those the catalog file supports). ra/dec arrays follow the /api/nav/stars order.
+    """
+    if user_id != "admin" and user_id != sc_id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this spacecraft")
+    sc = await get_sim().get_spacecraft_async(sc_id)
+    if not sc:
+        raise HTTPException(status_code=404, detail="Spacecraft not found")
+    field = star_field_cache.get(star_catalog, sc.state[3:6], sc.state[:3], sc.et)
+    return Response(field["json"], media_type="application/json")
+
+def _vectors_array(vectors) -> np.ndarray:
+    """Observed star vectors as an (n, 3) array; 400 for a zero or non-finite vector."""
+    array = np.array([[v.x, v.y, v.z] for v in vectors], dtype=np.float64).reshape(-1, 3)
+    if not np.all(np.isfinite(array)) or not np.all(np.any(array, axis=1)):
+        raise HTTPException(status_code=400, detail="Star vectors must be finite and non-zero")
+    return array
+
+@app.post("/api/nav/starid")
+async def identify_stars(request: StarIdRequest, user_id: str = Depends(get_current_user)):
+    """Lost-in-space star ID: match observed body-frame star vectors, return attitude and matched stars."""
+    if len(request.vectors) < 3:
+        raise HTTPException(status_code=400, detail="At least 3 star vectors are required")
+    tolerance = request.tolerance_arcsec or STARID_TOLERANCE_ARCSEC
+    result = get_star_identifier().identify(_vectors_array(request.vectors), tolerance)
+    if result is None:
+        raise HTTPException(status_code=422, detail="No star pattern match")
+    return result
+
+@app.post("/api/admin/starid/batch")
+async def identify_stars_batch(request: StarIdBatchRequest, user_id: str = Depends(get_current_user)):
+    """Identify many star fields in one call (grading). Unmatched fields return null (Admin Only)."""
+    if user_id != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    tolerance = request.tolerance_arcsec or STARID_TOLERANCE_ARCSEC
+    observations = [_vectors_array(v) for v in request.observations]
+    # Thousands of fields take seconds: keep the event loop (and the SSE stream) free
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: get_star_identifier().identify_many(observations, tolerance))
+
+def _orrery_et() -> float:
     # Use current sim time (or real time if sim not persistent)
     # Ideally should use sim time.
     # Use current sim time from any active spacecraft
@@ -79,38 +202,37 @@ async def get_orrery_live():
     if et is None:
         # Fallback if no spacecraft loaded
         et = utc_to_et("2026-01-01T00:00:00")
-    
-    bodies = ["MERCURY", "VENUS", "EARTH", "MARS", "JUPITER", "SATURN"]
-    data = {}
-    for b in bodies:
-        data[b] = get_body_position(b, et)
-        
+    return et
+
+def _orrery_live_payload(et: float = None, data: dict = None):
+    """Orrery frame; pass et and the body positions when they were computed elsewhere (worker pool)."""
+    if et is None:
+        et = _orrery_et()
+    if data is None:
+        data = {b: get_body_position(b, et) for b in ORRERY_BODIES}
+
     return {
         "et": et,
         "utc": et_to_utc(et),
         "bodies": data
     }
 
+@app.get("/api/nav/orrery/live")
+async def get_orrery_live(request: Request):
+    """Return current positions of solar system bodies (JSON, or packed arrays by Accept)."""
+    et = _orrery_et()
+    data = await spice_pool.call("body_positions", ORRERY_BODIES, et)
+    payload = _orrery_live_payload(et, data)
+    return array_response(request, data, {"et": et, "utc": payload["utc"]}, payload)
+
 @app.get("/api/nav/orrery/static")
-async def get_orrery_static():
-    """Return orbital paths for solar system bodies (Initial Load)."""
+async def get_orrery_static(request: Request):
+    """Return orbital paths for solar system bodies (Initial Load), as JSON or packed arrays by Accept."""
     # Use roughly current time to generate the ellipse
-    # Use roughly current time to generate the ellipse
-    sim = get_sim()
-    et = None
-    if sim.spacecrafts:
-        first_sc = next(iter(sim.spacecrafts.values()))
-        et = first_sc.et
-    else:
-        et = utc_to_et("2026-01-01T00:00:00")
-    
-    bodies = ["MERCURY", "VENUS", "EARTH", "MARS", "JUPITER", "SATURN"]
-    paths = {}
-    for b in bodies:
-        # Generate 120 points for smoothness
-        paths[b] = get_orbit_path(b, et, num_points=120)
-        
-    return paths
+    et = _orrery_et()
+    # Generate 120 points for smoothness (one batched ephemeris call per body)
+    paths = await spice_pool.call("orbit_paths", ORRERY_BODIES, et, 120)
+    return array_response(request, paths, {"et": et}, paths)
 
 @app.get("/api/nav/state/{sc_id}")
 async def get_nav_state(sc_id: str, user_id: str = Depends(get_current_user)):
@@ -120,58 +242,71 @@ async def get_nav_state(sc_id: str, user_id: str = Depends(get_current_user)):
     but for the UI instrument panel, we might want to return them 'hidden' or 
     just return the observables.
     """
-    if user_id == "admin":
+    if user_id != "admin" and user_id != sc_id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this spacecraft")
+
+    view = "admin" if user_id == "admin" else sc_id
+    payload = await _nav_tick(view)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Spacecraft not found")
+    return payload
+
+def _nav_observer_id(view: str) -> str:
+    if view == "admin":
         # Admin View: Use 'arcadia' as the "Observer" platform
-        sc = get_sim().get_spacecraft("arcadia")
         # And we will inject other spacecraft as visible bodies below
-    else:
-        if user_id != sc_id:
-            raise HTTPException(status_code=403, detail="Not authorized to view this spacecraft")
-        sc = get_sim().get_spacecraft(sc_id)
+        return "arcadia"
+    return view
+
+def _nav_observer(view: str) -> Spacecraft:
+    return get_sim().get_spacecraft(_nav_observer_id(view))
 
+def _nav_state_payload(view: str, bodies_radec: tuple = None, sc: Spacecraft = None):
+    """
+    Observables for one nav view: an sc_id, or "admin" for the admin view
+    (which also sees the rest of the fleet). None if the spacecraft is unknown.
+    bodies_radec is the NAV_BODIES apparent (dist, ra, dec) and sc the
+    view's observer, if already computed.
+    """
+    if sc is None:
+        sc = _nav_observer(view)
     if not sc:
-        raise HTTPException(status_code=404, detail="Spacecraft not found")
+        return None
     
     # Construct observable data
     et = sc.et
     utc = et_to_utc(et)
     
     # Calculate visible bodies (Planets + Sun)
-    # We treat the spacecraft position as relative to SUN for these calcs
-    bodies = ["SUN", "EARTH", "MARS", "JUPITER", "VENUS", "MERCURY", "SATURN"]
-    visible_bodies = []
-    
-    for body in bodies:
-        r, ra, dec = get_apparent_target_radec(body, sc.state[:3], et)
-        visible_bodies.append({
-            "name": body,
-            "ra": ra,
-            "dec": dec,
-            "mag": -1.0 # Placeholder
-        })
-        
-    if user_id == "admin":
+    # We treat the spacecraft state as relative to SUN for these calcs
+    names = list(NAV_BODIES)
+    mags = [-1.0] * len(NAV_BODIES) # Placeholder
+    if bodies_radec is None:
+        bodies_radec = get_apparent_targets_radec(NAV_BODIES, sc.state[:6], et)
+    _, ra, dec = bodies_radec
+
+    if view == "admin":
         sim = get_sim()
-        for other_id, other_sc in sim.spacecrafts.items():
-            if other_id == sc.id: continue # Don't see self (arcadia)
-            
-            # Calculate RA/DEC of other_sc relative to sc (arcadia)
-            # Both are J2000 state. 
-            # Vector from sc to other:
-            rel_pos = other_sc.state[:3] - sc.state[:3]
-            r, ra, dec = vector_to_radec(rel_pos)
-            
-            visible_bodies.append({
-                "name": f"SC: {other_id}",
-                "ra": ra,
-                "dec": dec,
-                "mag": 2.0 # Make them visible
-            })
+        # Bring the whole fleet to the observer's epoch in one batch
+        sim.propagate_all(et)
+        # Calculate RA/DEC of every other spacecraft relative to sc (arcadia)
+        # in one shot over the fleet arrays. Both are J2000 state.
+        others = np.arange(sim.n) != sim.index[sc.id] # Don't see self (arcadia)
+        rel_pos = sim.states[:sim.n][others, :3] - sc.state[:3]
+        _, sc_ra, sc_dec = vectors_to_radec(rel_pos)
+        ra = np.concatenate((ra, sc_ra))
+        dec = np.concatenate((dec, sc_dec))
+        names += [f"SC: {other_id}" for other_id, keep in zip(sim.ids, others) if keep]
+        mags += [2.0] * len(rel_pos) # Make them visible
+
+    visible_bodies = [
+        {"name": name, "ra": b_ra, "dec": b_dec, "mag": mag}
+        for name, b_ra, b_dec, mag in zip(names, ra.tolist(), dec.tolist(), mags)
+    ]
         
-    # Calculate stars (treated as infinite distance, so RA/DEC is constant J2000 catalog value?)
-    # Proper motion is negligible for this. Parallax negligible.
-    # So we just return the catalog stars. Their apparent RA/DEC is their catalog RA/DEC.
-    # We assume 'J2000' frame for the instrument panel.
+    # Stars: catalog J2000 positions come from /api/nav/stars; the ship's
+    # apparent field (aberration ~20", parallax, proper motion) from
+    # /api/nav/stars/apparent/{sc_id}.
     
     return {
         "time": {
@@ -185,32 +320,149 @@ async def get_nav_state(sc_id: str, user_id: str = Depends(get_current_user)):
         "fuel": sc.fuel
     }
 
+async def _orrery_tick() -> dict:
+    """Orrery frame with the ephemeris work on the SPICE worker pool."""
+    et = _orrery_et()
+    return _orrery_live_payload(et, await spice_pool.call("body_positions", ORRERY_BODIES, et))
+
+async def _nav_tick(view: str):
+    """_nav_state_payload with the ephemeris (and n-body) work on the SPICE worker pool."""
+    sim = get_sim()
+    sc = await sim.get_spacecraft_async(_nav_observer_id(view))
+    if not sc:
+        return None
+    et = sc.et
+    radec = await spice_pool.call("apparent_radec", NAV_BODIES, sc.state[:6], et)
+    if view == "admin":
+        # Last await: _nav_state_payload finds the fleet (and observer) already at et
+        await sim.propagate_all_async(et)
+    return _nav_state_payload(view, radec, sc)
+
+# Server-push telemetry: one tick task shared by every stream subscriber
+telemetry_hub = TelemetryHub(_orrery_tick, _nav_tick, tick_context=sim_clock.snapshot)
+
+@app.get("/api/nav/stream/{sc_id}")
+async def stream_nav(sc_id: str, user_id: str = Depends(get_current_user)):
+    """
+    Server-Sent Events stream replacing polling of /api/nav/orrery/live and
+    /api/nav/state/{sc_id}. Emits an "orrery" and a "nav" event every tick.
+    """
+    if user_id != "admin" and user_id != sc_id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this spacecraft")
+    if user_id != "admin" and sc_id not in get_sim().index:
+        raise HTTPException(status_code=404, detail="Spacecraft not found")
+
+    sub = telemetry_hub.subscribe(user_id, sc_id)
+    return StreamingResponse(
+        telemetry_hub.events(sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.post("/api/cmd/burn/{sc_id}")
 async def execute_burn(sc_id: str, command: BurnCommand, user_id: str = Depends(get_current_user)):
+    """
+    Apply a delta-v (km/s, J2000). A utc_time in the future queues the burn
+    for that epoch; blank or past times execute it now.
+    """
     if user_id != sc_id:
         raise HTTPException(status_code=403, detail="Not authorized to control this spacecraft")
         
-    sc = get_sim().get_spacecraft(sc_id)
+    sim = get_sim()
+    sc = await sim.get_spacecraft_async(sc_id)
     if not sc:
         raise HTTPException(status_code=404, detail="Spacecraft not found")
-    
-    # In a real sim, we'd propagate to command.utc_time first.
-    # For now, apply immediately or propagate sim to that time?
-    # Let's assume immediate applied at current sim time for MVP simplification
-    # unless command.utc_time is in future.
-    
+
     dv = np.array([command.delta_v.x, command.delta_v.y, command.delta_v.z])
+    burn_et = None
+    if command.utc_time.strip():
+        try:
+            burn_et = utc_to_et(command.utc_time)
+        except (ValueError, SpiceyError) as e:
+            # SPICE errors are multi-line toolkit dumps: keep them in the server log
+            logger.warning("Rejected burn time %r for %s: %s", command.utc_time, sc_id, e)
+            raise HTTPException(status_code=400, detail="Invalid utc_time: use an ISO UTC time such as "
+                                                        "2026-01-01T12:00:00, or leave it blank to burn now")
+
+    if burn_et is not None and burn_et > sim.current_et():
+        burn = sim.schedule_burn(sc_id, burn_et, dv)
+        return {"status": "Burn scheduled", "burn": _burn_payload(burn)}
+
     sc.apply_burn(dv)
     
     return {"status": "Burn executed", "remaining_fuel": sc.fuel}
 
+def _burn_payload(burn: dict) -> dict:
+    return dict(burn, utc=et_to_utc(burn["et"]))
+
+def _check_burn_access(sc_id: str, user_id: str):
+    if user_id != "admin" and user_id != sc_id:
+        raise HTTPException(status_code=403, detail="Not authorized to control this spacecraft")
+    if sc_id not in get_sim().index:
+        raise HTTPException(status_code=404, detail="Spacecraft not found")
+
+@app.get("/api/cmd/burns/{sc_id}")
+async def list_burns(sc_id: str, user_id: str = Depends(get_current_user)):
+    """Pending scheduled burns of a spacecraft, earliest first."""
+    _check_burn_access(sc_id, user_id)
+    sim = get_sim()
+    # Burns due by now have executed, even if nothing has propagated the ship yet
+    await sim.get_spacecraft_async(sc_id)
+    return [_burn_payload(burn) for burn in sim.maneuvers.for_ship(sc_id)]
+
+@app.delete("/api/cmd/burns/{sc_id}/{burn_id}")
+async def cancel_burn(sc_id: str, burn_id: int, user_id: str = Depends(get_current_user)):
+    """Cancel a pending scheduled burn."""
+    _check_burn_access(sc_id, user_id)
+    sim = get_sim()
+    await sim.get_spacecraft_async(sc_id)
+    burn = sim.cancel_burn(sc_id, burn_id)
+    if burn is None:
+        raise HTTPException(status_code=404, detail="No pending burn with that id (already executed or cancelled?)")
+    return {"status": "Burn cancelled", "burn": _burn_payload(burn)}
+
+@app.get("/api/nav/forecast/{sc_id}")
+async def get_forecast(
+    request: Request,
+    sc_id: str,
+    span_hours: float = Query(24.0, gt=0, le=FORECAST_MAX_SPAN_DAYS * 24, description="Forecast span from now (hours)"),
+    step_sec: float = Query(600.0, ge=FORECAST_MIN_STEP_SEC, description="Sample spacing (s)"),
+    frame: str = Query("J2000", pattern="^(J2000|ECLIPJ2000)$"),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Sampled future trajectory (heliocentric states, km and km/s) including
+    scheduled burns, as JSON or packed arrays by Accept. Cached per ship
+    until its state or burn plan changes.
+    """
+    if user_id != "admin" and user_id != sc_id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this spacecraft")
+    span = span_hours * 3600.0
+    if span / step_sec > FORECAST_MAX_SAMPLES:
+        raise HTTPException(status_code=400, detail=f"At most {FORECAST_MAX_SAMPLES} samples per forecast")
+
+    sim = get_sim()
+    await sim.get_spacecraft_async(sc_id)
+    try:
+        job = sim.forecast_job(sc_id, span, step_sec)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Spacecraft not found")
+    # Sampling (integration, n-body on the worker pool) runs off the event loop
+    ets, states = await asyncio.get_running_loop().run_in_executor(None, job)
+    if frame != "J2000" and len(ets):
+        # Inertial frames: one rotation for every sample
+        states = frame_transform_many(states, "J2000", frame, float(ets[0]))
+
+    meta = {"sc_id": sc_id, "frame": frame, "step_sec": step_sec}
+    return array_response(request, {"ets": ets, "states": states}, meta, dict(meta, ets=ets, states=states))
+
 @app.get("/api/admin/truth/{sc_id}")
 async def get_truth_state(sc_id: str, user_id: str = Depends(get_current_user)):
     """Debug endpoint to see actual state."""
     if user_id != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    sc = get_sim().get_spacecraft(sc_id)
+    sc = await get_sim().get_spacecraft_async(sc_id)
     if not sc:
         raise HTTPException(status_code=404, detail="Spacecraft not found")
         
@@ -222,18 +474,74 @@ async def get_truth_state(sc_id: str, user_id: str = Depends(get_current_user)):
     }
 
 @app.get("/api/admin/fleet")
-async def get_fleet_state(user_id: str = Depends(get_current_user)):
-    """Return all spacecraft states for Orrery (Admin Only)."""
+async def get_fleet_state(request: Request, user_id: str = Depends(get_current_user)):
+    """Return all spacecraft positions for Orrery, as JSON or packed arrays by Accept (Admin Only)."""
     if user_id != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
         
+    # Transform J2000 state to ECLIPJ2000 for Orrery visualization
+    # Orrery planets are in Ecliptic frame.
     sim = get_sim()
-    fleet = {}
-    for sc_id, sc in sim.spacecrafts.items():
-        # Transform J2000 state to ECLIPJ2000 for Orrery visualization
-        # Orrery planets are in Ecliptic frame.
-        pos_j2000 = sc.state[:3]
-        state_eclip = frame_transform(sc.state, "J2000", "ECLIPJ2000", sc.et)
-        fleet[sc_id] = list(state_eclip[:3])
-        
-    return fleet
+    et = sim.current_et()
+    await sim.propagate_all_async(et)
+    ids, states_eclip = sim.fleet_states("ECLIPJ2000")
+    positions = np.ascontiguousarray(states_eclip[:, :3])
+    return array_response(request, {"positions": positions}, {"et": et, "ids": ids}, dict(zip(ids, positions)))
+
+@app.get("/api/admin/propagator")
+async def get_propagator_stats(user_id: str = Depends(get_current_user)):
+    """Propagation mode and integrator statistics, for sizing the server (Admin Only)."""
+    if user_id != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return get_sim().propagation_stats()
+
+def _collect_metrics():
+    """Stats the server already keeps, read at scrape time."""
+    samples = []
+    cache_counters = ("hits", "misses", "evictions")
+    for name, stats in get_cache_stats().items():
+        samples += stats_samples("astrogator_cache", "Epoch cache", stats, {"cache": name}, cache_counters)
+    samples += stats_samples("astrogator_cache", "Epoch cache", star_field_cache.stats(), {"cache": "star_fields"},
+                             cache_counters)
+    samples += stats_samples("astrogator_spice_pool", "SPICE worker pool", spice_pool.stats(),
+                             counters=("batches", "calls", "inline_calls", "restarts"))
+    samples += stats_samples("astrogator_auth", "Token store", user_store.stats(),
+                             counters=("lookups", "failures", "reloads"))
+    sim = get_sim()
+    samples.append(("astrogator_fleet_size", "gauge", "Spacecraft in the simulation", {}, float(sim.n)))
+    samples += stats_samples("astrogator_forecast", "Trajectory forecast cache", sim.forecasts.stats(),
+                             counters=("hits", "misses", "extensions", "invalidations"))
+    samples += stats_samples("astrogator_burns", "Maneuver scheduler", sim.maneuvers.stats(),
+                             counters=("scheduled", "executed", "cancelled"))
+    if sim.journal is not None:
+        samples += stats_samples("astrogator_journal", "Sim journal", sim.journal.stats(),
+                                 counters=("records", "snapshots"))
+    samples += stats_samples("astrogator_telemetry", "Telemetry hub", telemetry_hub.stats(),
+                             counters=("ticks", "dropped"))
+    return samples
+
+metrics.register_collector(_collect_metrics)
+
+@app.get("/metrics")
+async def get_metrics(user_id: str = Depends(get_current_user)):
+    """Prometheus text metrics: request latency, SPICE calls, caches, fleet, event-loop lag (Admin Only)."""
+    if user_id != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/api/admin/profiles")
+async def list_profiles(user_id: str = Depends(get_current_user)):
+    """Recent request profiles (requests sent with X-Profile while PROFILING_ENABLED=1) (Admin Only)."""
+    if user_id != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return profile_store.list()
+
+@app.get("/api/admin/profiles/{profile_id}")
+async def get_profile(profile_id: str, user_id: str = Depends(get_current_user)):
+    """One request profile as folded stacks, for flamegraph.pl or speedscope (Admin Only)."""
+    if user_id != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(profile["folded"], media_type="text/plain; charset=utf-8")
@@ -0,0 +1,218 @@
+import asyncio
+import functools
+import math
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Request latency buckets (seconds)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Event-loop lag buckets (seconds)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+# How often the event loop is probed for lag
+EVENT_LOOP_LAG_INTERVAL_SEC = float(os.getenv("EVENT_LOOP_LAG_INTERVAL_SEC", "0.5"))
+
+# (name, type, help, labels, value) produced by a collector at scrape time
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+class Counter:
+    """Monotonic counter with optional labels (Prometheus text exposition)."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def set(self, *labelvalues: str, value: float):
+        with self._lock:
+            self._values[labelvalues] = float(value)
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def drain(self) -> Dict[Tuple[str, ...], float]:
+        """Current values, reset to zero (for shipping a worker's counts to the server)."""
+        with self._lock:
+            values, self._values = self._values, {}
+            return values
+
+    def lines(self) -> List[str]:
+        return [f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}"
+                for key, value in sorted(self.values().items())]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # labelvalues -> [bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str):
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        lines = []
+        for key, values in sorted(series.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(dict(labels, le=_format_value(bound)))} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {_format_value(values[-1])}")
+        return lines
+
+class MetricsRegistry:
+    """Process-wide metrics plus collectors that read existing stats() at scrape time."""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        out = []
+        for metric in self._metrics:
+            out.append(f"# HELP {metric.name} {metric.help}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(metric.lines())
+
+        # Collected samples, grouped by metric name
+        families: Dict[str, Tuple[str, str, List[str]]] = {}
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+                continue
+            for name, kind, help, labels, value in samples:
+                family = families.setdefault(name, (kind, help, []))
+                family[2].append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for name, (kind, help, lines) in families.items():
+            out.append(f"# HELP {name} {help}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(lines)
+        return "\n".join(out) + "\n"
+
+metrics = MetricsRegistry()
+
+http_request_duration = metrics.histogram(
+    "astrogator_http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+http_requests = metrics.counter(
+    "astrogator_http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+spice_calls = metrics.counter(
+    "astrogator_spice_calls_total", "SPICE toolkit calls by function (server and SPICE workers)", ("function",))
+event_loop_lag = metrics.histogram(
+    "astrogator_event_loop_lag_seconds", "Delay of a scheduled event-loop wakeup", (), LAG_BUCKETS)
+event_loop_lag_last = metrics.gauge(
+    "astrogator_event_loop_lag_last_seconds", "Most recent event-loop lag probe")
+
+class InstrumentedModule:
+    """
+    Stand-in for spiceypy (or cyice) that counts every function call in
+    spice_calls. Wrappers are created on first use and cached on the proxy;
+    constants, submodules and exception classes pass through untouched.
+    """
+
+    def __init__(self, module, counter: Counter = spice_calls):
+        self._module = module
+        self._counter = counter
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._module, name)
+        if not callable(attr) or isinstance(attr, type):
+            return attr
+        counter = self._counter
+
+        @functools.wraps(attr)
+        def counted(*args, **kwargs):
+            counter.inc(name)
+            return attr(*args, **kwargs)
+
+        setattr(self, name, counted)
+        return counted
+
+def instrument_spice(module):
+    """Counting proxy for a SPICE module (None stays None, for the optional cyice)."""
+    return InstrumentedModule(module) if module is not None else None
+
+async def monitor_event_loop(interval: float = EVENT_LOOP_LAG_INTERVAL_SEC):
+    """Sleep-and-measure probe: how late the loop wakes up is how long something blocked it."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        event_loop_lag.observe(lag)
+        event_loop_lag_last.set(value=lag)
+
+def stats_samples(prefix: str, help: str, stats: Dict[str, float], labels: Optional[Dict[str, str]] = None,
+                  counters: Tuple[str, ...] = ()) -> List[Sample]:
+    """One sample per numeric stats() entry: keys in counters become *_total counters, the rest gauges."""
+    samples = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if key in counters:
+            samples.append((f"{prefix}_{key}_total", "counter", f"{help}: {key}", labels or {}, float(value)))
+        else:
+            samples.append((f"{prefix}_{key}", "gauge", f"{help}: {key}", labels or {}, float(value)))
+    return samples
@@ -13,7 +13,7 @@ class StateVector(BaseModel):
 
 class BurnCommand(BaseModel):
     delta_v: Vector3
-    utc_time: str  # Time to execute burn
+    utc_time: str  # Time to execute burn (blank or past: now)
 
 class SpacecraftState(BaseModel):
     id: str
@@ -26,3 +26,11 @@ class StarData(BaseModel):
     ra: float
     dec: float
     mag: float
+
+class StarIdRequest(BaseModel):
+    vectors: List[Vector3]  # Observed star directions, body frame
+    tolerance_arcsec: Optional[float] = None
+
+class StarIdBatchRequest(BaseModel):
+    observations: List[List[Vector3]]
+    tolerance_arcsec: Optional[float] = None
@@ -0,0 +1,151 @@
+import os
+import time
+import numpy as np
+from scipy import integrate
+from typing import Dict
+
+from .engine import get_body_states
+
+# Third bodies perturbing the heliocentric motion, with GM (km^3/s^2, DE440)
+PERTURBERS = {
+    "EARTH": 398600.435507,
+    "MOON": 4902.800118,
+    "JUPITER": 126712764.1,  # Jupiter system (barycenter)
+}
+
+# Integrator settings
+NBODY_METHOD = os.getenv("NBODY_METHOD", "DOP853")
+NBODY_RTOL = float(os.getenv("NBODY_RTOL", "1e-10"))
+NBODY_ATOL = float(os.getenv("NBODY_ATOL", "1e-6"))
+# Spacing (s) of the perturber samples the integrator interpolates between
+NBODY_EPHEM_STEP_SEC = float(os.getenv("NBODY_EPHEM_STEP_SEC", "3600"))
+
+class PerturberCache:
+    """
+    Heliocentric J2000 positions of the perturbers over one integration span.
+    Sampled once per propagation (one batched ephemeris call per body) and
+    evaluated at every RK stage by cubic Hermite interpolation, so the
+    integrator never goes back to SPICE.
+    """
+
+    def __init__(self, t0: float, t1: float, step: float = NBODY_EPHEM_STEP_SEC):
+        lo, hi = min(t0, t1), max(t0, t1)
+        n = max(2, int(np.ceil((hi - lo) / step)) + 1)
+        self.ets = np.linspace(lo, hi, n)
+        self.h = (hi - lo) / (n - 1) if hi > lo else 1.0
+        self.names = list(PERTURBERS)
+        self.gm = np.array([PERTURBERS[name] for name in self.names])
+        # (n_bodies, n_samples, 6)
+        self.states = np.stack([get_body_states(name, self.ets, "J2000", "SUN") for name in self.names])
+
+    def positions(self, t: float) -> np.ndarray:
+        """(n_bodies, 3) positions at time t."""
+        i = int(np.clip((t - self.ets[0]) // self.h, 0, len(self.ets) - 2))
+        s = (t - self.ets[i]) / self.h
+        p0, v0 = self.states[:, i, :3], self.states[:, i, 3:] * self.h
+        p1, v1 = self.states[:, i + 1, :3], self.states[:, i + 1, 3:] * self.h
+        s2, s3 = s * s, s * s * s
+        return ((2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * v0
+                + (-2 * s3 + 3 * s2) * p1 + (s3 - s2) * v1)
+
+def nbody_accel(r: np.ndarray, bodies: np.ndarray, gm_bodies: np.ndarray, gm_sun: float) -> np.ndarray:
+    """
+    Heliocentric acceleration of N ships (N,3): Sun central term plus the direct
+    and indirect terms of each perturber.
+    """
+    r_norm = np.linalg.norm(r, axis=1, keepdims=True)
+    acc = -gm_sun * r / r_norm**3
+    for pos, gm in zip(bodies, gm_bodies):
+        d = pos - r
+        acc += gm * (d / np.linalg.norm(d, axis=1, keepdims=True)**3 - pos / np.linalg.norm(pos)**3)
+    return acc
+
+class NBodyPropagator:
+    """Batched Sun + Earth/Moon/Jupiter propagation with an adaptive Runge-Kutta integrator."""
+
+    def __init__(self, gm_sun: float):
+        self.gm_sun = gm_sun
+        self.stats = {
+            "method": NBODY_METHOD,
+            "calls": 0,
+            "ships_propagated": 0,
+            "steps": 0,
+            "rhs_evals": 0,
+            "wall_sec": 0.0,
+            "last_wall_ms": 0.0,
+        }
+        # (ships, steps, rhs evals, wall sec) of the last integration
+        self.last_run = None
+
+    def propagate(self, states: np.ndarray, t0: float, t1: float) -> np.ndarray:
+        """Propagate an (N,6) batch sharing epoch t0 to t1; the whole fleet is one ODE system."""
+        if t1 == t0 or len(states) == 0:
+            return states.copy()
+        return self._integrate(states, t0, t1)
+
+    def sample(self, states: np.ndarray, t0: float, ets: np.ndarray) -> np.ndarray:
+        """
+        (len(ets), N, 6) states at increasing epochs ets >= t0, from one
+        integration to ets[-1] read off the solver's dense output.
+        """
+        ets = np.asarray(ets, dtype=np.float64)
+        n = len(states)
+        out = np.empty((len(ets), n, 6))
+        i = int(np.searchsorted(ets, t0, side="right"))
+        out[:i] = states
+        if i == len(ets) or n == 0:
+            return out
+
+        def on_step(solver):
+            nonlocal i
+            j = int(np.searchsorted(ets, solver.t, side="right"))
+            if j > i:
+                out[i:j] = solver.dense_output()(ets[i:j]).T.reshape(j - i, n, 6)
+                i = j
+
+        self._integrate(states, t0, float(ets[-1]), on_step)
+        return out
+
+    def _integrate(self, states: np.ndarray, t0: float, t1: float, on_step=None) -> np.ndarray:
+        start = time.perf_counter()
+        n = len(states)
+        cache = PerturberCache(t0, t1)
+
+        def rhs(t, y):
+            y = y.reshape(n, 6)
+            dy = np.empty_like(y)
+            dy[:, :3] = y[:, 3:]
+            dy[:, 3:] = nbody_accel(y[:, :3], cache.positions(t), cache.gm, self.gm_sun)
+            return dy.ravel()
+
+        # Drive the solver step by step so accepted steps can be counted
+        solver = getattr(integrate, NBODY_METHOD)(rhs, t0, states.ravel(), t1,
+                                                  rtol=NBODY_RTOL, atol=NBODY_ATOL)
+        steps = 0
+        while solver.status == "running":
+            message = solver.step()
+            steps += 1
+            if on_step is not None and solver.status != "failed":
+                on_step(solver)
+        if solver.status != "finished":
+            raise RuntimeError(f"n-body integration failed: {message}")
+
+        self.last_run = (n, steps, int(solver.nfev), time.perf_counter() - start)
+        self.record(*self.last_run)
+        return solver.y.reshape(n, 6)
+
+    def record(self, ships: int, steps: int, rhs_evals: int, wall: float):
+        """Count one integration, including one run by another process's propagator (worker pool)."""
+        self.stats["calls"] += 1
+        self.stats["ships_propagated"] += ships
+        self.stats["steps"] += steps
+        self.stats["rhs_evals"] += rhs_evals
+        self.stats["wall_sec"] += wall
+        self.stats["last_wall_ms"] = wall * 1000.0
+
+    def get_stats(self) -> Dict[str, float]:
+        stats = dict(self.stats)
+        calls = max(1, stats["calls"])
+        stats["mean_wall_ms"] = stats["wall_sec"] * 1000.0 / calls
+        stats["mean_steps"] = stats["steps"] / calls
+        return stats
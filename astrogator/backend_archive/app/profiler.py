@@ -0,0 +1,104 @@
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Per-request profiling is off unless the server opts in; then admin requests
+# carrying the header are sampled and answered with an X-Profile-Id
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILE_HEADER = "x-profile"
+PROFILE_INTERVAL_SEC = float(os.getenv("PROFILE_INTERVAL_SEC", "0.001"))
+# Finished profiles kept for /api/admin/profiles
+PROFILE_HISTORY = int(os.getenv("PROFILE_HISTORY", "32"))
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack from a background thread every
+    interval and counts identical stacks. Output is the folded format
+    ("root;caller;callee count" per line) read by flamegraph.pl and speedscope.
+    On the event-loop thread this also sees other requests running concurrently.
+
+    Only that one thread is sampled: work handed to the SPICE worker
+    processes (workers.spice_pool) or to executor threads (forecast
+    sampling) appears as the loop waiting, not as the worker's own stacks.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = PROFILE_INTERVAL_SEC):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples = 0
+        self.duration_sec = 0.0
+        self._stacks: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start = 0.0
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration_sec = time.perf_counter() - self._start
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            key = ";".join(reversed(stack))
+            self._stacks[key] = self._stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self._stacks.items()))
+
+class ProfileStore:
+    """The most recent request profiles, by id."""
+
+    def __init__(self, maxsize: int = PROFILE_HISTORY):
+        self.maxsize = maxsize
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, method: str, path: str, profiler: SamplingProfiler) -> str:
+        profile_id = uuid.uuid4().hex[:16]
+        entry = {
+            "id": profile_id,
+            "method": method,
+            "path": path,
+            "samples": profiler.samples,
+            "duration_ms": profiler.duration_sec * 1000.0,
+            "interval_ms": profiler.interval * 1000.0,
+            "created": time.time(),
+            "folded": profiler.folded(),
+        }
+        with self._lock:
+            self._profiles[profile_id] = entry
+            while len(self._profiles) > self.maxsize:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return [{k: v for k, v in p.items() if k != "folded"} for p in reversed(self._profiles.values())]
+
+profile_store = ProfileStore()
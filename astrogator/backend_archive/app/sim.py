@@ -1,55 +1,194 @@
+import asyncio
+import heapq
+import itertools
+import logging
 import numpy as np
 import os
-from datetime import datetime, timezone
-from typing import Dict
-from .engine import get_body_state, load_kernels, utc_to_et
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from .engine import get_body_state, load_kernels, utc_to_et, frame_transform_many
+from .kepler import propagate_kepler
+from .clock import SimClock, sim_clock
+from .journal import Journal, SIM_PERSIST
+from .forecast import ForecastCache
+from .workers import spice_pool
 
-GM_SUN = 1.32712440018e11 
+GM_SUN = 1.32712440018e11
+
+logger = logging.getLogger(__name__) 
+
+# Default propagation mode: "kepler" (two-body, Sun only) or "nbody"
+# (Sun + Earth/Moon/Jupiter, adaptive Runge-Kutta; needs scipy)
+SIM_PROPAGATOR = os.getenv("SIM_PROPAGATOR", "kepler")
 
 class Spacecraft:
-    def __init__(self, sc_id: str, initial_state: np.ndarray, initial_et: float):
+    """
+    Thin view over one row of the Simulation's fleet arrays.
+    Reads and writes of state/et/fuel go straight to the shared arrays.
+    """
+    def __init__(self, sim: "Simulation", sc_id: str):
         self.id = sc_id
+        self._sim = sim
+
+    @property
+    def _idx(self) -> int:
+        return self._sim.index[self.id]
+
+    @property
+    def state(self) -> np.ndarray:
         # State: [x,y,z,vx,vy,vz] (km, km/s) Heliocentric J2000
-        self.state = initial_state 
-        self.et = initial_et
-        self.fuel = 1000.0 # m/s
+        # Row view: in-place edits update the fleet array
+        return self._sim.states[self._idx]
 
-    def propagate(self, target_et: float):
-        """Propagate state to target_et using 2-body approximation (Universal Variables or just Kepler)."""
-        dt = target_et - self.et
-        if dt == 0:
-            return
+    @state.setter
+    def state(self, value: np.ndarray):
+        self._sim.states[self._idx] = value
 
-        # Simple Drift for MVP (Simulate 'Station Keeping' relative to Sun/Earth frame if we wanted, 
-        # but here we just drift inertially).
-        # Improving this: Linear extrapolation for short steps?
-        # self.state[0:3] += self.state[3:6] * dt
-        
-        # NOTE: For "Lost in Space" assignment 1, simply updating 'et' is enough 
-        # to make Planets move relative to the fixed stars. 
-        # The ship's motion is small compared to planetary motion if we are just "floating".
-        self.et = target_et
+    @property
+    def et(self) -> float:
+        return float(self._sim.ets[self._idx])
+
+    @et.setter
+    def et(self, value: float):
+        self._sim.ets[self._idx] = value
+
+    @property
+    def fuel(self) -> float:
+        # m/s
+        return float(self._sim.fuel[self._idx])
+
+    @fuel.setter
+    def fuel(self, value: float):
+        self._sim.fuel[self._idx] = value
+
+    def propagate(self, target_et: float):
+        """Propagate state to target_et using 2-body approximation (Universal Variables)."""
+        self._sim.propagate_ships(np.array([self._idx]), target_et)
 
     def apply_burn(self, dv: np.ndarray):
         self.state[3:6] += dv
         self.fuel -= np.linalg.norm(dv) # km/s cost
+        self._sim.forecasts.invalidate(self.id)
+        self._sim.record("burn", id=self.id, et=self.et, dv=np.asarray(dv, dtype=np.float64),
+                         state=self.state, fuel=self.fuel)
         # Convert to m/s for display logic elsewhere if needed, 
         # but here we keep fuel budget in km/s or similar units? 
         # UI says "m/s", so let's adjust cost.
         # If input dv is km/s, and fuel is m/s.
         # self.fuel -= np.linalg.norm(dv) * 1000
 
-class Simulation:
+class ManeuverQueue:
+    """
+    Future burns for the whole fleet. A heap ordered by (epoch, id) finds
+    what is due in O(log n) per burn; pending burns are also indexed by id
+    and by spacecraft for listing and cancelling. Cancelled burns stay in
+    the heap until they reach the top (or the heap is compacted).
+    """
+
     def __init__(self):
+        self._heap: List[Tuple[float, int]] = []
+        # burn id -> {"id", "sc_id", "et", "dv"}
+        self.pending: Dict[int, dict] = {}
+        self.by_ship: Dict[str, Dict[int, dict]] = {}
+        self.next_id = 1
+        self.scheduled = 0
+        self.executed = 0
+        self.cancelled = 0
+
+    def add(self, sc_id: str, et: float, dv, burn_id: Optional[int] = None) -> dict:
+        if burn_id is None:
+            burn_id = self.next_id
+        self.next_id = max(self.next_id, burn_id + 1)
+        burn = {"id": burn_id, "sc_id": sc_id, "et": float(et), "dv": [float(v) for v in dv]}
+        self.pending[burn_id] = burn
+        self.by_ship.setdefault(sc_id, {})[burn_id] = burn
+        heapq.heappush(self._heap, (burn["et"], burn_id))
+        self.scheduled += 1
+        return burn
+
+    def remove(self, burn_id: int) -> Optional[dict]:
+        burn = self.pending.pop(burn_id, None)
+        if burn is None:
+            return None
+        ship = self.by_ship[burn["sc_id"]]
+        del ship[burn_id]
+        if not ship:
+            del self.by_ship[burn["sc_id"]]
+        # Keep dead entries from outnumbering live ones
+        if len(self._heap) > 2 * len(self.pending) + 64:
+            self._heap = [(b["et"], i) for i, b in self.pending.items()]
+            heapq.heapify(self._heap)
+        return burn
+
+    def cancel(self, burn_id: int) -> Optional[dict]:
+        burn = self.remove(burn_id)
+        if burn is not None:
+            self.cancelled += 1
+        return burn
+
+    def next_et(self) -> Optional[float]:
+        """Epoch of the earliest pending burn."""
+        heap = self._heap
+        while heap and heap[0][1] not in self.pending:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, et: float) -> List[dict]:
+        """Remove and return every pending burn at or before et, in execution order."""
+        due = []
+        while True:
+            next_et = self.next_et()
+            if next_et is None or next_et > et:
+                return due
+            due.append(self.remove(heapq.heappop(self._heap)[1]))
+            self.executed += 1
+
+    def for_ship(self, sc_id: str) -> List[dict]:
+        return sorted(self.by_ship.get(sc_id, {}).values(), key=lambda b: (b["et"], b["id"]))
+
+    def stats(self) -> Dict[str, float]:
+        return {"pending": len(self.pending), "scheduled": self.scheduled,
+                "executed": self.executed, "cancelled": self.cancelled}
+
+class Simulation:
+    def __init__(self, propagator: str = SIM_PROPAGATOR, clock: SimClock = None, journal: Optional[Journal] = None):
+        self.clock = clock or sim_clock
+        # Records burns and new ships; without one the fleet is rebuilt on every start
+        self.journal = journal
+        if propagator not in ("kepler", "nbody"):
+            raise ValueError(f"Unknown propagator '{propagator}'")
+        self.propagator = propagator
+        self._nbody = None
+        if propagator == "nbody":
+            # Optional dependency: only the n-body mode needs scipy
+            from .nbody import NBodyPropagator
+            self._nbody = NBodyPropagator(GM_SUN)
+        # Serializes the *_async propagation passes, which yield while the
+        # worker pool integrates
+        self._propagation_lock = asyncio.Lock()
+
+        # Fleet storage (structure of arrays). Rows [0, n) are live;
+        # capacity grows by doubling so adding ships is amortized O(1).
+        self.n = 0
+        self.states = np.zeros((0, 6))
+        self.ets = np.zeros(0)
+        self.fuel = np.zeros(0)
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        # id -> Spacecraft view
         self.spacecrafts: Dict[str, Spacecraft] = {}
-        
-        # Initialize at Current Real Time
-        # Using datetime.now(timezone.utc)
+        # Time-tagged burns, executed as propagation passes their epoch
+        self.maneuvers = ManeuverQueue()
+        # Sampled future trajectories, dropped when a ship's state or burn plan changes
+        self.forecasts = ForecastCache()
+
+        if self.journal is not None:
+            self._restore()
+            self.clock.on_change = self._clock_changed
+
+        # Initialize at Current Real Time (or the clock's fixed epoch)
         try:
-            now = datetime.now(timezone.utc)
-            # Format explicitly for SPICE: YYYY-MM-DDTHH:MM:SS
-            now_str = now.strftime("%Y-%m-%dT%H:%M:%S")
-            start_et = utc_to_et(now_str)
+            start_et = self.clock.now()
         except Exception as e:
             print(f"Time Init Error: {e}")
             start_et = 0.0
@@ -87,9 +226,9 @@ class Simulation:
             users = json.load(f)
 
         import random
-        # Create spacecraft for each user
+        # Create spacecraft for each user (restored ships keep their state)
         for sc_id in users.keys():
-            if sc_id == "admin":
+            if sc_id == "admin" or sc_id in self.index:
                 continue
                 
             # Add random perturbation (box of +/- 2000km)
@@ -121,11 +260,329 @@ class Simulation:
             # BUT if we store it as state, and then `main.py` treats it as J2000...
             # We should probably request J2000 from the start to avoid confusion.
             
-            self.spacecrafts[sc_id] = Spacecraft(
-                sc_id,
-                np.hstack((pos, vel)),
-                start_et
-            )
+            self.add_spacecraft(sc_id, np.hstack((pos, vel)), start_et)
+
+    def add_spacecraft(self, sc_id: str, initial_state: np.ndarray, initial_et: float, fuel: float = 1000.0) -> Spacecraft:
+        sc = self._add(sc_id, initial_state, initial_et, fuel)
+        self.record("create", id=sc_id, et=sc.et, state=sc.state, fuel=sc.fuel)
+        return sc
+
+    def _add(self, sc_id: str, initial_state: np.ndarray, initial_et: float, fuel: float) -> Spacecraft:
+        if sc_id in self.index:
+            raise ValueError(f"Spacecraft {sc_id} already exists")
+        if self.n == len(self.ets):
+            self._grow(max(8, 2 * len(self.ets)))
+        i = self.n
+        self.states[i] = initial_state
+        self.ets[i] = initial_et
+        self.fuel[i] = fuel
+        self.ids.append(sc_id)
+        self.index[sc_id] = i
+        self.n += 1
+        sc = Spacecraft(self, sc_id)
+        self.spacecrafts[sc_id] = sc
+        return sc
+
+    def _grow(self, capacity: int):
+        states = np.zeros((capacity, 6))
+        ets = np.zeros(capacity)
+        fuel = np.zeros(capacity)
+        states[:self.n] = self.states[:self.n]
+        ets[:self.n] = self.ets[:self.n]
+        fuel[:self.n] = self.fuel[:self.n]
+        self.states, self.ets, self.fuel = states, ets, fuel
+
+    def record(self, kind: str, **fields):
+        """Journal a state change (no-op without a journal); snapshots the fleet when one is due."""
+        self._append(kind, fields)
+        self._maybe_snapshot()
+
+    def _append(self, kind: str, fields: dict):
+        if self.journal is None:
+            return
+        try:
+            self.journal.append(kind, **fields)
+        except Exception as e:
+            print(f"Journal Error ({kind}): {e}")
+
+    def _maybe_snapshot(self):
+        if self.journal is not None and self.journal.snapshot_due():
+            self.snapshot()
+
+    def snapshot(self):
+        """Write the fleet arrays as of the last journal record."""
+        if self.journal is None:
+            return
+        self.journal.write_snapshot(
+            {"states": self.states[:self.n], "ets": self.ets[:self.n], "fuel": self.fuel[:self.n]},
+            {"ids": self.ids, "clock": self.clock.state(), "propagator": self.propagator,
+             "burns": list(self.maneuvers.pending.values()), "next_burn_id": self.maneuvers.next_id,
+             "burn_counts": {"scheduled": self.maneuvers.scheduled, "executed": self.maneuvers.executed,
+                             "cancelled": self.maneuvers.cancelled}},
+        )
+
+    def _clock_changed(self, clock: SimClock):
+        """Journal pause/resume/warp/epoch changes, so a restart resumes the same clock."""
+        self.record("clock", clock=clock.state())
+
+    def _restore(self):
+        """Rebuild the fleet from the latest snapshot plus the journal records after it."""
+        start = time.perf_counter()
+        snapshot, records = self.journal.restore()
+        latest_et = None
+        # Last journaled clock state, and the wall time it was recorded at
+        clock, clock_time = None, None
+        if snapshot is not None:
+            meta, arrays = snapshot
+            n = len(meta["ids"])
+            self._grow(max(8, n))
+            self.states[:n] = arrays["states"]
+            self.ets[:n] = arrays["ets"]
+            self.fuel[:n] = arrays["fuel"]
+            self.n = n
+            self.ids = list(meta["ids"])
+            self.index = {sc_id: i for i, sc_id in enumerate(self.ids)}
+            self.spacecrafts = {sc_id: Spacecraft(self, sc_id) for sc_id in self.ids}
+            clock, clock_time = meta.get("clock"), meta.get("time")
+            for burn in meta.get("burns", []):
+                self.maneuvers.add(burn["sc_id"], burn["et"], burn["dv"], burn["id"])
+            self.maneuvers.next_id = max(self.maneuvers.next_id, meta.get("next_burn_id", 1))
+            # Re-adding the pending burns above is not new scheduling
+            counts = meta.get("burn_counts", {})
+            self.maneuvers.scheduled = counts.get("scheduled", 0)
+            self.maneuvers.executed = counts.get("executed", 0)
+            self.maneuvers.cancelled = counts.get("cancelled", 0)
+
+        for record in records:
+            kind = record["kind"]
+            if kind == "clock":
+                clock, clock_time = record["clock"], record["time"]
+            elif kind == "schedule":
+                self.maneuvers.add(record["id"], record["burn_et"], record["dv"], record["burn_id"])
+            elif kind == "cancel":
+                self.maneuvers.cancel(record["burn_id"])
+            elif kind == "create" and record["id"] not in self.index:
+                self._add(record["id"], np.array(record["state"]), record["et"], record["fuel"])
+            elif kind in ("create", "burn"):
+                if "burn_id" in record and self.maneuvers.remove(record["burn_id"]) is not None:
+                    self.maneuvers.executed += 1
+                i = self.index[record["id"]]
+                self.states[i] = record["state"]
+                self.ets[i] = record["et"]
+                self.fuel[i] = record["fuel"]
+            if "et" in record:
+                latest_et = record["et"] if latest_et is None else max(latest_et, record["et"])
+
+        if clock is not None and clock_time is not None:
+            # Resume the journaled clock; a running one kept running while the server was down
+            et = clock["et"]
+            if not clock["paused"]:
+                et += max(0.0, time.time() - clock_time) * clock["warp"]
+            self.clock.restore(et, clock["paused"], clock["warp"])
+        elif latest_et is not None and latest_et > self.clock.now():
+            # A fixed-epoch or warped clock would restart in the past: resume where the class left off
+            self.clock.set_epoch(latest_et)
+        if snapshot is not None or records:
+            logger.info("Restored %d spacecraft (snapshot seq %d + %d journal records) in %.1f ms",
+                        self.n, self.journal.snapshot_seq, len(records), (time.perf_counter() - start) * 1000.0)
+        self.record("start", ships=self.n)
+
+    def fleet_states(self, frame: str = "J2000") -> Tuple[List[str], np.ndarray]:
+        """
+        (ids, (N,6) states) for the whole fleet in the requested frame.
+        One frame transformation per distinct epoch, applied to every ship at that epoch.
+        """
+        states = self.states[:self.n]
+        if frame == "J2000" or self.n == 0:
+            return list(self.ids), states.copy()
+
+        ets = self.ets[:self.n]
+        out = np.empty_like(states)
+        for et in np.unique(ets):
+            mask = ets == et
+            out[mask] = frame_transform_many(states[mask], "J2000", frame, float(et))
+        return list(self.ids), out
+
+    def schedule_burn(self, sc_id: str, et: float, dv: np.ndarray) -> dict:
+        """Queue a burn for sc_id at et; it executes when propagation reaches et."""
+        if sc_id not in self.index:
+            raise KeyError(f"Spacecraft {sc_id} not found")
+        burn = self.maneuvers.add(sc_id, et, dv)
+        self.forecasts.invalidate(sc_id)
+        self.record("schedule", id=sc_id, burn_id=burn["id"], burn_et=burn["et"], dv=burn["dv"])
+        return burn
+
+    def cancel_burn(self, sc_id: str, burn_id: int) -> Optional[dict]:
+        """Cancel a pending burn of sc_id; None if there is no such burn."""
+        if burn_id not in self.maneuvers.by_ship.get(sc_id, {}):
+            return None
+        burn = self.maneuvers.cancel(burn_id)
+        self.forecasts.invalidate(sc_id)
+        self.record("cancel", id=sc_id, burn_id=burn_id)
+        return burn
+
+    def _execute_burns(self, target_et: float):
+        """
+        Run every burn due at or before target_et: the ships burning at each
+        epoch are advanced to it together, then their delta-vs applied in one
+        step. Cost depends on the burns due, not on how many are queued.
+        """
+        for et, group, rows in self._due_burn_groups(target_et):
+            self._propagate_rows(np.unique(rows), et)
+            self._apply_burns(et, group, rows)
+        self._maybe_snapshot()
+
+    async def _execute_burns_async(self, target_et: float):
+        """_execute_burns with the n-body integration on the SPICE worker pool."""
+        for et, group, rows in self._due_burn_groups(target_et):
+            await self._propagate_rows_async(np.unique(rows), et)
+            self._apply_burns(et, group, rows)
+        self._maybe_snapshot()
+
+    def _due_burn_groups(self, target_et: float):
+        """(epoch, burns, fleet rows) for the burns due at or before target_et, earliest epoch first."""
+        due = self.maneuvers.pop_due(target_et)
+        for et, group in itertools.groupby(due, key=lambda b: b["et"]):
+            group = list(group)
+            yield et, group, np.array([self.index[b["sc_id"]] for b in group])
+
+    def _apply_burns(self, et: float, group: List[dict], rows: np.ndarray):
+        dvs = np.array([b["dv"] for b in group])
+        # add.at: a ship may have several burns at the same epoch
+        np.add.at(self.states, (rows[:, None], np.arange(3, 6)), dvs)
+        np.subtract.at(self.fuel, rows, np.linalg.norm(dvs, axis=1))
+        for burn, row in zip(group, rows):
+            self.forecasts.invalidate(burn["sc_id"])
+            self._append("burn", {"id": burn["sc_id"], "burn_id": burn["id"], "et": et, "dv": burn["dv"],
+                                  "state": self.states[row], "fuel": float(self.fuel[row])})
+
+    def forecast(self, sc_id: str, span: float, step: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (ets, J2000 states) of sc_id every step seconds over the next span
+        seconds, including its scheduled burns. Served from the forecast cache.
+        """
+        self.get_spacecraft(sc_id)
+        return self.forecast_job(sc_id, span, step)()
+
+    def forecast_job(self, sc_id: str, span: float, step: float) -> Callable[[], Tuple[np.ndarray, np.ndarray]]:
+        """
+        forecast() in two halves: the ship's state (as last propagated) and
+        burn plan are read here, the returned job samples from copies of them
+        and can run on an executor thread while the sim keeps serving requests.
+        """
+        sc = self.spacecrafts.get(sc_id)
+        if sc is None:
+            raise KeyError(f"Spacecraft {sc_id} not found")
+        state, et, now = sc.state.copy(), sc.et, self.current_et()
+        burns = [dict(burn) for burn in self.maneuvers.for_ship(sc_id)]
+        generation = self.forecasts.generation(sc_id)
+
+        def sample(start_state: np.ndarray, start_et: float, ets: np.ndarray) -> np.ndarray:
+            return self._sample_trajectory(burns, start_state, start_et, ets)
+
+        return lambda: self.forecasts.get(sc_id, state, et, now, span, step, sample, generation)
+
+    def _sample_trajectory(self, burns: List[dict], state: np.ndarray, et: float, ets: np.ndarray) -> np.ndarray:
+        """States at increasing epochs ets from state at et, applying the burns on the way."""
+        out = np.empty((len(ets), 6))
+        i = 0
+        for burn in burns:
+            if burn["et"] < et or burn["et"] > ets[-1]:
+                continue
+            # Samples at the burn epoch show the state before it
+            j = int(np.searchsorted(ets, burn["et"], side="right"))
+            out[i:j] = self._sample_states(state, et, ets[i:j])
+            state = self._sample_states(state, et, np.array([burn["et"]]))[0]
+            state[3:6] += burn["dv"]
+            et, i = burn["et"], j
+        out[i:] = self._sample_states(state, et, ets[i:])
+        return out
+
+    def _sample_states(self, state: np.ndarray, et: float, ets: np.ndarray) -> np.ndarray:
+        if len(ets) == 0:
+            return np.empty((0, 6))
+        if self._nbody is None:
+            # Every sample straight from the start state, in one batch
+            return propagate_kepler(np.repeat(state[None, :], len(ets), axis=0), ets - et, GM_SUN)
+        # The integrator reads perturber ephemerides: run it where SPICE lives
+        return spice_pool.call_blocking("nbody_sample", state[None, :], et, ets)[:, 0]
+
+    def propagate_ships(self, rows: np.ndarray, target_et: float):
+        """Propagate the given fleet rows to target_et, executing the fleet's burns due on the way."""
+        next_burn = self.maneuvers.next_et()
+        if next_burn is not None and next_burn <= target_et:
+            self._execute_burns(target_et)
+        self._propagate_rows(rows, target_et)
+
+    async def propagate_ships_async(self, rows: np.ndarray, target_et: float):
+        """
+        propagate_ships for the event loop. In n-body mode the integrations
+        (and their perturber ephemeris sampling) run on the SPICE worker pool;
+        Kepler propagation is one vectorized call and stays inline.
+        """
+        if self._nbody is None:
+            self.propagate_ships(rows, target_et)
+            return
+        async with self._propagation_lock:
+            next_burn = self.maneuvers.next_et()
+            if next_burn is not None and next_burn <= target_et:
+                await self._execute_burns_async(target_et)
+            await self._propagate_rows_async(rows, target_et)
+
+    def _propagate_rows(self, rows: np.ndarray, target_et: float):
+        """Propagate the given fleet rows to target_et, in one batch."""
+        dt = target_et - self.ets[rows]
+        moving = rows[dt != 0]
+        if len(moving):
+            if self._nbody is None:
+                self.states[moving] = propagate_kepler(self.states[moving], dt[dt != 0], GM_SUN)
+            else:
+                for group, t0 in self._nbody_batches(moving):
+                    self.states[group] = self._nbody.propagate(self.states[group], t0, target_et)
+        self.ets[rows] = target_et
+
+    async def _propagate_rows_async(self, rows: np.ndarray, target_et: float):
+        """_propagate_rows in n-body mode, each integration awaited on the SPICE worker pool."""
+        for group, t0 in self._nbody_batches(rows[self.ets[rows] != target_et]):
+            states, run = await spice_pool.call("nbody_propagate", self.states[group], t0, target_et)
+            self.states[group] = states
+            if run is not None:
+                self._nbody.record(*run)
+        self.ets[rows] = target_et
+
+    def _nbody_batches(self, rows: np.ndarray):
+        """The integrator needs a common start epoch: (rows, start ET) for each distinct ET."""
+        start_ets = self.ets[rows]
+        for t0 in np.unique(start_ets):
+            yield rows[start_ets == t0], float(t0)
+
+    def propagation_stats(self) -> Dict[str, float]:
+        """Integrator step-count and wall-time statistics (n-body mode only)."""
+        stats = {"propagator": self.propagator, "ships": self.n, "burns_pending": len(self.maneuvers.pending)}
+        if self._nbody is not None:
+            stats.update(self._nbody.get_stats())
+        return stats
+
+    def propagate_all(self, target_et: float):
+        """Advance every ship to target_et."""
+        self.propagate_ships(np.arange(self.n), target_et)
+
+    async def propagate_all_async(self, target_et: float):
+        await self.propagate_ships_async(np.arange(self.n), target_et)
+
+    def current_et(self) -> float:
+        """Current sim time as ET (shared snapshot inside a request)."""
+        return self.clock.now()
+
+    async def get_spacecraft_async(self, sc_id: str) -> Optional[Spacecraft]:
+        """get_spacecraft for the event loop (n-body integration on the worker pool)."""
+        sc = self.spacecrafts.get(sc_id)
+        if sc:
+            try:
+                await self.propagate_ships_async(np.array([self.index[sc_id]]), self.current_et())
+            except Exception as e:
+                print(f"Propagation Error for {sc_id}: {e}")
+        return sc
 
     def get_spacecraft(self, sc_id: str) -> Spacecraft:
         # Auto-update to current time on access?
@@ -133,13 +590,9 @@ class Simulation:
         sc = self.spacecrafts.get(sc_id)
         if sc:
             try:
-                now = datetime.now(timezone.utc)
-                now_str = now.strftime("%Y-%m-%dT%H:%M:%S")
-                current_et = utc_to_et(now_str)
-                # "Propagate" simply updates time for now
-                sc.propagate(current_et)
-            except:
-                pass
+                sc.propagate(self.current_et())
+            except Exception as e:
+                print(f"Propagation Error for {sc_id}: {e}")
         return sc
 
 _sim_instance = None
@@ -147,5 +600,11 @@ _sim_instance = None
 def get_sim() -> Simulation:
     global _sim_instance
     if _sim_instance is None:
-        _sim_instance = Simulation()
+        _sim_instance = Simulation(journal=Journal() if SIM_PERSIST else None)
     return _sim_instance
+
+def shutdown_sim():
+    """Snapshot the fleet on shutdown, so the next start replays nothing."""
+    if _sim_instance is not None and _sim_instance.journal is not None:
+        _sim_instance.snapshot()
+        _sim_instance.journal.close()
@@ -0,0 +1,220 @@
+import os
+import threading
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import Dict, List, Optional, Tuple
+
+from .stars import StarCatalog, get_star_catalog
+
+# Default sensor model for the pair index
+STARID_FOV_DEG = float(os.getenv("STARID_FOV_DEG", "20.0"))
+STARID_MAG_LIMIT = float(os.getenv("STARID_MAG_LIMIT", "6.0"))
+# Default angular match tolerance
+STARID_TOLERANCE_ARCSEC = float(os.getenv("STARID_TOLERANCE_ARCSEC", "20.0"))
+# Star triangles tried per identification before giving up
+STARID_MAX_TRIANGLES = 60
+
+def chord_to_angle(chord: np.ndarray) -> np.ndarray:
+    """Angle between unit vectors from their chord length (accurate at small angles)."""
+    return 2.0 * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0))
+
+def pair_angles(vectors: np.ndarray) -> np.ndarray:
+    """(n, n) matrix of angles (rad) between unit vectors."""
+    return chord_to_angle(np.linalg.norm(vectors[:, None, :] - vectors[None, :, :], axis=2))
+
+def solve_attitude(body: np.ndarray, inertial: np.ndarray) -> np.ndarray:
+    """Wahba's problem by SVD: rotation A with body ~= A @ inertial, for (n, 3) matched unit vectors."""
+    B = body.T @ inertial
+    U, _, Vt = np.linalg.svd(B)
+    d = np.linalg.det(U) * np.linalg.det(Vt)
+    return U @ np.diag([1.0, 1.0, d]) @ Vt
+
+def matrix_to_quaternion(m: np.ndarray) -> np.ndarray:
+    """Rotation matrix to unit quaternion [w, x, y, z] (scalar first, same convention as SPICE m2q)."""
+    trace = np.trace(m)
+    candidates = np.array([trace, m[0, 0], m[1, 1], m[2, 2]])
+    i = int(np.argmax(candidates))
+    if i == 0:
+        w = 0.5 * np.sqrt(1.0 + trace)
+        q = [w, (m[2, 1] - m[1, 2]) / (4 * w), (m[0, 2] - m[2, 0]) / (4 * w), (m[1, 0] - m[0, 1]) / (4 * w)]
+    elif i == 1:
+        x = 0.5 * np.sqrt(1.0 + m[0, 0] - m[1, 1] - m[2, 2])
+        q = [(m[2, 1] - m[1, 2]) / (4 * x), x, (m[0, 1] + m[1, 0]) / (4 * x), (m[0, 2] + m[2, 0]) / (4 * x)]
+    elif i == 2:
+        y = 0.5 * np.sqrt(1.0 - m[0, 0] + m[1, 1] - m[2, 2])
+        q = [(m[0, 2] - m[2, 0]) / (4 * y), (m[0, 1] + m[1, 0]) / (4 * y), y, (m[1, 2] + m[2, 1]) / (4 * y)]
+    else:
+        z = 0.5 * np.sqrt(1.0 - m[0, 0] - m[1, 1] + m[2, 2])
+        q = [(m[1, 0] - m[0, 1]) / (4 * z), (m[0, 2] + m[2, 0]) / (4 * z), (m[1, 2] + m[2, 1]) / (4 * z), z]
+    q = np.array(q)
+    return q if q[0] >= 0 else -q
+
+class KVector:
+    """
+    Mortari k-vector over a sorted array: the bounds of any value range are
+    found with two multiply-adds instead of a binary search. k[i] counts the
+    values <= z(i) on the straight line z spanning the data.
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+        n = len(values)
+        lo, hi = values[0], values[-1]
+        eps = max(abs(lo), abs(hi), 1.0) * np.finfo(np.float64).eps * n
+        self.m = (hi - lo + 2 * eps) / max(n - 1, 1)
+        self.q = lo - eps
+        self.k = np.searchsorted(values, self.m * np.arange(n) + self.q, side="right")
+
+    def range(self, lo: float, hi: float) -> Tuple[int, int]:
+        """(start, stop) of a slice guaranteed to contain every value in [lo, hi]."""
+        last = len(self.k) - 1
+        # One bin of margin below: k[jb] excludes values equal to z(jb)
+        jb = int(np.floor((lo - self.q) / self.m)) - 1
+        jt = int(np.ceil((hi - self.q) / self.m))
+        start = self.k[min(jb, last)] if jb >= 0 else 0
+        stop = self.k[max(jt, 0)] if jt <= last else len(self.values)
+        return int(start), int(max(start, stop))
+
+class StarIdentifier:
+    """
+    Lost-in-space star identification against the catalog.
+
+    Built once per (FOV, magnitude limit): every catalog pair closer than the
+    FOV is stored sorted by angle with a k-vector. identify() matches observed
+    star triangles (same angles and handedness), confirms each candidate
+    pyramid-style against the remaining observed stars, and solves the
+    attitude from all matched stars.
+    """
+
+    def __init__(self, catalog: StarCatalog, fov_deg: float = STARID_FOV_DEG, mag_limit: float = STARID_MAG_LIMIT):
+        self.catalog = catalog
+        self.fov = np.radians(fov_deg)
+        self.mag_limit = mag_limit
+        # Catalog is sorted by magnitude, so the selection is a prefix
+        self.n = int(np.searchsorted(catalog.mag, mag_limit, side="right"))
+        self.vectors = catalog.vectors[:self.n]
+        self.tree = cKDTree(self.vectors)
+
+        pairs = self.tree.query_pairs(2.0 * np.sin(self.fov / 2.0), output_type="ndarray")
+        angles = chord_to_angle(np.linalg.norm(self.vectors[pairs[:, 0]] - self.vectors[pairs[:, 1]], axis=1))
+        order = np.argsort(angles)
+        self.pair_i = pairs[order, 0].astype(np.int64)
+        self.pair_j = pairs[order, 1].astype(np.int64)
+        self.pair_angle = angles[order]
+        self.kvector = KVector(self.pair_angle)
+
+    def _pairs(self, angle: float, tol: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Catalog pairs at angle +- tol, in both orders."""
+        start, stop = self.kvector.range(angle - tol, angle + tol)
+        hit = np.abs(self.pair_angle[start:stop] - angle) <= tol
+        i = self.pair_i[start:stop][hit]
+        j = self.pair_j[start:stop][hit]
+        return np.concatenate((i, j)), np.concatenate((j, i))
+
+    def _triangles(self, obs: np.ndarray, angles: np.ndarray, a: int, b: int, c: int, tol: float) -> np.ndarray:
+        """(m, 3) catalog index triples matching observed stars a, b, c."""
+        ab_a, ab_b = self._pairs(angles[a, b], tol)
+        bc_b, bc_c = self._pairs(angles[b, c], tol)
+        ac_a, ac_c = self._pairs(angles[a, c], tol)
+        if not (len(ab_a) and len(bc_b) and len(ac_a)):
+            return np.empty((0, 3), dtype=np.int64)
+
+        # Join ab and bc on the shared star b
+        order = np.argsort(bc_b, kind="stable")
+        bc_b, bc_c = bc_b[order], bc_c[order]
+        lo = np.searchsorted(bc_b, ab_b, side="left")
+        counts = np.searchsorted(bc_b, ab_b, side="right") - lo
+        rows = np.repeat(np.arange(len(ab_a)), counts)
+        offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        tri_a, tri_b, tri_c = ab_a[rows], ab_b[rows], bc_c[lo[rows] + offsets]
+
+        # Keep triples whose ac side is also a catalog pair at the right angle
+        ac_keys = np.sort(ac_a * self.n + ac_c)
+        probe = tri_a * self.n + tri_c
+        pos = np.minimum(np.searchsorted(ac_keys, probe), len(ac_keys) - 1)
+        keep = ac_keys[pos] == probe
+
+        # Same handedness as the observed triangle (rejects mirror images)
+        tri = np.stack((tri_a[keep], tri_b[keep], tri_c[keep]), axis=1)
+        observed = np.sign(np.linalg.det(obs[[a, b, c]]))
+        catalog = np.sign(np.linalg.det(self.vectors[tri]))
+        return tri[catalog == observed]
+
+    def _match_all(self, obs: np.ndarray, attitude: np.ndarray, tol: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest catalog star for every observed star under an attitude; (observed idx, catalog idx)."""
+        inertial = obs @ attitude  # A.T @ b for each row
+        dist, idx = self.tree.query(inertial, distance_upper_bound=2.0 * np.sin(tol / 2.0))
+        hit = np.isfinite(dist)
+        return np.flatnonzero(hit), idx[hit]
+
+    def identify(self, vectors, tolerance_arcsec: float = STARID_TOLERANCE_ARCSEC) -> Optional[Dict]:
+        """
+        Identify observed star directions (n >= 3 body-frame vectors, brightest
+        first works best). Returns the attitude quaternion (J2000 -> body,
+        scalar first), rotation matrix, matched stars and residual, or None.
+        """
+        obs = np.asarray(vectors, dtype=np.float64).reshape(-1, 3)
+        n = len(obs)
+        if n < 3:
+            return None
+        obs = obs / np.linalg.norm(obs, axis=1, keepdims=True)
+        tol = np.radians(tolerance_arcsec / 3600.0)
+        angles = pair_angles(obs)
+        # Three confirmed stars is as good as it gets with three observed
+        required = min(n, 4)
+
+        tried = 0
+        # Pyramid ordering: vary the widest index spread last so one bad star
+        # (a false detection) is dropped quickly
+        for dj in range(1, n - 1):
+            for dk in range(1, n - dj):
+                for a in range(0, n - dj - dk):
+                    b, c = a + dj, a + dj + dk
+                    if max(angles[a, b], angles[b, c], angles[a, c]) > self.fov + tol:
+                        continue
+                    tried += 1
+                    if tried > STARID_MAX_TRIANGLES:
+                        return None
+                    candidates = self._triangles(obs, angles, a, b, c, tol)
+                    if n == 3 and len(candidates) != 1:
+                        continue
+                    for tri in candidates:
+                        attitude = solve_attitude(obs[[a, b, c]], self.vectors[tri])
+                        # Allow for the attitude error of a three-star solution
+                        matched_obs, matched_cat = self._match_all(obs, attitude, 2.0 * tol)
+                        # Distinct catalog stars: an unresolved double must not confirm itself
+                        if len(np.unique(matched_cat)) >= required:
+                            return self._result(obs, matched_obs, matched_cat)
+        return None
+
+    def _result(self, obs: np.ndarray, matched_obs: np.ndarray, matched_cat: np.ndarray) -> Dict:
+        attitude = solve_attitude(obs[matched_obs], self.vectors[matched_cat])
+        residual = chord_to_angle(np.linalg.norm(obs[matched_obs] @ attitude - self.vectors[matched_cat], axis=1))
+        names = self.catalog.records(matched_cat)
+        # None, not 0, when the catalog file has no HR numbers
+        hr = (self.catalog.column("hr")[matched_cat].tolist() if self.catalog.has_column("hr")
+              else [None] * len(matched_cat))
+        return {
+            "quaternion": matrix_to_quaternion(attitude).tolist(),
+            "matrix": attitude.tolist(),
+            "matches": [
+                {"observed": int(o), "catalog": int(c), "name": rec["name"], "hr": h}
+                for o, c, rec, h in zip(matched_obs, matched_cat, names, hr)
+            ],
+            "residual_arcsec": float(np.degrees(np.sqrt(np.mean(residual**2))) * 3600.0),
+        }
+
+    def identify_many(self, observations: List, tolerance_arcsec: float = STARID_TOLERANCE_ARCSEC) -> List[Optional[Dict]]:
+        """Identify a batch of star fields (e.g. grading submissions)."""
+        return [self.identify(vectors, tolerance_arcsec) for vectors in observations]
+
+_identifiers: Dict[Tuple[float, float], StarIdentifier] = {}
+_identifiers_lock = threading.Lock()
+
+def get_star_identifier(fov_deg: float = STARID_FOV_DEG, mag_limit: float = STARID_MAG_LIMIT) -> StarIdentifier:
+    """Pair index for one sensor model, built on first use."""
+    key = (float(fov_deg), float(mag_limit))
+    with _identifiers_lock:
+        if key not in _identifiers:
+            _identifiers[key] = StarIdentifier(get_star_catalog(), fov_deg, mag_limit)
+        return _identifiers[key]
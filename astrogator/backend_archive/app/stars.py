@@ -0,0 +1,287 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import Dict, List, Optional
+
+from .ephemeris import CLIGHT
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+STARS_FILE = os.path.join(DATA_DIR, "stars.json")
+# Columnar catalog written by tools/fetch_catalog.py; memory-mapped when present
+STARS_NPY_FILE = os.path.join(DATA_DIR, "stars.npy")
+
+# One row per star, sorted by magnitude
+STAR_DTYPE = np.dtype([
+    ("name", "S12"),
+    ("ra", "f8"),
+    ("dec", "f8"),
+    ("mag", "f8"),
+    ("bv", "f8"),
+    ("spect", "S20"),
+    ("hr", "i4"),          # Bright Star Catalogue number
+    ("pm_ra", "f8"),       # arcsec/yr, mu_alpha * cos(dec)
+    ("pm_dec", "f8"),      # arcsec/yr
+    ("parallax", "f8"),    # arcsec
+])
+
+# Columns served by /api/nav/stars, in order
+STAR_FIELDS = ("name", "ra", "dec", "mag", "bv", "spect")
+# Columns only the full BSC5 build (tools/fetch_catalog.py) has; older
+# stars.json/stars.npy files lack them
+ASTROMETRY_FIELDS = ("hr", "pm_ra", "pm_dec", "parallax")
+# Corrections of apparent_star_vectors that need catalog columns; without
+# them the correction is skipped and not listed in StarCatalog.corrections
+STAR_CORRECTIONS = (("proper_motion", ("pm_ra", "pm_dec")), ("parallax", ("parallax",)))
+
+AU_KM = 149597870.7
+JULIAN_YEAR_SEC = 365.25 * 86400.0
+ARCSEC_RAD = np.pi / (180.0 * 3600.0)
+
+# Apparent star fields are cached per observer bucket: 0.01 km/s is ~0.007"
+# of aberration, 1e6 km of position is <0.01" of parallax, and a day of
+# proper motion is <0.03" for the fastest catalog star
+STAR_FIELD_VEL_QUANTUM = float(os.getenv("STAR_FIELD_VEL_QUANTUM", "0.01"))
+STAR_FIELD_POS_QUANTUM = float(os.getenv("STAR_FIELD_POS_QUANTUM", "1e6"))
+STAR_FIELD_EPOCH_QUANTUM = float(os.getenv("STAR_FIELD_EPOCH_QUANTUM", "86400"))
+STAR_FIELD_CACHE_SIZE = int(os.getenv("STAR_FIELD_CACHE_SIZE", "32"))
+
+def radec_to_unit_vectors(ra_deg, dec_deg) -> np.ndarray:
+    """RA/Dec (degrees, scalars or arrays) to J2000 unit vectors (..., 3)."""
+    ra = np.radians(ra_deg)
+    dec = np.radians(dec_deg)
+    cos_dec = np.cos(dec)
+    return np.stack((cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)), axis=-1)
+
+def records_to_array(stars: List[dict]) -> np.ndarray:
+    """
+    Catalog dicts (stars.json layout) to a STAR_DTYPE array sorted by
+    magnitude. Astrometry columns no record has are left out, not zero-filled.
+    """
+    fields = [f for f in STAR_DTYPE.names if f not in ASTROMETRY_FIELDS or any(f in s for s in stars)]
+    data = np.zeros(len(stars), dtype=np.dtype([(f, STAR_DTYPE[f]) for f in fields]))
+    for field in fields:
+        values = [s.get(field, 0.0) for s in stars]
+        if STAR_DTYPE[field].kind == "S":
+            values = [str(v).encode("latin-1") for v in values]
+        data[field] = values
+    return data[np.argsort(data["mag"], kind="stable")]
+
+def save_catalog_array(data: np.ndarray, path: str = STARS_NPY_FILE):
+    np.save(path, np.ascontiguousarray(data))
+
+class StarCatalog:
+    """
+    Star catalog indexed for field-of-view queries. Rows are a structured
+    array sorted by magnitude (memory-mapped from stars.npy when available)
+    and the stars are stored as J2000 unit vectors in a k-d tree; a cone of
+    angular radius r is a ball of chord radius 2 sin(r/2) around the boresight.
+    """
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+        self.missing_fields = [f for f in ASTROMETRY_FIELDS if f not in data.dtype.names]
+        # Apparent field corrections this catalog file supports (aberration always applies)
+        self.corrections = [name for name, fields in STAR_CORRECTIONS
+                            if all(f in data.dtype.names for f in fields)] + ["aberration"]
+        self.mag = np.asarray(data["mag"], dtype=np.float64)
+        self.vectors = radec_to_unit_vectors(
+            np.asarray(data["ra"], dtype=np.float64),
+            np.asarray(data["dec"], dtype=np.float64),
+        ).reshape(-1, 3)
+        self.tree = cKDTree(self.vectors) if len(data) else None
+
+    @classmethod
+    def from_records(cls, stars: List[dict]) -> "StarCatalog":
+        return cls(records_to_array(stars))
+
+    @classmethod
+    def from_file(cls, npy_path: str = STARS_NPY_FILE, json_path: str = STARS_FILE) -> "StarCatalog":
+        """Memory-map the binary catalog, falling back to stars.json."""
+        if os.path.exists(npy_path):
+            try:
+                return cls(np.load(npy_path, mmap_mode="r"))
+            except Exception as e:
+                print(f"Warning: Could not load {npy_path}: {e}")
+        try:
+            with open(json_path, "r") as f:
+                stars = json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load stars.json: {e}")
+            stars = []
+        return cls.from_records(stars)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def has_column(self, field: str) -> bool:
+        return field in self.data.dtype.names
+
+    def column(self, field: str) -> np.ndarray:
+        """
+        One catalog column. A column the catalog file lacks (missing_fields)
+        reads as zeros.
+        """
+        if self.has_column(field):
+            return np.asarray(self.data[field])
+        return np.zeros(len(self.data), dtype=STAR_DTYPE[field])
+
+    def records(self, idx: Optional[np.ndarray] = None) -> List[dict]:
+        """Rows as stars.json-style dicts (all rows if idx is None)."""
+        rows = self.data if idx is None else self.data[idx]
+        columns = []
+        for field in STAR_FIELDS:
+            values = rows[field].tolist()
+            if rows.dtype[field].kind == "S":
+                values = [v.decode("latin-1") for v in values]
+            columns.append(values)
+        return [dict(zip(STAR_FIELDS, row)) for row in zip(*columns)]
+
+    def to_json(self) -> bytes:
+        """Whole catalog serialized once, for the cached /api/nav/stars payload."""
+        return json.dumps(self.records(), separators=(",", ":")).encode("utf-8")
+
+    def cone(self, boresight: np.ndarray, radius_deg: float, mag_limit: Optional[float] = None) -> np.ndarray:
+        """
+        Indices of stars within radius_deg of the boresight vector (any length)
+        and no fainter than mag_limit, brightest first.
+        """
+        if self.tree is None:
+            return np.empty(0, dtype=np.intp)
+        boresight = np.asarray(boresight, dtype=np.float64)
+        boresight = boresight / np.linalg.norm(boresight)
+        half = np.radians(min(max(radius_deg, 0.0), 180.0)) / 2.0
+        # Pad the chord slightly so stars exactly on the cone edge are kept
+        idx = np.asarray(self.tree.query_ball_point(boresight, 2.0 * np.sin(half) + 1e-12), dtype=np.intp)
+        if mag_limit is not None:
+            # Sorted by magnitude, so the limit is an index cut
+            idx = idx[idx < np.searchsorted(self.mag, mag_limit, side="right")]
+        return np.sort(idx)
+
+    def query(self, boresight: np.ndarray, radius_deg: float, mag_limit: Optional[float] = None,
+              max_results: Optional[int] = None) -> List[dict]:
+        """Catalog entries inside the field of view, brightest first."""
+        idx = self.cone(boresight, radius_deg, mag_limit)
+        if max_results is not None:
+            idx = idx[:max_results]
+        return self.records(idx)
+
+    def query_radec(self, ra_deg: float, dec_deg: float, radius_deg: float, mag_limit: Optional[float] = None,
+                    max_results: Optional[int] = None) -> List[dict]:
+        return self.query(radec_to_unit_vectors(ra_deg, dec_deg), radius_deg, mag_limit, max_results)
+
+def apparent_star_vectors(catalog: StarCatalog, velocity: np.ndarray, position: np.ndarray, et: float) -> np.ndarray:
+    """
+    Apparent J2000 unit vectors of every catalog star for an observer at
+    position (km) moving with velocity (km/s), both Sun-relative, at et.
+    One NumPy pass over the catalog: proper motion from the J2000 catalog
+    epoch, parallax, then special-relativistic aberration. Proper motion and
+    parallax are skipped when the catalog file lacks their columns
+    (catalog.corrections lists what is applied).
+    """
+    u = catalog.vectors
+
+    if "proper_motion" in catalog.corrections:
+        # Proper motion (pm_ra is mu_alpha * cos(dec)) along the local east/north axes
+        ra = np.radians(np.asarray(catalog.data["ra"], dtype=np.float64))
+        dec = np.radians(np.asarray(catalog.data["dec"], dtype=np.float64))
+        years = et / JULIAN_YEAR_SEC
+        east = np.stack((-np.sin(ra), np.cos(ra), np.zeros_like(ra)), axis=1)
+        north = np.stack((-np.sin(dec) * np.cos(ra), -np.sin(dec) * np.sin(ra), np.cos(dec)), axis=1)
+        u = u + (years * ARCSEC_RAD) * (catalog.column("pm_ra")[:, None] * east
+                                        + catalog.column("pm_dec")[:, None] * north)
+
+    if "parallax" in catalog.corrections:
+        # Parallax: direction to a star at distance AU/p from the observer instead of the Sun
+        u = u - np.outer(catalog.column("parallax") * ARCSEC_RAD, np.asarray(position, dtype=np.float64) / AU_KM)
+    u = u / np.linalg.norm(u, axis=1, keepdims=True)
+
+    # Relativistic aberration: u' = (u/g + (1 + u.b/(1 + 1/g)) b) / (1 + u.b)
+    beta = np.asarray(velocity, dtype=np.float64) / CLIGHT
+    gamma = 1.0 / np.sqrt(1.0 - beta @ beta)
+    ub = u @ beta
+    apparent = (u / gamma + (1.0 + ub / (1.0 + 1.0 / gamma))[:, None] * beta) / (1.0 + ub)[:, None]
+    return apparent / np.linalg.norm(apparent, axis=1, keepdims=True)
+
+class StarFieldCache:
+    """
+    Bounded LRU of apparent star fields keyed by quantized observer velocity,
+    position and epoch. Each field is computed at its bucket values, so every
+    observer in a bucket sees the same field.
+    """
+
+    def __init__(self, maxsize: int = STAR_FIELD_CACHE_SIZE, vel_quantum: float = STAR_FIELD_VEL_QUANTUM,
+                 pos_quantum: float = STAR_FIELD_POS_QUANTUM, epoch_quantum: float = STAR_FIELD_EPOCH_QUANTUM):
+        self.maxsize = maxsize
+        self.vel_quantum = vel_quantum
+        self.pos_quantum = pos_quantum
+        self.epoch_quantum = epoch_quantum
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, catalog: StarCatalog, velocity: np.ndarray, position: np.ndarray, et: float) -> Dict:
+        """
+        {"et", "velocity", "position", "corrections", "ra", "dec", "json"} for the observer's
+        bucket (shared; do not mutate). ra/dec follow catalog order; "json" is
+        the same field pre-serialized for the API.
+        """
+        vel = np.round(np.asarray(velocity, dtype=np.float64) / self.vel_quantum) * self.vel_quantum
+        pos = np.round(np.asarray(position, dtype=np.float64) / self.pos_quantum) * self.pos_quantum
+        epoch = float(np.floor(et / self.epoch_quantum) * self.epoch_quantum)
+        key = (id(catalog), tuple(vel.tolist()), tuple(pos.tolist()), epoch)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        vectors = apparent_star_vectors(catalog, vel, pos, epoch)
+        value = {
+            "et": epoch,
+            "velocity": vel.tolist(),
+            "position": pos.tolist(),
+            "corrections": list(catalog.corrections),
+            "ra": np.degrees(np.arctan2(vectors[:, 1], vectors[:, 0])) % 360.0,
+            "dec": np.degrees(np.arcsin(np.clip(vectors[:, 2], -1.0, 1.0))),
+        }
+        value["json"] = json.dumps({
+            "et": epoch,
+            "velocity": value["velocity"],
+            "position": value["position"],
+            "corrections": value["corrections"],
+            # 1e-6 deg = 0.0036 arcsec
+            "ra": np.round(value["ra"], 6).tolist(),
+            "dec": np.round(value["dec"], 6).tolist(),
+        }, separators=(",", ":")).encode("utf-8")
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+star_field_cache = StarFieldCache()
+
+_catalog_instance: Optional[StarCatalog] = None
+
+def get_star_catalog() -> StarCatalog:
+    global _catalog_instance
+    if _catalog_instance is None:
+        _catalog_instance = StarCatalog.from_file()
+    return _catalog_instance
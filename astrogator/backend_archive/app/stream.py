@@ -0,0 +1,151 @@
+import asyncio
+import os
+import time
+from contextlib import nullcontext
+from typing import Awaitable, Callable, ContextManager, Dict, Optional, Set
+
+from .encoding import dumps
+
+# Seconds between telemetry ticks
+STREAM_TICK_SEC = float(os.getenv("STREAM_TICK_SEC", "1.0"))
+# Messages buffered per subscriber before it is considered too slow and dropped
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "8"))
+
+def format_sse(event: str, data) -> str:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
+class Subscriber:
+    def __init__(self, user_id: str, sc_id: str, queue_size: int):
+        self.user_id = user_id
+        # Which nav view this subscriber receives ("admin" for the admin view)
+        self.view = "admin" if user_id == "admin" else sc_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+class TelemetryHub:
+    """
+    One asyncio task computes the orrery and each subscribed nav view once per
+    tick and fans the pre-encoded events out to every subscriber.
+
+    async compute_orrery() -> dict
+    async compute_nav(view) -> dict or None   (view is an sc_id or "admin")
+
+    Both are awaited, so their ephemeris work can run on the SPICE worker pool
+    while the loop keeps serving requests.
+    tick_context() -> context manager wrapping each tick (e.g. a sim clock snapshot)
+    """
+
+    def __init__(self, compute_orrery: Callable[[], Awaitable[dict]],
+                 compute_nav: Callable[[str], Awaitable[Optional[dict]]],
+                 tick_sec: float = STREAM_TICK_SEC, queue_size: int = STREAM_QUEUE_SIZE,
+                 tick_context: Callable[[], ContextManager] = nullcontext):
+        self.compute_orrery = compute_orrery
+        self.compute_nav = compute_nav
+        self.tick_context = tick_context
+        self.tick_sec = tick_sec
+        self.queue_size = queue_size
+        self.subscribers: Set[Subscriber] = set()
+        self.ticks = 0
+        self.dropped = 0
+        self.last_tick_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for sub in list(self.subscribers):
+            self._drop(sub)
+
+    def subscribe(self, user_id: str, sc_id: str) -> Subscriber:
+        sub = Subscriber(user_id, sc_id, self.queue_size)
+        self.subscribers.add(sub)
+        self.start()
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        self.subscribers.discard(sub)
+
+    def _drop(self, sub: Subscriber):
+        """Disconnect a subscriber: discard its backlog and wake its reader with a sentinel."""
+        sub.dropped = True
+        self.subscribers.discard(sub)
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)
+
+    def _publish(self, sub: Subscriber, message: str):
+        try:
+            sub.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._drop(sub)
+
+    async def tick(self):
+        """Compute one round of telemetry and fan it out."""
+        if not self.subscribers:
+            return
+        start = time.perf_counter()
+
+        with self.tick_context():
+            # One nav computation per distinct view, shared by all of its
+            # subscribers; the views' worker calls run concurrently
+            views = list({sub.view for sub in self.subscribers})
+            orrery, *payloads = await asyncio.gather(self.compute_orrery(), *map(self.compute_nav, views))
+            orrery = format_sse("orrery", orrery)
+            nav: Dict[str, Optional[str]] = {
+                view: format_sse("nav", payload) if payload is not None else None
+                for view, payload in zip(views, payloads)
+            }
+
+        for sub in list(self.subscribers):
+            self._publish(sub, orrery)
+            if nav.get(sub.view) is not None and not sub.dropped:
+                self._publish(sub, nav[sub.view])
+
+        self.ticks += 1
+        self.last_tick_ms = (time.perf_counter() - start) * 1000.0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"Telemetry tick failed: {e}")
+            # Fixed-rate schedule; skip missed ticks instead of bursting to catch up
+            next_tick += self.tick_sec
+            now = loop.time()
+            if next_tick < now:
+                next_tick = now + self.tick_sec
+            await asyncio.sleep(next_tick - now)
+
+    async def events(self, sub: Subscriber):
+        """Async generator of SSE-encoded messages for one subscriber."""
+        try:
+            while True:
+                message = await sub.queue.get()
+                if message is None:
+                    break
+                yield message
+        finally:
+            self.unsubscribe(sub)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "subscribers": len(self.subscribers),
+            "ticks": self.ticks,
+            "dropped": self.dropped,
+            "last_tick_ms": self.last_tick_ms,
+            "tick_sec": self.tick_sec,
+        }
@@ -0,0 +1,172 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import engine
+from .metrics import spice_calls
+
+# Number of SPICE worker processes; 0 runs every call inline in the server process
+SPICE_WORKERS = int(os.getenv("SPICE_WORKERS", str(min(2, os.cpu_count() or 1))))
+
+def _body_positions(targets: List[str], et: float) -> Dict[str, np.ndarray]:
+    return {target: engine.get_body_position(target, et) for target in targets}
+
+_nbody = None
+
+def _nbody_propagator():
+    global _nbody
+    if _nbody is None:
+        # Deferred: scipy is only needed in n-body mode, and sim imports this module
+        from .nbody import NBodyPropagator
+        from .sim import GM_SUN
+        _nbody = NBodyPropagator(GM_SUN)
+    return _nbody
+
+def _nbody_sample(states: np.ndarray, t0: float, ets: np.ndarray) -> np.ndarray:
+    return _nbody_propagator().sample(states, t0, ets)
+
+def _nbody_propagate(states: np.ndarray, t0: float, t1: float) -> Tuple[np.ndarray, Optional[tuple]]:
+    """Propagated states and the run's (ships, steps, rhs evals, wall sec), for the server's stats."""
+    nbody = _nbody_propagator()
+    nbody.last_run = None
+    return nbody.propagate(states, t0, t1), nbody.last_run
+
+# Operations a worker will run, by name. Only read-only ephemeris work belongs
+# here: sim state lives in the server process and is never sent to a worker
+# (the nbody ops integrate copies of ship states they are given).
+OPS = {
+    "body_positions": _body_positions,
+    "nbody_sample": _nbody_sample,
+    "nbody_propagate": _nbody_propagate,
+    "body_states": engine.get_body_states,
+    "orbit_paths": engine.get_orbit_paths,
+    "apparent_radec": engine.get_apparent_targets_radec,
+}
+
+Call = Tuple[str, tuple]
+
+def _init_worker():
+    # Each worker owns a private SPICE kernel pool (and ephemeris tables / caches)
+    engine.load_kernels()
+
+def _run_batch(calls: List[Call]) -> List[Any]:
+    """Execute a batch of calls in one round trip; a failing call returns its exception."""
+    results = []
+    for op, args in calls:
+        try:
+            results.append(OPS[op](*args))
+        except Exception as e:
+            results.append(e)
+    return results
+
+def _run_batch_remote(calls: List[Call]) -> Tuple[List[Any], Dict[Tuple[str, ...], float]]:
+    """_run_batch in a worker, plus the SPICE calls it made since the last batch (for the server's metrics)."""
+    results = _run_batch(calls)
+    return results, spice_calls.drain()
+
+class SpicePool:
+    """
+    Process pool that owns SPICE for the async endpoints. SPICE is not
+    thread-safe and blocks the event loop, so each worker loads the kernels
+    once and serves batches of named calls; endpoints await the results.
+    """
+
+    def __init__(self, workers: int = SPICE_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.batches = 0
+        self.calls = 0
+        self.inline_calls = 0
+        self.restarts = 0
+        self.wall_sec = 0.0
+
+    def start(self):
+        if self.workers <= 0 or self._executor is not None:
+            return
+        # spawn: never fork a process that already holds server threads and SPICE state
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        # Warm every worker so kernel loading doesn't land on the first request
+        for _ in range(self.workers):
+            self._executor.submit(_run_batch_remote, [])
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def call_many(self, calls: List[Call]) -> List[Any]:
+        """Run a batch of (op, args) calls on one worker; raises the first failure."""
+        for op, _ in calls:
+            if op not in OPS:
+                raise KeyError(f"Unknown SPICE op: {op}")
+        start = time.perf_counter()
+        if self._executor is None:
+            # Pool not running (SPICE_WORKERS=0 or outside the app lifespan)
+            self.inline_calls += len(calls)
+            results = _run_batch(calls)
+        else:
+            loop = asyncio.get_running_loop()
+            try:
+                results, worker_spice_calls = await loop.run_in_executor(self._executor, _run_batch_remote, calls)
+                for labels, count in worker_spice_calls.items():
+                    spice_calls.inc(*labels, amount=count)
+            except BrokenProcessPool as e:
+                print(f"SPICE worker pool broke ({e}); restarting")
+                self.restarts += 1
+                self.shutdown()
+                self.start()
+                self.inline_calls += len(calls)
+                results = _run_batch(calls)
+        self.batches += 1
+        self.calls += len(calls)
+        self.wall_sec += time.perf_counter() - start
+
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    async def call(self, op: str, *args) -> Any:
+        return (await self.call_many([(op, args)]))[0]
+
+    def call_blocking(self, op: str, *args) -> Any:
+        """One call from an executor thread (never the event loop): waits for a worker."""
+        if op not in OPS:
+            raise KeyError(f"Unknown SPICE op: {op}")
+        executor = self._executor
+        start = time.perf_counter()
+        if executor is None:
+            self.inline_calls += 1
+            (result,) = _run_batch([(op, args)])
+        else:
+            (result,), worker_spice_calls = executor.submit(_run_batch_remote, [(op, args)]).result()
+            for labels, count in worker_spice_calls.items():
+                spice_calls.inc(*labels, amount=count)
+        self.batches += 1
+        self.calls += 1
+        self.wall_sec += time.perf_counter() - start
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "workers": self.workers if self._executor is not None else 0,
+            "batches": self.batches,
+            "calls": self.calls,
+            "inline_calls": self.inline_calls,
+            "restarts": self.restarts,
+            "mean_batch_ms": self.wall_sec * 1000.0 / max(1, self.batches),
+        }
+
+spice_pool = SpicePool()
@@ -1,4 +1,7 @@
+import argparse
 import os
+import subprocess
+import sys
 import urllib.request
 
 KERNELS_DIR = os.path.join(os.path.dirname(__file__), "kernels")
@@ -33,7 +36,20 @@ def download_file(url, filepath):
     except Exception as e:
         print(f"Failed to download {url}: {e}")
 
+def write_subset():
+    """Write kernels/de440_subset.bsp with tools/subset_spk.py (the only SPK the Docker image ships)."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools", "subset_spk.py")
+    print("Writing the de440 subset...")
+    subprocess.run([sys.executable, script], check=True)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download the SPICE kernels.")
+    parser.add_argument("--subset", action="store_true",
+                        help="Also write the time-windowed de440 subset (run before docker build)")
+    args = parser.parse_args()
+
     print(f"Downloading kernels to {KERNELS_DIR}")
     for k in KERNELS:
         download_file(k["url"], os.path.join(KERNELS_DIR, k["name"]))
+    if args.subset:
+        write_subset()
@@ -0,0 +1,342 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Run from anywhere: make the backend package importable
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+# Results land here by default, one file per commit
+RESULTS_DIR = os.path.join(BACKEND_DIR, "bench")
+DEFAULT_EPOCH = "2026-01-01T00:00:00"
+NAV_BODIES = ["SUN", "EARTH", "MARS", "JUPITER", "VENUS", "MERCURY", "SATURN"]
+FLEET_SIZES = [10, 100, 1000, 10000]
+# The n-body integrator is far slower per ship; keep its curve short
+NBODY_FLEET_SIZES = [10, 100]
+# Journal records replayed on top of the snapshot in the restore benchmark
+RESTORE_TAIL_BURNS = 100
+# Far-future burns queued for the "propagate_all/queued" point (should cost nothing)
+QUEUED_BURNS = 10000
+# A median this much slower than the baseline counts as a regression
+REGRESSION_THRESHOLD = 1.25
+
+def summarize(times) -> dict:
+    """Timing statistics (microseconds) for a list of per-call durations in seconds."""
+    us = np.asarray(times) * 1e6
+    return {
+        "n": len(us),
+        "min_us": float(us.min()),
+        "median_us": float(np.median(us)),
+        "mean_us": float(us.mean()),
+        "p95_us": float(np.percentile(us, 95)),
+        "max_us": float(us.max()),
+        "ops_per_sec": float(1e6 / us.mean()),
+    }
+
+def measure(fn, repeat: int, warmup: int = 3) -> dict:
+    """Time fn(i) for i in range(repeat), after a few untimed calls."""
+    for i in range(warmup):
+        fn(i)
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - start)
+    return summarize(times)
+
+def report(name: str, stats: dict):
+    print(f"  {name:42s} median {stats['median_us']:10.1f} us   p95 {stats['p95_us']:10.1f} us"
+          f"   {stats['ops_per_sec']:10.0f}/s")
+
+def bench_engine(epoch_et: float, repeat: int) -> dict:
+    """Micro-benchmarks of the engine entry points. "cold" runs clear the epoch caches first."""
+    from app import engine
+    from app.stars import get_star_catalog, apparent_star_vectors, radec_to_unit_vectors
+    from app.starid import get_star_identifier
+
+    # A ship near Sun-Earth L1, like the default fleet
+    observer = engine.get_body_state("EARTH", "SUN", epoch_et) * 0.99
+    ets_1000 = epoch_et + np.linspace(0.0, 365.25 * 86400.0, 1000)
+    vectors = np.random.default_rng(0).normal(size=(1000, 3))
+    catalog = get_star_catalog()
+
+    def cold(fn):
+        def run(i):
+            engine.clear_caches()
+            fn(i)
+        return run
+
+    cases = {
+        "get_body_state/cold": cold(lambda i: engine.get_body_state("MARS", "SUN", epoch_et + i)),
+        "get_body_state/cached": lambda i: engine.get_body_state("MARS", "SUN", epoch_et),
+        "get_body_states/1000": lambda i: engine.get_body_states("JUPITER", ets_1000 + i),
+        "get_orbit_path/EARTH/cold": cold(lambda i: engine.get_orbit_path("EARTH", epoch_et + i)),
+        "get_orbit_path/SATURN/cold": cold(lambda i: engine.get_orbit_path("SATURN", epoch_et + i)),
+        "get_orbit_path/cached": lambda i: engine.get_orbit_path("EARTH", epoch_et),
+        "get_apparent_target_radec": lambda i: engine.get_apparent_target_radec("MARS", observer, epoch_et + i),
+        "get_apparent_targets_radec/nav": lambda i: engine.get_apparent_targets_radec(NAV_BODIES, observer, epoch_et + i),
+        "frame_transform": lambda i: engine.frame_transform(observer, "J2000", "ECLIPJ2000", epoch_et + i),
+        "vectors_to_radec/1000": lambda i: engine.vectors_to_radec(vectors),
+        "et_to_utc": lambda i: engine.et_to_utc(epoch_et + i),
+        "utc_to_et": lambda i: engine.utc_to_et(DEFAULT_EPOCH),
+        "stars/cone/10deg": lambda i: catalog.cone(radec_to_unit_vectors(i * 7.0 % 360.0, 20.0), 10.0),
+        "stars/apparent_field": lambda i: apparent_star_vectors(catalog, observer[3:6], observer[:3], epoch_et + i),
+    }
+
+    # Star ID on a synthetic field around a bright star (skipped without a catalog)
+    if len(catalog):
+        identifier = get_star_identifier()
+        field = catalog.vectors[catalog.cone(catalog.vectors[0], np.degrees(identifier.fov) / 2.0, identifier.mag_limit)[:8]]
+        if len(field) >= 3:
+            cases["starid/identify"] = lambda i: identifier.identify(field)
+
+    results = {}
+    for name, fn in cases.items():
+        results[name] = measure(fn, repeat)
+        report(name, results[name])
+    return results
+
+def bench_sim(epoch_et: float, repeat: int, propagators) -> dict:
+    """Fleet-size scaling of the simulation: one curve per propagator."""
+    from app.clock import SimClock
+    from app.journal import Journal
+    from app.sim import Simulation
+
+    results = {}
+    rng = np.random.default_rng(0)
+    for propagator in propagators:
+        sizes = FLEET_SIZES if propagator == "kepler" else NBODY_FLEET_SIZES
+        curve = []
+        for n in sizes:
+            clock = SimClock.fixed(epoch_et)
+            sim = Simulation(propagator, clock=clock)
+            base = sim.states[0].copy() if sim.n else np.array([1.48e8, 0.0, 0.0, 0.0, 29.5, 0.0])
+            for k in range(sim.n, n):
+                offset = np.hstack((rng.uniform(-2000.0, 2000.0, 3), rng.uniform(-0.01, 0.01, 3)))
+                sim.add_spacecraft(f"bench{k}", base + offset, epoch_et)
+            ids = sim.ids[:n]
+
+            def propagate_all(i):
+                sim.propagate_all(epoch_et + 60.0 * (i + 1))
+
+            def get_spacecraft(i):
+                clock.set_epoch(epoch_et + 60.0 * (i + 1))
+                sim.get_spacecraft(ids[i % len(ids)])
+
+            point = {
+                "ships": sim.n,
+                "propagate_all": measure(propagate_all, repeat),
+                "get_spacecraft": measure(get_spacecraft, repeat),
+                "fleet_states/ECLIPJ2000": measure(lambda i: sim.fleet_states("ECLIPJ2000"), repeat),
+            }
+            with tempfile.TemporaryDirectory() as state_dir:
+                # Snapshot plus a journal tail of RESTORE_TAIL_BURNS burns
+                sim.journal = Journal(state_dir, fsync=False)
+                sim.snapshot()
+                for k in range(RESTORE_TAIL_BURNS):
+                    sim.spacecrafts[ids[k % len(ids)]].apply_burn(np.array([1e-4, 0.0, 0.0]))
+                sim.journal.close()
+                sim.journal = None
+                point["restore"] = measure(lambda i: Simulation(
+                    propagator, clock=SimClock.fixed(epoch_et), journal=Journal(state_dir, fsync=False)), repeat)
+            for k in range(QUEUED_BURNS):
+                sim.schedule_burn(ids[k % len(ids)], epoch_et + 1e8 + k, np.array([1e-5, 0.0, 0.0]))
+            point["propagate_all/queued"] = measure(propagate_all, repeat)
+            curve.append(point)
+            print(f"  {propagator:6s} {sim.n:6d} ships: propagate_all {point['propagate_all']['median_us']:10.1f} us, "
+                  f"get_spacecraft {point['get_spacecraft']['median_us']:8.1f} us, "
+                  f"fleet_states {point['fleet_states/ECLIPJ2000']['median_us']:8.1f} us, "
+                  f"restore {point['restore']['median_us']:8.1f} us")
+        results[propagator] = curve
+    return results
+
+def bench_api(repeat: int) -> dict:
+    """In-process latency and sequential throughput per endpoint (TestClient, no network)."""
+    from fastapi.testclient import TestClient
+    from app.auth import USERS_FILE
+    from app.encoding import BINARY_MEDIA_TYPE
+    from app.main import app
+    from app.stars import get_star_catalog
+
+    with open(USERS_FILE) as f:
+        users = json.load(f)
+    ship = next(user for user in users if user != "admin")
+    admin = {"Authorization": f"Bearer {users['admin']}"}
+    student = {"Authorization": f"Bearer {users[ship]}"}
+
+    catalog = get_star_catalog()
+    starid_body = {"vectors": [dict(zip("xyz", v)) for v in catalog.vectors[catalog.cone(catalog.vectors[0], 8.0)[:8]].tolist()]}
+
+    requests = {
+        "GET /": ("get", "/", {}, None),
+        "GET /api/nav/orrery/live": ("get", "/api/nav/orrery/live", {}, None),
+        "GET /api/nav/orrery/static": ("get", "/api/nav/orrery/static", {}, None),
+        "GET /api/nav/orrery/static (binary)": ("get", "/api/nav/orrery/static", {"Accept": BINARY_MEDIA_TYPE}, None),
+        "GET /api/nav/orrery/static (float32)": ("get", "/api/nav/orrery/static", {"Accept": f"{BINARY_MEDIA_TYPE}; dtype=float32"}, None),
+        "GET /api/nav/state/{sc_id}": ("get", f"/api/nav/state/{ship}", student, None),
+        "GET /api/nav/state/admin": ("get", "/api/nav/state/admin", admin, None),
+        "GET /api/nav/forecast/{sc_id}": ("get", f"/api/nav/forecast/{ship}?span_hours=24&step_sec=600", student, None),
+        "GET /api/nav/forecast/{sc_id} (binary)": ("get", f"/api/nav/forecast/{ship}?span_hours=24&step_sec=600",
+                                                   dict(student, Accept=BINARY_MEDIA_TYPE), None),
+        "GET /api/nav/stars (gzip)": ("get", "/api/nav/stars", {"Accept-Encoding": "gzip"}, None),
+        "GET /api/nav/stars (304)": ("get", "/api/nav/stars", {}, None),
+        "GET /api/nav/stars/fov": ("get", "/api/nav/stars/fov?ra=101.3&dec=-16.7&radius=10", {}, None),
+        "GET /api/nav/stars/apparent/{sc_id}": ("get", f"/api/nav/stars/apparent/{ship}", student, None),
+        "POST /api/nav/starid": ("post", "/api/nav/starid", student, starid_body),
+        "GET /api/admin/fleet": ("get", "/api/admin/fleet", admin, None),
+        "GET /api/admin/fleet (binary)": ("get", "/api/admin/fleet", dict(admin, Accept=BINARY_MEDIA_TYPE), None),
+        "GET /api/admin/truth/{sc_id}": ("get", f"/api/admin/truth/{ship}", admin, None),
+    }
+
+    results = {}
+    with TestClient(app) as client:
+        etag = client.get("/api/nav/stars").headers.get("etag", "")
+        requests["GET /api/nav/stars (304)"][2]["If-None-Match"] = etag
+        for name, (method, path, headers, body) in requests.items():
+            status = {}
+            size = {}
+
+            def call(i):
+                res = client.request(method, path, headers=headers, json=body)
+                status[res.status_code] = status.get(res.status_code, 0) + 1
+                size["bytes"] = len(res.content)
+
+            start = time.perf_counter()
+            stats = measure(call, repeat)
+            stats["status"] = {str(code): count for code, count in status.items()}
+            stats["response_bytes"] = size.get("bytes", 0)
+            # Sequential throughput including the warmup calls' share of client overhead
+            stats["requests_per_sec"] = float(sum(status.values()) / (time.perf_counter() - start))
+            results[name] = stats
+            report(name, stats)
+    return results
+
+def git_commit() -> str:
+    try:
+        sha = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+        dirty = subprocess.call(["git", "diff", "--quiet", "HEAD", "--", "."], cwd=BACKEND_DIR) != 0
+        return sha + ("-dirty" if dirty else "")
+    except Exception:
+        return "unknown"
+
+def metadata(epoch: str, epoch_et: float) -> dict:
+    import spiceypy as spice
+    from app import engine
+
+    coverage = engine.get_coverage()
+    ephemeris = engine.get_ephemeris()
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "spiceypy": spice.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "epoch": epoch,
+        "epoch_et": epoch_et,
+        "spk": os.path.basename(engine.spk_path()),
+        "spk_checksum": coverage.checksum if coverage is not None else None,
+        "ephemeris_bodies": ephemeris.bodies() if ephemeris is not None else [],
+        "spice_workers": int(os.environ.get("SPICE_WORKERS", "0")),
+    }
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    """metric path -> median_us for every timing in a results file."""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict) and "median_us" in value:
+            flat[path] = value["median_us"]
+        elif isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, list):
+            for point in value:
+                flat.update(flatten({k: v for k, v in point.items() if k != "ships"}, f"{path}/{point['ships']}"))
+    return flat
+
+def compare(baseline_path: str, results: dict, threshold: float = REGRESSION_THRESHOLD) -> int:
+    """Print median ratios against a baseline file; returns the number of regressions."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old = flatten({k: v for k, v in baseline.items() if k != "meta"})
+    new = flatten({k: v for k, v in results.items() if k != "meta"})
+    print(f"\nCompared with {baseline_path} ({baseline.get('meta', {}).get('commit', '?')}):")
+    regressions = 0
+    for path in sorted(set(old) & set(new)):
+        ratio = new[path] / old[path] if old[path] > 0 else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1.0 / threshold:
+            flag = "  faster"
+        print(f"  {path:60s} {old[path]:10.1f} -> {new[path]:10.1f} us  x{ratio:5.2f}{flag}")
+    print(f"{regressions} regression(s) above x{threshold:.2f}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the engine, simulation and API hot paths (offline).")
+    parser.add_argument("--epoch", default=DEFAULT_EPOCH, help="Fixed sim epoch (UTC) for every benchmark")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls per benchmark")
+    parser.add_argument("--suites", nargs="+", default=["engine", "sim", "api"], choices=["engine", "sim", "api"])
+    parser.add_argument("--propagators", nargs="+", default=["kepler"], choices=["kepler", "nbody"])
+    parser.add_argument("--spk", help="SPK to load instead of kernels/de440.bsp, e.g. a small fixture "
+                                      "from tools/subset_spk.py --center <epoch> --output <path>")
+    parser.add_argument("--workers", type=int, default=0, help="SPICE worker processes for the API suite")
+    parser.add_argument("--output", help=f"Results JSON (default: {os.path.relpath(RESULTS_DIR)}/<commit>.json)")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Median slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    # Read at import time by the app (and inherited by SPICE worker processes)
+    os.environ["SPICE_WORKERS"] = str(args.workers)
+    # The API suite's fleet is throwaway: never journal it over the real class state
+    os.environ["SIM_PERSIST"] = "0"
+    # The clock starts at the benchmark epoch, so --spk fixtures are checked against it
+    os.environ["SIM_EPOCH"] = args.epoch
+    if args.spk:
+        os.environ["SPK_SUBSET_FILE"] = os.path.abspath(args.spk)
+
+    from app import engine
+    from app.clock import sim_clock
+
+    # Freeze the shared sim clock at the benchmark epoch so every run sees the same geometry
+    engine.load_kernels(with_ephemeris=False)
+    epoch_et = engine.utc_to_et(args.epoch)
+    sim_clock.pause()
+    sim_clock.set_epoch(epoch_et)
+    engine.init_ephemeris(epoch_et)
+
+    results = {"meta": metadata(args.epoch, epoch_et)}
+    print(f"Benchmarking {results['meta']['commit']} at {args.epoch} with {results['meta']['spk']}")
+    if "engine" in args.suites:
+        print("Engine:")
+        results["engine"] = bench_engine(epoch_et, args.repeat)
+    if "sim" in args.suites:
+        print("Simulation:")
+        results["sim"] = bench_sim(epoch_et, max(args.repeat // 4, 10), args.propagators)
+    if "api" in args.suites:
+        print("API:")
+        results["api"] = bench_api(args.repeat)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=1)
+    print(f"Saved to {output}")
+
+    if args.compare:
+        sys.exit(1 if compare(args.compare, results, args.threshold) else 0)
+
+if __name__ == "__main__":
+    main()
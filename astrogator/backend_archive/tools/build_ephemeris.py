@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Run from anywhere: make the backend package importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import engine
+from app.ephemeris import ChebyshevEphemeris, EPHEM_TOLERANCE_KM
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the Chebyshev ephemeris tables from de440.")
+    parser.add_argument("--center", help="Window center (UTC). Defaults to now.")
+    parser.add_argument("--days", type=float, default=engine.EPHEM_WINDOW_DAYS, help="Window width in days")
+    parser.add_argument("--output", default=engine.EPHEM_FILE)
+    args = parser.parse_args()
+
+    # Load kernels only; we are about to build the tables ourselves
+    engine.load_kernels(with_ephemeris=False)
+    center_et = engine.utc_to_et(args.center) if args.center else engine.now_et()
+
+    start = time.perf_counter()
+    eph = ChebyshevEphemeris.build(engine.EPHEM_BODIES, center_et, args.days, engine.body_ids(engine.EPHEM_BODIES))
+    print(f"Fitted {len(eph.tables)} bodies in {time.perf_counter() - start:.2f} s")
+
+    start_et, end_et = eph.window()
+    print(f"Window: {engine.et_to_utc(start_et)} -> {engine.et_to_utc(end_et)}")
+    for name, table in eph.tables.items():
+        print(f"  {name:8s} {len(table.coefs):5d} segments, max error {table.max_error_km * 1000:.3f} m")
+
+    # Independent spot-check at random epochs against SPICE (tolerance: EPHEM_TOLERANCE_KM)
+    ets = np.random.default_rng(0).uniform(start_et, end_et, 1000)
+    worst = 0.0
+    for name in eph.tables:
+        if name == "SUN":
+            continue
+        ref = engine.get_body_states(name, ets, "J2000", "SUN")
+        err = np.linalg.norm(eph.get_states(name, "SUN", ets)[:, :3] - ref[:, :3], axis=1).max()
+        worst = max(worst, err)
+    status = "PASS" if worst <= EPHEM_TOLERANCE_KM else "FAIL"
+    print(f"{status}: worst position error {worst * 1000:.3f} m (tolerance {EPHEM_TOLERANCE_KM * 1000:.1f} m)")
+
+    eph.save(args.output)
+    print(f"Saved to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
@@ -1,123 +1,247 @@
+import argparse
 import gzip
 import json
 import os
+import sys
+import time
 import urllib.request
-import math
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Run from anywhere: make the backend package importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.stars import STARS_NPY_FILE, STAR_DTYPE, radec_to_unit_vectors, records_to_array, save_catalog_array
 
 # URL for Yale Bright Star Catalog (gzipped)
 BSC5_URL = "http://tdc-www.harvard.edu/catalogs/ybsc5.gz"
 OUTPUT_FILE = os.path.join(os.path.dirname(__file__), "../app/data/stars.json")
+# Columnar copy the server memory-maps at startup
+BINARY_OUTPUT_FILE = STARS_NPY_FILE
+
+# Naked eye limit (approx)
+MAG_LIMIT = 6.5
 
-def download_catalog():
+# Hipparcos 2 (ESA I/311, hip2.dat) cross-match for --astrometry: a catalog
+# star takes the proper motion and parallax of the Hipparcos star within this
+# radius whose Hp magnitude is closest to its V magnitude
+HIP2_MATCH_ARCSEC = 60.0
+HIP2_MATCH_MAG = 1.0
+# hip2.dat positions are for epoch J1991.25, the catalog's for J2000
+HIP2_EPOCH_YEARS = 2000.0 - 1991.25
+ASTROMETRY_COLUMNS = ("pm_ra", "pm_dec", "parallax")
+
+# BSC5 fixed-width layout: field -> (start, stop) byte offsets, 0-based half-open
+BSC5_RECORD_LEN = 197
+BSC5_FIELDS = {
+    "hr": (0, 4),
+    "name": (4, 14),          # Flamsteed/Bayer
+    "ra_h": (75, 77),         # J2000 position
+    "ra_m": (77, 79),
+    "ra_s": (79, 83),
+    "dec_sign": (83, 84),
+    "dec_d": (84, 86),
+    "dec_m": (86, 88),
+    "dec_s": (88, 90),
+    "vmag": (102, 107),
+    "bv": (109, 114),
+    "spect": (127, 147),
+    "pm_ra": (148, 154),      # arcsec/yr, mu_alpha * cos(dec)
+    "pm_dec": (154, 160),     # arcsec/yr
+    "parallax": (161, 166),   # arcsec (trigonometric or, if flagged, dynamical)
+}
+
+def open_catalog(path=None):
+    """Binary stream of catalog lines: a local file (gzipped or plain) or the download."""
+    if path:
+        with open(path, "rb") as f:
+            gzipped = f.read(2) == b"\x1f\x8b"
+        return gzip.open(path, "rb") if gzipped else open(path, "rb")
     print(f"Downloading {BSC5_URL}...")
-    try:
-        with urllib.request.urlopen(BSC5_URL) as response:
-            return gzip.decompress(response.read()).decode('latin-1')
-    except Exception as e:
-        print(f"Failed to download: {e}")
-        return None
+    # Decompress while reading instead of holding the whole download in memory
+    return gzip.GzipFile(fileobj=urllib.request.urlopen(BSC5_URL))
 
-def parse_coordinate(h_d, m, s):
-    try:
-        val = float(h_d)
-        if val < 0:
-            return val - float(m)/60 - float(s)/3600
-        else:
-            return val + float(m)/60 + float(s)/3600
-    except ValueError:
-        return 0.0
-
-def parse_catalog(data):
-    stars = []
-    lines = data.split('\n')
-    
-    print(f"Parsing {len(lines)} entries...")
-    
-    for line in lines:
-        if len(line) < 100: continue
-        
-        try:
-            # Fixed width parsing based on BSC5 format
-            # HR Number: 0-4
-            hr_num = line[0:4].strip()
-            
-            # Name: 4-14 (Flamsteed/Bayer)
-            name = line[4:14].strip()
-            if not name:
-                name = f"HR {hr_num}"
-            
-            # J2000 Position (preferred) is usually later in the file, 
-            # but BSC5 standard entries often have B1900.
-            # Let's check the byte offsets carefully.
-            # Based on typical BSC5 description:
-            # RA (J2000): 75-77 (h), 77-79 (m), 79-83 (s)
-            # Dec (J2000): 83 (sign), 84-86 (d), 86-88 (m), 88-90 (s)
-            
-            ra_h = line[75:77]
-            ra_m = line[77:79]
-            ra_s = line[79:83]
-            
-            dec_sgn = line[83:84]
-            dec_d = line[84:86]
-            dec_m = line[86:88]
-            dec_s = line[88:90]
-            
-            # V Magnitude: 102-107
-            v_mag_str = line[102:107].strip()
-            
-            # B-V Color: 109-114
-            bv_str = line[109:114].strip()
-            
-            # Spectral Type: 127-147
-            spect = line[127:147].strip()
-            
-            # Parse Values
-            if not ra_h.strip() or not dec_d.strip() or not v_mag_str:
-                continue
-                
-            ra_deg = (float(ra_h) + float(ra_m)/60 + float(ra_s)/3600) * 15.0
-            
-            dec_deg = float(dec_d) + float(dec_m)/60 + float(dec_s)/3600
-            if dec_sgn == '-':
-                dec_deg = -dec_deg
-                
-            v_mag = float(v_mag_str)
-            bv = float(bv_str) if bv_str else 0.0
-            
-            # Filter limit (Naked eye limit approx 6.5)
-            if v_mag > 6.5:
-                continue
-
-            stars.append({
-                "name": name,
-                "ra": round(ra_deg, 4),
-                "dec": round(dec_deg, 4),
-                "mag": v_mag,
-                "bv": bv,
-                "spect": spect
-            })
-            
-        except ValueError:
+def read_records(stream, width=BSC5_RECORD_LEN, chunk_size=1 << 20):
+    """Stream fixed-width records into an (N, width) byte matrix, blank padded."""
+    lines = []
+    tail = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        chunk_lines = (tail + chunk).split(b"\n")
+        tail = chunk_lines.pop()
+        lines.extend(chunk_lines)
+    if tail:
+        lines.append(tail)
+    # Trailing blanks (and any CR) are dropped here and restored as padding below
+    raw = np.array(lines, dtype=f"S{width}")
+    buf = raw.view(np.uint8).reshape(len(raw), width).copy()
+    buf[buf == 0] = ord(" ")
+    return buf
+
+def text_column(buf, field):
+    start, stop = BSC5_FIELDS[field]
+    return np.char.strip(np.ascontiguousarray(buf[:, start:stop]).view(f"S{stop - start}").ravel())
+
+def numeric_column(buf, field):
+    """
+    Fixed-width decimal numbers decoded arithmetically from the byte matrix,
+    one character position at a time over all records; NaN where the field is
+    blank or malformed. The integer mantissa divided by a power of ten rounds
+    exactly like float() on the text.
+    """
+    start, stop = BSC5_FIELDS[field]
+    n = len(buf)
+    mantissa = np.zeros(n, dtype=np.int64)
+    decimals = np.zeros(n, dtype=np.int64)
+    seen_point = np.zeros(n, dtype=bool)
+    negative = np.zeros(n, dtype=bool)
+    any_digit = np.zeros(n, dtype=bool)
+    valid = np.ones(n, dtype=bool)
+    for c in np.ascontiguousarray(buf[:, start:stop].T):
+        digit = (c >= ord("0")) & (c <= ord("9"))
+        mantissa = np.where(digit, mantissa * 10 + (c - ord("0")), mantissa)
+        decimals += digit & seen_point
+        point = c == ord(".")
+        minus = c == ord("-")
+        valid &= digit | point | minus | (c == ord("+")) | (c == ord(" "))
+        seen_point |= point
+        negative |= minus
+        any_digit |= digit
+
+    value = mantissa / 10.0 ** decimals
+    value = np.where(negative, -value, value)
+    return np.where(valid & any_digit, value, np.nan)
+
+def parse_catalog(buf, mag_limit=MAG_LIMIT):
+    """BSC5 record matrix -> STAR_DTYPE array (sorted by brightness)."""
+    print(f"Parsing {len(buf)} entries...")
+    ra = (numeric_column(buf, "ra_h") + numeric_column(buf, "ra_m") / 60 + numeric_column(buf, "ra_s") / 3600) * 15.0
+    dec = numeric_column(buf, "dec_d") + numeric_column(buf, "dec_m") / 60 + numeric_column(buf, "dec_s") / 3600
+    dec = np.where(buf[:, BSC5_FIELDS["dec_sign"][0]] == ord("-"), -dec, dec)
+    vmag = numeric_column(buf, "vmag")
+
+    # Entries without a position or magnitude (e.g. removed novae) are skipped
+    keep = np.isfinite(ra) & np.isfinite(dec) & np.isfinite(vmag) & (vmag <= mag_limit)
+    buf = buf[keep]
+
+    hr = numeric_column(buf, "hr")
+    names = text_column(buf, "name")
+    hr_names = np.char.add(b"HR ", np.char.mod(b"%d", np.nan_to_num(hr).astype(np.int64)))
+    names = np.where(names == b"", hr_names, names)
+
+    data = np.zeros(len(buf), dtype=STAR_DTYPE)
+    data["name"] = names
+    data["ra"] = np.round(ra[keep], 4)
+    data["dec"] = np.round(dec[keep], 4)
+    data["mag"] = vmag[keep]
+    data["bv"] = np.nan_to_num(numeric_column(buf, "bv"))
+    data["spect"] = text_column(buf, "spect")
+    data["hr"] = np.nan_to_num(hr).astype(np.int32)
+    data["pm_ra"] = np.nan_to_num(numeric_column(buf, "pm_ra"))
+    data["pm_dec"] = np.nan_to_num(numeric_column(buf, "pm_dec"))
+    data["parallax"] = np.nan_to_num(numeric_column(buf, "parallax"))
+
+    # Sort by brightness
+    return data[np.argsort(data["mag"], kind="stable")]
+
+def read_hipparcos(path):
+    """hip2.dat (gzipped or plain) -> J2000 RA/Dec (deg), Hp, pm_ra, pm_dec, parallax (arcsec[/yr])."""
+    with open_catalog(path) as stream:
+        ra, dec, parallax, pm_ra, pm_dec, hp = np.loadtxt(stream, usecols=(4, 5, 6, 7, 8, 19), unpack=True)
+    # mas -> arcsec; pm_ra is mu_alpha * cos(dec)
+    parallax, pm_ra, pm_dec = parallax / 1000.0, pm_ra / 1000.0, pm_dec / 1000.0
+    years = HIP2_EPOCH_YEARS
+    ra = np.degrees(ra) + pm_ra * years / 3600.0 / np.cos(dec)
+    dec = np.degrees(dec) + pm_dec * years / 3600.0
+    return ra, dec, hp, pm_ra, pm_dec, parallax
+
+def add_astrometry(data, path):
+    """
+    Copy of a catalog array with pm_ra/pm_dec/parallax taken from Hipparcos 2,
+    matched by position and magnitude. Unmatched stars get zeros, like BSC5
+    blanks; negative (noise-dominated) parallaxes are kept as zero.
+    """
+    print(f"Cross-matching with Hipparcos 2 ({path})...")
+    ra, dec, hp, pm_ra, pm_dec, parallax = read_hipparcos(path)
+    fields = [f for f in STAR_DTYPE.names if f in data.dtype.names or f in ASTROMETRY_COLUMNS]
+    out = np.zeros(len(data), dtype=np.dtype([(f, STAR_DTYPE[f]) for f in fields]))
+    for field in data.dtype.names:
+        out[field] = data[field]
+
+    tree = cKDTree(radec_to_unit_vectors(ra, dec))
+    chord = 2.0 * np.sin(np.radians(HIP2_MATCH_ARCSEC / 3600.0) / 2.0)
+    neighbours = tree.query_ball_point(radec_to_unit_vectors(data["ra"], data["dec"]), chord)
+    matched = 0
+    for i, candidates in enumerate(neighbours):
+        if not candidates:
             continue
-            
-    return stars
+        j = min(candidates, key=lambda k: abs(hp[k] - data["mag"][i]))
+        if abs(hp[j] - data["mag"][i]) <= HIP2_MATCH_MAG:
+            out["pm_ra"][i] = pm_ra[j]
+            out["pm_dec"][i] = pm_dec[j]
+            out["parallax"][i] = max(parallax[j], 0.0)
+            matched += 1
+    print(f"Matched {matched} of {len(data)} stars.")
+    return out
+
+def to_records(data):
+    """STAR_DTYPE array -> stars.json dicts."""
+    columns = {}
+    for field in data.dtype.names:
+        values = data[field].tolist()
+        if data.dtype[field].kind == "S":
+            values = [v.decode("latin-1") for v in values]
+        columns[field] = values
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+def save_json(data, path=OUTPUT_FILE):
+    with open(path, "w") as f:
+        json.dump(to_records(data), f, indent=None) # Compact JSON
+    print(f"Saved to {path}")
+
+def save_binary(data, path=BINARY_OUTPUT_FILE):
+    save_catalog_array(data, path)
+    print(f"Saved to {path}")
 
 def main():
-    raw_data = download_catalog()
-    if not raw_data:
+    parser = argparse.ArgumentParser(description="Build the star catalog from the Yale Bright Star Catalog.")
+    parser.add_argument("--input", help="Local BSC5 file (gzipped or plain). Downloads it if omitted.")
+    parser.add_argument("--mag-limit", type=float, default=MAG_LIMIT, help="Faintest V magnitude kept")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="JSON catalog path")
+    parser.add_argument("--binary-output", default=BINARY_OUTPUT_FILE, help="Binary (.npy) catalog path")
+    parser.add_argument("--from-json", action="store_true",
+                        help="Skip the download and rebuild the binary catalog from the existing stars.json")
+    parser.add_argument("--astrometry", help="Hipparcos 2 hip2.dat (gzipped or plain): take proper motions "
+                                             "and parallaxes from it instead of BSC5")
+    args = parser.parse_args()
+
+    if args.from_json:
+        with open(args.output, "r") as f:
+            data = records_to_array(json.load(f))
+        if args.astrometry:
+            data = add_astrometry(data, args.astrometry)
+        save_binary(data, args.binary_output)
+        return
+
+    start = time.perf_counter()
+    try:
+        with open_catalog(args.input) as stream:
+            buf = read_records(stream)
+    except Exception as e:
+        print(f"Failed to read catalog: {e}")
         print("Aborting.")
         return
-        
-    stars = parse_catalog(raw_data)
-    print(f"Successfully parsed {len(stars)} stars.")
-    
-    # Sort by brightness
-    stars.sort(key=lambda x: x['mag'])
-    
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(stars, f, indent=None) # Compact JSON
-        
-    print(f"Saved to {OUTPUT_FILE}")
+
+    data = parse_catalog(buf, args.mag_limit)
+    print(f"Successfully parsed {len(data)} stars in {(time.perf_counter() - start) * 1000:.0f} ms.")
+    if args.astrometry:
+        data = add_astrometry(data, args.astrometry)
+
+    save_json(data, args.output)
+    save_binary(data, args.binary_output)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,120 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import spiceypy as spice
+
+# Run from anywhere: make the backend package importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import engine
+from app.coverage import CoverageManifest, read_segments
+
+def resolve_ids(input_path, names):
+    """Best covered NAIF ID in the input kernel for each body (e.g. MARS -> 4 in de440)."""
+    manifest = CoverageManifest.build([input_path])
+    ids = manifest.body_ids(names)
+    for name in names:
+        if name not in ids:
+            print(f"Skipping {name}: not in {input_path}")
+    return set(ids.values())
+
+def required_targets(segments, ids):
+    """Requested bodies plus every center their states are chained through (e.g. 399 -> 3 -> 0)."""
+    required = set(ids)
+    while True:
+        centers = {center for _, _, target, center, _, _ in segments if target in required}
+        grown = required | (centers - {0})
+        if grown == required:
+            return required
+        required = grown
+
+def subset_spk(input_path, output_path, ids, start_et, stop_et):
+    """Copy the segments needed for ids, clipped to [start_et, stop_et], into a new SPK."""
+    handle = spice.dafopr(input_path)
+    try:
+        segments = read_segments(handle)
+        targets = required_targets(segments, ids)
+
+        # Build under a temporary name: load_kernels prefers the subset as soon as it exists
+        tmp_path = output_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        out = spice.spkopn(tmp_path, os.path.basename(output_path), 0)
+        written = []
+        try:
+            for descr, ident, target, center, seg_start, seg_stop in segments:
+                begin, end = max(seg_start, start_et), min(seg_stop, stop_et)
+                if target not in targets or begin >= end:
+                    continue
+                spice.spksub(handle, descr, ident, begin, end, out)
+                written.append((target, center, begin, end))
+        finally:
+            if written:
+                spice.spkcls(out)
+            else:
+                spice.dafcls(out)
+    finally:
+        spice.dafcls(handle)
+    if not written:
+        os.remove(tmp_path)
+        raise ValueError("No segments overlap the requested bodies and window")
+    os.replace(tmp_path, output_path)
+    return written
+
+def spot_check(input_path, output_path, written, samples=50):
+    """Largest position difference (km) between the full and subset kernels inside the window."""
+    worst = 0.0
+    for target, center, begin, end in written:
+        ets = np.linspace(begin, end, samples)
+        states = []
+        for path in (input_path, output_path):
+            spice.furnsh(path)
+            states.append(np.array([spice.spkgeo(target, et, "J2000", center)[0][:3] for et in ets]))
+            spice.unload(path)
+        worst = max(worst, float(np.max(np.abs(states[0] - states[1]))))
+    return worst
+
+YEAR_SEC = 365.25 * 86400.0
+# Cover the Chebyshev ephemeris window (centered on now) and the orbit paths,
+# which are sampled one full period forward from now (Saturn is the longest),
+# plus a year of margin on each side
+DEFAULT_YEARS_BEFORE = engine.EPHEM_WINDOW_DAYS / 2.0 / 365.25 + 1.0
+DEFAULT_YEARS_AFTER = max(engine.EPHEM_WINDOW_DAYS / 2.0, max(engine.ORBITAL_PERIODS.values())) / 365.25 + 1.0
+
+def main():
+    default_input = os.path.join(engine.KERNELS_DIR, engine.SPK_FILE)
+    default_output = os.path.join(engine.KERNELS_DIR, engine.SPK_SUBSET_FILE)
+    parser = argparse.ArgumentParser(description="Write a time-windowed subset of de440 for the bodies the sim uses.")
+    parser.add_argument("--input", default=default_input)
+    parser.add_argument("--output", default=default_output)
+    parser.add_argument("--center", help="Window center (UTC). Defaults to now.")
+    parser.add_argument("--before", type=float, default=DEFAULT_YEARS_BEFORE, help="Years kept before the center")
+    parser.add_argument("--after", type=float, default=DEFAULT_YEARS_AFTER, help="Years kept after the center")
+    parser.add_argument("--bodies", nargs="+", default=list(engine.EPHEM_BODIES) + ["SUN"],
+                        help="Bodies to keep (their reference chain is added automatically)")
+    args = parser.parse_args()
+
+    # Only the leapseconds kernel is needed to convert the window
+    spice.furnsh(os.path.join(engine.KERNELS_DIR, engine.LSK_FILE))
+    center_et = spice.str2et(args.center) if args.center else engine.now_et()
+    start_et = center_et - args.before * YEAR_SEC
+    stop_et = center_et + args.after * YEAR_SEC
+
+    start = time.perf_counter()
+    written = subset_spk(args.input, args.output, resolve_ids(args.input, args.bodies), start_et, stop_et)
+    print(f"Wrote {len(written)} segments in {time.perf_counter() - start:.1f} s:")
+    for target, center, begin, end in written:
+        print(f"  {target:>4} wrt {center:<3} {engine.et_to_utc(begin)} -> {engine.et_to_utc(end)}")
+
+    in_mb = os.path.getsize(args.input) / 1e6
+    out_mb = os.path.getsize(args.output) / 1e6
+    print(f"{args.input}: {in_mb:.1f} MB -> {args.output}: {out_mb:.1f} MB")
+
+    worst = spot_check(args.input, args.output, written)
+    print(f"Spot check vs full kernel: max |dr| = {worst:.3e} km ({'PASS' if worst == 0.0 else 'FAIL'})")
+
+if __name__ == "__main__":
+    main()
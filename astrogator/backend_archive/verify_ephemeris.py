@@ -0,0 +1,71 @@
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import engine
+from app.engine import EPHEM_BODIES, body_ids, load_kernels, spice, utc_to_et
+from app.ephemeris import EPHEM_TOLERANCE_KM
+from app.stars import radec_to_unit_vectors
+
+EPOCH = "2026-01-01T00:00:00"
+SAMPLES = 200
+# Velocities come from the derivative series: allow ~1 mm/s
+VEL_TOLERANCE_KMS = 1e-6
+# Apparent positions: the engine's light-time/aberration model vs SPICE "CN+S"
+APPARENT_TOLERANCE_KM = 1.0
+
+def verify_ephemeris():
+    load_kernels(with_ephemeris=False)
+    center = utc_to_et(EPOCH)
+    ids = body_ids(list(EPHEM_BODIES) + ["SUN"])
+    # The table the server itself would use at EPOCH
+    engine.init_ephemeris(center)
+    eph = engine.get_ephemeris()
+    if eph is None:
+        print("FAIL no Chebyshev ephemeris")
+        return False
+    start, end = eph.window()
+    ets = np.random.default_rng(2).uniform(start, end, SAMPLES)
+    print(f"Chebyshev tables for {len(eph.bodies())} bodies over {(end - start) / 86400:.0f} days around {EPOCH}")
+
+    failed = False
+    for name in eph.bodies():
+        if name == "SUN":
+            continue
+        # Geometric, heliocentric
+        ref = np.array([spice.spkgeo(ids[name], et, "J2000", ids["SUN"])[0] for et in ets])
+        got = eph.get_states(name, "SUN", ets)
+        pos_err = np.linalg.norm(got[:, :3] - ref[:, :3], axis=1).max()
+        vel_err = np.linalg.norm(got[:, 3:] - ref[:, 3:], axis=1).max()
+        ok = pos_err < 2 * EPHEM_TOLERANCE_KM and vel_err < VEL_TOLERANCE_KMS
+
+        failed |= not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {name:8s} pos {pos_err:.2e} km, vel {vel_err:.2e} km/s")
+
+    # Apparent positions from Earth through the engine path the nav endpoints use
+    targets = [n for n in eph.bodies() if n != "EARTH"]
+    app_err = np.zeros(len(targets))
+    for et in ets:
+        earth = spice.spkgeo(ids["EARTH"], et, "J2000", ids["SUN"])[0]
+        r, ra, dec = engine.get_apparent_targets_radec(targets, earth, et)
+        got = r[:, None] * radec_to_unit_vectors(ra, dec)
+        ref = np.array([spice.spkpos(str(ids[n]), et, "J2000", "CN+S", str(ids["EARTH"]))[0] for n in targets])
+        app_err = np.maximum(app_err, np.linalg.norm(got - ref, axis=1))
+    for name, err in zip(targets, app_err):
+        ok = err < APPARENT_TOLERANCE_KM
+        failed |= not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {name:8s} apparent from EARTH {err:.2e} km")
+
+    # The batched path the engine uses for many bodies at many epochs
+    names = [n for n in eph.bodies()] * 10
+    many_ets = np.random.default_rng(3).uniform(start, end, len(names))
+    ref = np.array([spice.spkgeo(ids[n], et, "J2000", 0)[0] for n, et in zip(names, many_ets)])
+    batch_err = np.linalg.norm(eph.get_ssb_states_many(names, many_ets)[:, :3] - ref[:, :3], axis=1).max()
+    ok = batch_err < 2 * EPHEM_TOLERANCE_KM
+    failed |= not ok
+    print(f"{'OK  ' if ok else 'FAIL'} batched SSB states: pos {batch_err:.2e} km")
+    return not failed
+
+if __name__ == "__main__":
+    sys.exit(0 if verify_ephemeris() else 1)
@@ -0,0 +1,42 @@
+import sys
+import os
+import numpy as np
+import spiceypy as spice
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.kepler import propagate_kepler
+
+MU_SUN = 1.32712440018e11  # km^3/s^2
+AU = 1.495978707e8
+# Relative position error allowed against SPICE prop2b
+TOLERANCE = 1e-8
+
+def random_states(rng, n, speed_lo, speed_hi):
+    """Heliocentric states with speed a random multiple of the local escape speed."""
+    directions = rng.normal(size=(2, n, 3))
+    directions /= np.linalg.norm(directions, axis=2, keepdims=True)
+    r = rng.uniform(0.3, 30.0, n)[:, None] * AU * directions[0]
+    v_esc = np.sqrt(2.0 * MU_SUN / np.linalg.norm(r, axis=1))
+    v = (v_esc * rng.uniform(speed_lo, speed_hi, n))[:, None] * directions[1]
+    return np.hstack((r, v))
+
+def verify_kepler():
+    rng = np.random.default_rng(8)
+    cases = {
+        "elliptic": random_states(rng, 500, 0.2, 0.99),
+        "hyperbolic": random_states(rng, 500, 1.001, 3.0),
+    }
+    failed = False
+    for name, states in cases.items():
+        # Hyperbolic dt >= 1e8 s is where the solver used to return inf/NaN
+        for dt in [3600.0, 1e6, 1e8, 3e8, 3e9, -3e8]:
+            out = propagate_kepler(states, dt, MU_SUN)
+            ref = np.array([spice.prop2b(MU_SUN, s, dt) for s in states])
+            err = np.linalg.norm(out[:, :3] - ref[:, :3], axis=1) / np.linalg.norm(ref[:, :3], axis=1)
+            ok = np.isfinite(out).all() and err.max() < TOLERANCE
+            failed |= not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {name:10s} dt={dt:9.2e} s: max rel err {err.max():.2e}")
+    return not failed
+
+if __name__ == "__main__":
+    sys.exit(0 if verify_kepler() else 1)
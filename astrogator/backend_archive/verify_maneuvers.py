@@ -0,0 +1,80 @@
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.clock import SimClock
+from app.engine import load_kernels, utc_to_et
+from app.sim import ManeuverQueue, Simulation
+
+EPOCH = "2026-01-01T00:00:00"
+
+def report(ok, label):
+    print(f"{'OK  ' if ok else 'FAIL'} {label}")
+    return ok
+
+def check_queue():
+    """Random schedule/cancel traffic: pop_due returns exactly the live burns, in (et, id) order."""
+    rng = np.random.default_rng(24)
+    queue = ManeuverQueue()
+    live = {}
+    for _ in range(5000):
+        if live and rng.random() < 0.4:
+            burn_id = int(rng.choice(list(live)))
+            queue.cancel(burn_id)
+            del live[burn_id]
+        else:
+            # Coarse epochs, so several burns share one
+            burn = queue.add(f"ship{rng.integers(50)}", float(rng.integers(0, 1000)), rng.normal(size=3))
+            live[burn["id"]] = burn
+
+    ok = report(len(queue.pending) == len(live) and sum(len(b) for b in queue.by_ship.values()) == len(live),
+                "pending and per-ship indexes after 5000 schedules/cancels")
+    due = queue.pop_due(499.0)
+    expected = sorted((b for b in live.values() if b["et"] <= 499.0), key=lambda b: (b["et"], b["id"]))
+    ok &= report([b["id"] for b in due] == [b["id"] for b in expected], f"pop_due order ({len(due)} burns due)")
+    ok &= report(queue.next_et() == min((b["et"] for b in live.values() if b["et"] > 499.0), default=None),
+                 "next_et skips cancelled burns")
+    stats = queue.stats()
+    ok &= report(stats["scheduled"] == stats["pending"] + stats["executed"] + stats["cancelled"],
+                 "scheduled = pending + executed + cancelled")
+    return ok
+
+def check_execution():
+    """A scheduled burn gives the same trajectory as stopping at its epoch and burning by hand."""
+    load_kernels()
+    epoch_et = utc_to_et(EPOCH)
+    burn_et, end_et = epoch_et + 3600.0, epoch_et + 86400.0
+    dv = np.array([2e-3, -1e-3, 5e-4])
+
+    queued = Simulation(clock=SimClock.fixed(epoch_et))
+    manual = Simulation(clock=SimClock.fixed(epoch_et))
+    # The fleet starts with random offsets: give both sims the same one
+    manual.states[:manual.n] = queued.states[:queued.n]
+    manual.fuel[:manual.n] = queued.fuel[:queued.n]
+    a, b = queued.ids[0], queued.ids[1]
+    queued.schedule_burn(a, burn_et, dv)
+    # Two burns of one ship at the same epoch add up
+    queued.schedule_burn(b, burn_et, dv)
+    queued.schedule_burn(b, burn_et, dv)
+    queued.propagate_all(end_et)
+
+    manual.propagate_all(burn_et)
+    manual.spacecrafts[a].apply_burn(dv)
+    manual.spacecrafts[b].apply_burn(2 * dv)
+    manual.propagate_all(end_et)
+
+    ok = report(np.allclose(queued.states[:queued.n], manual.states[:manual.n], rtol=1e-12, atol=1e-6),
+                "queued burns match burning by hand at the epoch")
+    # Fuel is charged per burn
+    ok &= report(np.isclose(queued.fuel[queued.index[b]], manual.fuel[manual.index[b]]), "fuel charged for each burn")
+    ok &= report(not queued.maneuvers.pending and queued.maneuvers.executed == 3, "all burns executed once")
+    return ok
+
+def verify_maneuvers():
+    ok = check_queue()
+    ok &= check_execution()
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if verify_maneuvers() else 1)
@@ -0,0 +1,79 @@
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.starid import STARID_TOLERANCE_ARCSEC, get_star_identifier
+from app.stars import get_star_catalog
+
+FIELDS = 300
+FOV_RADIUS_DEG = 9.5
+MAG_LIMIT = 5.5
+NOISE_ARCSEC = 5.0
+# Identified fields needed, and attitude accuracy of those
+MIN_SUCCESS_RATE = 0.95
+MAX_MEDIAN_ATTITUDE_ERROR_ARCSEC = 20.0
+# Stars closer than the match tolerance (plus noise) are indistinguishable
+# doubles: either one is a correct match
+SAME_STAR_ARCSEC = 2.0 * STARID_TOLERANCE_ARCSEC
+
+def random_rotation(rng):
+    q, r = np.linalg.qr(rng.normal(size=(3, 3)))
+    q = q * np.sign(np.diag(r))
+    return q if np.linalg.det(q) > 0 else -q
+
+def same_star(catalog, row_a, row_b) -> bool:
+    cos_sep = np.clip(catalog.vectors[row_a] @ catalog.vectors[row_b], -1.0, 1.0)
+    return np.degrees(np.arccos(cos_sep)) * 3600.0 <= SAME_STAR_ARCSEC
+
+def make_field(rng, catalog):
+    """(body->inertial truth, catalog rows, observed body-frame unit vectors) of one noisy star field."""
+    attitude = random_rotation(rng)
+    rows = catalog.cone(attitude[2], FOV_RADIUS_DEG, MAG_LIMIT)[:int(rng.integers(4, 12))]
+    body = catalog.vectors[rows] @ attitude.T
+    body += rng.normal(scale=np.radians(NOISE_ARCSEC / 3600.0), size=body.shape)
+    body /= np.linalg.norm(body, axis=1, keepdims=True)
+    order = rng.permutation(len(rows))
+    return attitude, rows[order], body[order]
+
+def verify_starid():
+    rng = np.random.default_rng(15)
+    catalog = get_star_catalog()
+    identifier = get_star_identifier()
+    fields = []
+    while len(fields) < FIELDS:
+        field = make_field(rng, catalog)
+        if len(field[1]) >= 4:
+            fields.append(field)
+
+    results = identifier.identify_many([body for _, _, body in fields])
+    identified, wrong, errors = 0, 0, []
+    for (attitude, rows, _), result in zip(fields, results):
+        if result is None:
+            continue
+        if not all(same_star(catalog, rows[m["observed"]], m["catalog"]) for m in result["matches"]):
+            wrong += 1
+            continue
+        identified += 1
+        matrix = np.array(result["matrix"])
+        cos_angle = np.clip((np.trace(matrix @ attitude.T) - 1.0) / 2.0, -1.0, 1.0)
+        errors.append(np.degrees(np.arccos(cos_angle)) * 3600.0)
+
+    rate = identified / len(fields)
+    median_error = float(np.median(errors)) if errors else np.inf
+    ok = wrong == 0 and rate >= MIN_SUCCESS_RATE and median_error <= MAX_MEDIAN_ATTITUDE_ERROR_ARCSEC
+    print(f"{'OK  ' if ok else 'FAIL'} {len(fields)} fields: {identified} identified, {wrong} wrong, "
+          f"median attitude error {median_error:.1f}\"")
+
+    # A spurious detection (hot pixel, planet) must not change the answer
+    attitude, rows, body = fields[0]
+    spurious = rng.normal(size=3)
+    result = identifier.identify(np.vstack((spurious / np.linalg.norm(spurious), body)))
+    # Observation 0 is the spurious one: it must stay unmatched
+    robust = result is not None and all(
+        m["observed"] > 0 and same_star(catalog, rows[m["observed"] - 1], m["catalog"]) for m in result["matches"])
+    print(f"{'OK  ' if robust else 'FAIL'} field with a spurious star")
+    return ok and robust
+
+if __name__ == "__main__":
+    sys.exit(0 if verify_starid() else 1)